@@ -0,0 +1,99 @@
+import collections
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Window
+from django.db.models.functions import Rank
+
+from . import dashboard, paper_detail, reference_data
+from .models import Paper, PaperType, ReviewScore, scored_reviews
+
+# Candidate cutoffs are mean review scores from 1 to the highest score in
+# steps of ACCEPTANCE_CUTOFF_STEP; a paper passes a cutoff if the mean of
+# its non-abstain review scores is at least the cutoff.
+ACCEPTANCE_CUTOFF_STEP = getattr(settings, 'ACCEPTANCE_CUTOFF_STEP', 0.25)
+
+RankedPaper = collections.namedtuple('RankedPaper', [
+    'id',
+    'title',
+    'paper_type_id',
+    'mean_score',       # None if the paper has no non-abstain reviews
+    'num_reviews',      # non-abstain reviews
+    'rank',             # 1 = best mean score within the paper type
+    'is_accepted',
+])
+
+_SCORE = 'paper__decision__review_score'
+
+
+def ranked_papers():
+    """ All papers with their mean review score (abstains ignored) and
+        rank within their paper type, in one query ordered by paper type
+        and rank.
+    """
+    rows = (Paper.objects
+        .annotate(
+            mean_score=Avg(_SCORE, filter=scored_reviews('paper__')),
+            num_reviews=Count('paper', filter=scored_reviews('paper__')))
+        .annotate(rank=Window(
+            expression=Rank(),
+            partition_by=[F('paper_type_id')],
+            order_by=F('mean_score').desc(nulls_last=True)))
+        .order_by('paper_type_id', 'rank', 'title')
+        .values_list('id', 'title', 'paper_type_id', 'mean_score',
+                     'num_reviews', 'rank', 'is_accepted'))
+    return [RankedPaper(*row) for row in rows]
+
+
+def candidate_cutoffs():
+    import numpy as np
+
+    max_score = max((rs.review_score
+                     for rs in reference_data.all_objects(ReviewScore)),
+                    default=0)
+    return np.round(np.arange(1, max_score + 1e-9, ACCEPTANCE_CUTOFF_STEP), 2)
+
+
+def preview(papers, cutoffs):
+    """ {paper_type_id: [(cutoff, number of papers passing)]}, counted for
+        all paper types and cutoffs in one pass over the ranked papers.
+    """
+    import numpy as np
+
+    type_ids = [pt.id for pt in reference_data.all_objects(PaperType)]
+    scores = np.array([np.nan if p.mean_score is None else p.mean_score
+                       for p in papers], dtype=float)
+    # papers x paper types (one-hot) and papers x cutoffs (passes)
+    is_type = np.equal.outer([p.paper_type_id for p in papers], type_ids)
+    with np.errstate(invalid='ignore'):
+        passes = np.greater_equal.outer(scores, cutoffs)
+    counts = is_type.T.astype(np.int64) @ passes.astype(np.int64)
+    return {
+        type_id: list(zip(cutoffs.tolist(), counts[i].tolist()))
+        for i, type_id in enumerate(type_ids)
+    }
+
+
+def apply_cutoffs(cutoffs_by_type):
+    """ Accept the papers of each paper type in cutoffs_by_type ({paper
+        type id: cutoff}) whose mean score reaches the cutoff, and un-accept
+        the rest, with a single bulk_update. Papers of other types are not
+        touched. Returns the ids of the papers whose is_accepted changed.
+    """
+    with transaction.atomic():
+        changed = []
+        for paper in ranked_papers():
+            cutoff = cutoffs_by_type.get(paper.paper_type_id)
+            if cutoff is None:
+                continue
+            is_accepted = (paper.mean_score is not None and
+                           paper.mean_score >= cutoff)
+            if is_accepted != paper.is_accepted:
+                changed.append(Paper(id=paper.id, is_accepted=is_accepted))
+        Paper.objects.bulk_update(changed, ['is_accepted'], batch_size=1000)
+    # bulk_update sends no signals
+    changed_ids = [paper.id for paper in changed]
+    if changed_ids:
+        paper_detail.invalidate_papers(changed_ids)
+        dashboard.invalidate_papers(changed_ids)
+    return changed_ids
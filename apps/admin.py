@@ -10,17 +10,52 @@ from .models import (
     ReviewScore,
     RejectionReason,
     Review,
+    ReviewerProgress,
+    PaperScoreSummary,
+    ReviewAssignment,
+    RelatedPaper,
     Event,
 )
 
 # Register your models here.
 admin.site.register(Organization)
 admin.site.register(TimeZone)
-admin.site.register(Attendee)
 admin.site.register(PaperType)
 admin.site.register(PaperTheme)
-admin.site.register(Paper)
 admin.site.register(ReviewScore)
 admin.site.register(RejectionReason)
-admin.site.register(Review)
+admin.site.register(ReviewerProgress)
 admin.site.register(Event)
+
+
+# Models whose __str__ follows foreign keys join them into the changelist
+# query instead of fetching them once per row.
+
+@admin.register(Attendee)
+class AttendeeAdmin(admin.ModelAdmin):
+    list_select_related = ('user', 'org')
+
+
+@admin.register(Paper)
+class PaperAdmin(admin.ModelAdmin):
+    list_select_related = ('primary_author', 'primary_author__org')
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_select_related = ('reviewer', 'paper')
+
+
+@admin.register(ReviewAssignment)
+class ReviewAssignmentAdmin(admin.ModelAdmin):
+    list_select_related = ('reviewer', 'paper')
+
+
+@admin.register(PaperScoreSummary)
+class PaperScoreSummaryAdmin(admin.ModelAdmin):
+    list_select_related = ('paper',)
+
+
+@admin.register(RelatedPaper)
+class RelatedPaperAdmin(admin.ModelAdmin):
+    list_select_related = ('paper', 'related')
@@ -3,3 +3,19 @@ from django.apps import AppConfig
 
 class AppsConfig(AppConfig):
     name = 'apps'
+
+    def ready(self):
+        # register signal receivers that keep derived data up to date
+        from . import (  # noqa: F401
+            author_index,
+            dashboard,
+            duplicates,
+            event_phase,
+            paper_detail,
+            paper_scores,
+            paper_search,
+            reference_data,
+            reviewer_progress,
+            reviewer_reports,
+            timeseries,
+        )
@@ -0,0 +1,193 @@
+import bisect
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import reference_data
+from .models import Attendee, Organization
+
+# Every process keeps a search index over the names of registered attendees,
+# used to pick (co-)authors without shipping the whole attendee list to the
+# browser. Emails are not indexed, so the endpoint cannot be used to probe
+# for registered addresses. Saves and deletes in this process update it in
+# place, the TTL bounds how long other workers miss new registrants.
+AUTHOR_INDEX_TTL = getattr(settings, 'AUTHOR_INDEX_TTL', 300)
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _author_label(name, org_id):
+    org = reference_data.get(Organization, org_id) if org_id else None
+    if org is None:
+        return name
+    return '{:s} ({:s})'.format(name, org.org_name)
+
+
+class AuthorIndex(object):
+    """ Word prefix and trigram index over attendee names. """
+
+    def __init__(self):
+        self._labels = {}       # id -> display label
+        self._texts = {}        # id -> lowercased name
+        self._tokens = []       # sorted (token, id) pairs
+        self._postings = {}     # trigram -> set of ids
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._labels)
+
+    def _remove(self, pk):
+        text = self._texts.pop(pk, None)
+        if text is None:
+            return
+        del self._labels[pk]
+        for token in set(text.split()):
+            i = bisect.bisect_left(self._tokens, (token, pk))
+            if i < len(self._tokens) and self._tokens[i] == (token, pk):
+                del self._tokens[i]
+        for trigram in _trigrams(text):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(pk)
+                if not postings:
+                    del self._postings[trigram]
+
+    def _add(self, pk, name, label, keep_sorted=True):
+        text = ' '.join(name.lower().split())
+        self._labels[pk] = label
+        self._texts[pk] = text
+        for token in set(text.split()):
+            if keep_sorted:
+                bisect.insort(self._tokens, (token, pk))
+            else:
+                self._tokens.append((token, pk))
+        for trigram in _trigrams(text):
+            self._postings.setdefault(trigram, set()).add(pk)
+
+    def load(self, rows):
+        """ Bulk load (id, name, label) rows into an empty index. """
+        with self._lock:
+            for pk, name, label in rows:
+                if name.strip() != '':
+                    self._add(pk, name, label, keep_sorted=False)
+            self._tokens.sort()
+
+    def update(self, pk, name, label):
+        """ Add or replace one attendee, a blank name removes it. """
+        with self._lock:
+            self._remove(pk)
+            if name.strip() != '':
+                self._add(pk, name, label)
+
+    def remove(self, pk):
+        with self._lock:
+            self._remove(pk)
+
+    def label(self, pk):
+        return self._labels.get(pk)
+
+    def _prefix_matches(self, query):
+        i = bisect.bisect_left(self._tokens, (query, -1))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(query):
+            yield self._tokens[i][1]
+            i += 1
+
+    def _substring_matches(self, query):
+        # walk the rarest trigram's postings, checking the full query
+        postings = min((self._postings.get(t, ()) for t in _trigrams(query)),
+                       key=len)
+        return (pk for pk in postings if query in self._texts[pk])
+
+    def search(self, query, limit=20):
+        """ (id, label) pairs of up to limit attendees matching the query.
+
+            Attendees with a name word starting with the query come
+            first, in word order, followed (for queries of 3 or more
+            characters) by those containing it anywhere. Stops as soon as
+            limit matches are found, so common queries stay cheap.
+        """
+        query = ' '.join(query.lower().split())
+        if query == '':
+            return []
+        with self._lock:
+            matches = self._prefix_matches(query)
+            if len(query) >= 3:
+                matches = itertools.chain(
+                    matches, self._substring_matches(query))
+            pks = []
+            for pk in matches:
+                if pk not in pks:
+                    pks.append(pk)
+                    if len(pks) == limit:
+                        break
+            return [(pk, self._labels[pk]) for pk in pks]
+
+
+_lock = threading.Lock()
+_state = {'index': None, 'expires_at': 0.0}
+
+
+def build_index():
+    """ Build the index from the database with a single projected query. """
+    index = AuthorIndex()
+    rows = (Attendee.objects
+        .exclude(name__exact='')
+        .values_list('id', 'name', 'org_id')
+        .iterator())
+    index.load((pk, name, _author_label(name, org_id))
+               for pk, name, org_id in rows)
+    with _lock:
+        _state['index'] = index
+        _state['expires_at'] = time.monotonic() + AUTHOR_INDEX_TTL
+    return index
+
+
+def get_index():
+    with _lock:
+        if (_state['index'] is not None
+                and time.monotonic() < _state['expires_at']):
+            return _state['index']
+    return build_index()
+
+
+def invalidate():
+    """ Drop this process' index, e.g. after a bulk import. """
+    with _lock:
+        _state['index'] = None
+        _state['expires_at'] = 0.0
+
+
+def search_authors(query, limit=20):
+    return get_index().search(query, limit=limit)
+
+
+def author_label(pk):
+    """ Display label for an attendee id, without touching the database
+        when the attendee is indexed.
+    """
+    label = get_index().label(pk)
+    if label is None:
+        attendee = Attendee.objects.filter(pk=pk).first()
+        label = str(attendee) if attendee is not None else str(pk)
+    return label
+
+
+@receiver(post_save, sender=Attendee)
+def update_author_index(sender, instance, **kwargs):
+    index = _state['index']
+    if index is not None:
+        index.update(instance.id, instance.name,
+                     _author_label(instance.name, instance.org_id))
+
+
+@receiver(post_delete, sender=Attendee)
+def remove_from_author_index(sender, instance, **kwargs):
+    index = _state['index']
+    if index is not None:
+        index.remove(instance.id)
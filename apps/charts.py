@@ -0,0 +1,162 @@
+import collections
+import hashlib
+import threading
+
+from django.conf import settings
+
+# plotly is imported inside the render functions, so that only processes
+# that actually draw a chart pay for loading it.
+
+# Rendered chart divs, keyed on a fingerprint of the chart type, title and
+# data, so a stats page whose data has not changed skips plotly entirely.
+CHART_CACHE_SIZE = getattr(settings, 'CHART_CACHE_SIZE', 64)
+
+
+class _LRUCache(object):
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+_chart_cache = _LRUCache(CHART_CACHE_SIZE)
+
+
+def chart_cache_info():
+    """ Hit / miss / eviction counters and current size of the chart cache. """
+    return _chart_cache.info()
+
+
+def clear_chart_cache():
+    _chart_cache.clear()
+
+
+def _fingerprint(render_fn, args):
+    key = repr((render_fn.__name__, args)).encode('utf-8')
+    return hashlib.sha1(key).hexdigest()
+
+
+def _render_pie_chart(value_counts, chart_title):
+    from plotly.offline import plot
+    import plotly.graph_objs as go
+
+    values = [vc[0] for vc in value_counts]
+    counts = [vc[1] for vc in value_counts]
+    fig = go.Figure()
+    pie = go.Pie(values=counts, labels=values,
+        hole=0.5, showlegend=True, name=chart_title)
+    fig.update_layout(autosize=False,
+        width=300, height=300,
+        margin=dict(l=50, r=50, b=50, t=50, pad=4))
+    fig.add_trace(pie)
+    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
+    return plt_div
+
+
+def _render_bar_chart(value_counts, chart_title):
+    from plotly.offline import plot
+    import plotly.graph_objs as go
+
+    values = [vc[0] for vc in value_counts]
+    counts = [vc[1] for vc in value_counts]
+    fig = go.Figure()
+    bar = go.Bar(x=counts, y=values,
+        showlegend=False, name=chart_title,
+        orientation='h')
+    fig.update_layout(autosize=False,
+        width=300, height=600,
+        margin=dict(l=50, r=50, b=50, t=50, pad=4),
+        template='plotly_white')
+    fig.add_trace(bar)
+    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
+    return plt_div
+
+
+def _render_histogram(score_counts, all_scores, chart_title, paper_count):
+    from plotly.offline import plot
+    import plotly.graph_objs as go
+
+    score_values = [v for v, _ in score_counts]
+    score_counts = [(100 * c / max(paper_count, 1)) for _, c in score_counts]
+    fig = go.Figure()
+    bar = go.Bar(x=score_values, y=score_counts,
+                 name=chart_title,
+                 orientation='v')
+    all_values = [v for v, _ in all_scores]
+    all_counts = [c for _, c in all_scores]
+    line = go.Scatter(x=all_values, y=all_counts,
+                      name="Overall Reviews")
+    fig.update_layout(autosize=False,
+                      width=600, height=300,
+                      margin=dict(l=50, r=50, b=50, t=50, pad=4),
+                      template='plotly_white')
+    fig.update_xaxes(type='category', title_text='rating')
+    fig.update_yaxes(title_text='percent count')
+    fig.add_trace(bar)
+    fig.add_trace(line)
+    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
+    return plt_div
+
+
+def pie_chart(value_counts, chart_title):
+    return (_render_pie_chart, (tuple(value_counts), chart_title))
+
+
+def bar_chart(value_counts, chart_title):
+    return (_render_bar_chart, (tuple(value_counts), chart_title))
+
+
+def histogram(score_counts, all_scores, chart_title, paper_count):
+    return (_render_histogram,
+            (tuple(score_counts), tuple(all_scores), chart_title, paper_count))
+
+
+def render_charts(*charts):
+    """ Render chart specs built by pie_chart(), bar_chart() and histogram()
+        into plotly divs, in the order given.
+
+        Divs whose data has been rendered before come from the cache, only
+        the remaining charts of the page are rendered.
+    """
+    divs = []
+    for render_fn, args in charts:
+        key = _fingerprint(render_fn, args)
+        div = _chart_cache.get(key)
+        if div is None:
+            div = render_fn(*args)
+            _chart_cache.put(key, div)
+        divs.append(div)
+    return divs
@@ -0,0 +1,145 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save, pre_delete)
+from django.dispatch import receiver
+
+from .models import Attendee, Paper, Review, ReviewAssignment
+
+# The submitted papers and review task tables of the dashboard are cached
+# as template fragments keyed by attendee, event phase and a data version.
+# The version combines a global part, replaced after bulk changes to many
+# papers, and a per-attendee part, replaced when the attendee's own reviews
+# or review assignments change, or a paper they author, co-author or
+# review (reviewers' task lists show paper details) changes.
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 60 * 60)
+
+_PAPERS_VERSION_KEY = 'dashboard:version:papers'
+
+
+def _attendee_version_key(attendee_id):
+    return 'dashboard:version:attendee:{}'.format(attendee_id)
+
+
+def _get_or_add(key):
+    version = cache.get(key)
+    if version is None:
+        # a fresh version (not 1) in case the old one was evicted
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_version(attendee_id):
+    """ Data version of an attendee's dashboard fragments. """
+    return '{}.{}'.format(_get_or_add(_PAPERS_VERSION_KEY),
+                          _get_or_add(_attendee_version_key(attendee_id)))
+
+
+def invalidate_all():
+    cache.set(_PAPERS_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate(attendee_ids):
+    version = time.time_ns()
+    cache.set_many({_attendee_version_key(attendee_id): version
+                    for attendee_id in attendee_ids}, None)
+
+
+def paper_attendee_ids(paper_ids):
+    """ Ids of the authors, co-authors and reviewers (assigned or with a
+        review) of papers, in one query.
+    """
+    paper_ids = list(paper_ids)
+    authors = (Paper.objects
+        .filter(id__in=paper_ids)
+        .values_list('primary_author_id', flat=True))
+    co_authors = (Paper.co_authors.through.objects
+        .filter(paper_id__in=paper_ids)
+        .values_list('attendee_id', flat=True))
+    reviewers = [model.objects
+                 .filter(paper_id__in=paper_ids)
+                 .values_list('reviewer_id', flat=True)
+                 for model in (ReviewAssignment, Review)]
+    return set(authors.union(co_authors, *reviewers))
+
+
+def invalidate_papers(paper_ids, batch_size=500):
+    """ invalidate() the dashboards of everyone linked to the papers. """
+    paper_ids = list(paper_ids)
+    for start in range(0, len(paper_ids), batch_size):
+        invalidate(paper_attendee_ids(paper_ids[start:start + batch_size]))
+
+
+@receiver(post_init, sender=Paper)
+def remember_primary_author(sender, instance, **kwargs):
+    # read __dict__, not the attribute, so a deferred field stays deferred;
+    # a paper handed to another author must refresh both dashboards
+    instance._dashboard_author_id = instance.__dict__.get('primary_author_id')
+
+
+@receiver(post_save, sender=Paper)
+def invalidate_on_paper_change(sender, instance, **kwargs):
+    attendee_ids = paper_attendee_ids([instance.id])
+    if instance._dashboard_author_id is not None:
+        attendee_ids.add(instance._dashboard_author_id)
+    invalidate(attendee_ids)
+    instance._dashboard_author_id = instance.primary_author_id
+
+
+@receiver(pre_delete, sender=Paper)
+def collect_paper_attendees(sender, instance, **kwargs):
+    # co-authors and reviews are gone by post_delete
+    instance._dashboard_attendee_ids = paper_attendee_ids([instance.id])
+
+
+@receiver(post_delete, sender=Paper)
+def invalidate_on_paper_delete(sender, instance, **kwargs):
+    invalidate(getattr(instance, '_dashboard_attendee_ids', set()) |
+               {instance.primary_author_id})
+
+
+@receiver(m2m_changed, sender=Paper.themes.through)
+@receiver(m2m_changed, sender=Paper.co_authors.through)
+def invalidate_on_paper_links_change(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+    if reverse:
+        # instance is the theme or co-author, pk_set the papers
+        paper_ids = pk_set if pk_set is not None else (
+            instance.paper_set.values_list('id', flat=True))
+        attendee_ids = paper_attendee_ids(paper_ids)
+    else:
+        attendee_ids = paper_attendee_ids([instance.id])
+        if sender is Paper.co_authors.through and pk_set:
+            # co-authors just removed are no longer linked to the paper
+            attendee_ids |= set(pk_set)
+    if isinstance(instance, Attendee):
+        attendee_ids.add(instance.id)
+    invalidate(attendee_ids)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=ReviewAssignment)
+@receiver(post_delete, sender=ReviewAssignment)
+def invalidate_on_review_change(sender, instance, **kwargs):
+    invalidate([instance.reviewer_id])
+
+
+@receiver(post_save, sender=Attendee)
+def invalidate_on_attendee_change(sender, instance, created,
+                                  update_fields=None, **kwargs):
+    if created or update_fields is not None and not (
+            {'name', 'org', 'is_reviewer', 'is_speaker', 'is_organizer'}
+            & set(update_fields)):
+        return
+    # the attendee's own flags, and their name on others' papers
+    author_ids = set(Paper.objects
+        .filter(Q(primary_author=instance) | Q(co_authors=instance))
+        .values_list('primary_author_id', flat=True))
+    invalidate(author_ids | {instance.id})
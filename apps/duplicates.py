@@ -0,0 +1,299 @@
+import collections
+import functools
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Paper, PaperSignature, PaperSignatureBand
+
+# Papers are compared by the Jaccard similarity of their word shingles (runs
+# of DUPLICATE_SHINGLE_SIZE words of title + abstract), estimated from
+# MinHash signatures of DUPLICATE_NUM_PERM values. LSH banding splits each
+# signature into DUPLICATE_LSH_BANDS bands (which must divide
+# DUPLICATE_NUM_PERM); only papers whose signatures agree on a whole band
+# are compared, which finds pairs above roughly (1 / bands) ** (1 / rows
+# per band) similarity without comparing all pairs. Pairs are reported
+# from DUPLICATE_THRESHOLD estimated similarity. Stored signatures also
+# keep a hashed bucket per band (PaperSignatureBand), so the papers like
+# a new submission are found with an index lookup, and a hash of the text
+# they were computed from, so saving a paper with the same title and
+# abstract does not recompute them.
+DUPLICATE_SHINGLE_SIZE = getattr(settings, 'DUPLICATE_SHINGLE_SIZE', 3)
+DUPLICATE_NUM_PERM = getattr(settings, 'DUPLICATE_NUM_PERM', 128)
+DUPLICATE_LSH_BANDS = getattr(settings, 'DUPLICATE_LSH_BANDS', 32)
+DUPLICATE_THRESHOLD = getattr(settings, 'DUPLICATE_THRESHOLD', 0.5)
+
+# MinHash functions are h(x) = (a * x + b) mod _PRIME over 32 bit shingle
+# hashes, with a and b drawn from a fixed seed so that signatures stay
+# comparable across processes and with saved archives
+_PRIME = (1 << 32) + 15
+_SEED = 20210401
+
+DuplicatePair = collections.namedtuple('DuplicatePair', [
+    'first',            # label (paper id) of a current submission
+    'second',           # label of the submission or archived paper
+    'similarity',       # estimated Jaccard similarity, 0 to 1
+])
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_coefficients(num_perm):
+    import numpy as np
+
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+    return a, b
+
+
+def paper_text(title, abstract):
+    return '{:s}\n{:s}'.format(title, abstract)
+
+
+def text_hash(title, abstract):
+    return hashlib.sha1(
+        paper_text(title, abstract).encode('utf-8')).hexdigest()
+
+
+def shingles(text):
+    """ Set of the runs of DUPLICATE_SHINGLE_SIZE lowercased words. """
+    words = re.findall(r'\w+', text.lower())
+    size = DUPLICATE_SHINGLE_SIZE
+    return {' '.join(words[i:i + size])
+            for i in range(max(len(words) - size + 1, 1))}
+
+
+def minhash(text):
+    """ MinHash signature (DUPLICATE_NUM_PERM uint32 values) of text. """
+    import numpy as np
+
+    hashes = np.array([zlib.crc32(shingle.encode('utf-8'))
+                       for shingle in shingles(text)], dtype=np.uint64)
+    a, b = _hash_coefficients(DUPLICATE_NUM_PERM)
+    # a * x + b < 2 ** 64 for x, a, b < 2 ** 32, so no overflow
+    return ((a * hashes + b) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+class SignatureStore(object):
+    """ MinHash signatures of many documents, kept as one (documents x
+        DUPLICATE_NUM_PERM) uint32 array, with a label per document (paper
+        id, or title for archived papers).
+    """
+
+    def __init__(self, labels, signatures):
+        self.labels = list(labels)
+        self.signatures = signatures
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def from_signatures(cls, labels, signatures):
+        import numpy as np
+
+        signatures = list(signatures)
+        return cls(labels, np.stack(signatures) if signatures
+                   else np.zeros((0, DUPLICATE_NUM_PERM), dtype=np.uint32))
+
+    @classmethod
+    def from_papers(cls):
+        """ Stored signatures of all papers, labelled by paper id. """
+        import numpy as np
+
+        rows = list(PaperSignature.objects
+            .values_list('paper_id', 'signature')
+            .order_by('paper_id'))
+        signatures = np.frombuffer(
+            b''.join(bytes(signature) for _, signature in rows),
+            dtype='<u4').reshape(-1, DUPLICATE_NUM_PERM)
+        return cls([paper_id for paper_id, _ in rows],
+                   signatures.astype(np.uint32))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """ Signatures of row dicts with title and abstract, labelled by
+            title, e.g. a previous summit's paper export. A missing or empty
+            title or abstract counts as empty text.
+        """
+        rows = [(row.get('title') or '', row.get('abstract') or '')
+                for row in rows]
+        return cls.from_signatures(
+            [title for title, _ in rows],
+            (minhash(paper_text(title, abstract)) for title, abstract in rows))
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(data['labels'].tolist(), data['signatures'])
+
+    def save(self, path):
+        import numpy as np
+
+        np.savez_compressed(path, labels=np.array(self.labels, dtype=str),
+                            signatures=self.signatures)
+
+
+def candidate_pairs(signatures, bands=DUPLICATE_LSH_BANDS):
+    """ (i, j) row pairs, i < j, whose signatures agree on every value of
+        at least one band, as an (n, 2) array.
+    """
+    import numpy as np
+
+    rows = signatures.shape[1] // bands
+    pairs = [np.zeros((0, 2), dtype=np.int64)]
+    for band in range(bands):
+        block = np.ascontiguousarray(
+            signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.itemsize * rows))).ravel()
+        _, bucket, sizes = np.unique(
+            keys, return_inverse=True, return_counts=True)
+        bucket = bucket.ravel()
+        shared = np.flatnonzero(sizes[bucket] > 1)
+        shared = shared[np.argsort(bucket[shared], kind='stable')]
+        starts = np.flatnonzero(np.diff(bucket[shared])) + 1
+        for members in np.split(shared, starts):
+            i, j = np.triu_indices(len(members), 1)
+            pairs.append(np.stack([members[i], members[j]], axis=1))
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def find_duplicates(store, archive=None, threshold=DUPLICATE_THRESHOLD):
+    """ Pairs of store documents, and of store and archive documents, with
+        estimated similarity of at least threshold, most similar first.
+    """
+    import numpy as np
+
+    signatures = store.signatures
+    labels = store.labels
+    if archive is not None:
+        signatures = np.concatenate([signatures, archive.signatures])
+        labels = labels + archive.labels
+    pairs = candidate_pairs(signatures)
+    # store rows come first, so i < len(store) unless both are archived
+    pairs = pairs[pairs[:, 0] < len(store)]
+    similarity = (signatures[pairs[:, 0]] ==
+                  signatures[pairs[:, 1]]).mean(axis=1)
+    keep = np.flatnonzero(similarity >= threshold)
+    keep = keep[np.argsort(-similarity[keep], kind='stable')]
+    return [DuplicatePair(labels[i], labels[j], float(s))
+            for (i, j), s in zip(pairs[keep].tolist(),
+                                 similarity[keep].tolist())]
+
+
+def band_buckets(signature_bytes):
+    """ Bucket of each LSH band of a stored signature, as signed 64 bit
+        hashes of the band number and values.
+    """
+    size = 4 * DUPLICATE_NUM_PERM // DUPLICATE_LSH_BANDS
+    return [int.from_bytes(
+                hashlib.blake2b(
+                    band.to_bytes(2, 'little') +
+                    signature_bytes[band * size:(band + 1) * size],
+                    digest_size=8).digest(),
+                'little', signed=True)
+            for band in range(DUPLICATE_LSH_BANDS)]
+
+
+def similar_papers(paper, threshold=DUPLICATE_THRESHOLD):
+    """ [(paper id, similarity)] of other papers that look like paper, most
+        similar first. Uses the same banding as find_duplicates(); only the
+        signatures sharing a band bucket with paper are loaded.
+    """
+    import numpy as np
+
+    signature = _signature_bytes(paper.title, paper.abstract)
+    candidates = (PaperSignatureBand.objects
+        .filter(bucket__in=band_buckets(signature))
+        .exclude(paper_id=paper.id)
+        .values('paper_id'))
+    rows = list(PaperSignature.objects
+        .filter(paper_id__in=candidates)
+        .values_list('paper_id', 'signature')
+        .order_by('paper_id'))
+    if not rows:
+        return []
+    signatures = np.frombuffer(
+        b''.join(bytes(other) for _, other in rows),
+        dtype='<u4').reshape(-1, DUPLICATE_NUM_PERM)
+    similarity = (signatures ==
+                  np.frombuffer(signature, dtype='<u4')).mean(axis=1)
+    order = np.argsort(-similarity, kind='stable')
+    return [(rows[k][0], float(similarity[k]))
+            for k in order if similarity[k] >= threshold]
+
+
+def _signature_bytes(title, abstract):
+    return minhash(paper_text(title, abstract)).astype('<u4').tobytes()
+
+
+def _band_rows(paper_id, signature_bytes):
+    return [PaperSignatureBand(paper_id=paper_id, bucket=bucket)
+            for bucket in band_buckets(signature_bytes)]
+
+
+def _delete_signatures(papers):
+    PaperSignature.objects.filter(paper__in=papers).delete()
+    PaperSignatureBand.objects.filter(paper__in=papers).delete()
+
+
+def _signature(title, abstract):
+    return text_hash(title, abstract), _signature_bytes(title, abstract)
+
+
+def _store_signatures(signatures):
+    # signatures: {paper id: (text hash, signature bytes)} of papers
+    # without one
+    PaperSignature.objects.bulk_create([
+        PaperSignature(paper_id=paper_id, text_hash=paper_hash,
+                       signature=signature)
+        for paper_id, (paper_hash, signature) in signatures.items()],
+        batch_size=1000)
+    PaperSignatureBand.objects.bulk_create([
+        band for paper_id, (_, signature) in signatures.items()
+        for band in _band_rows(paper_id, signature)], batch_size=1000)
+
+
+def sign_papers(papers):
+    """ Store the signatures of Paper objects, e.g. after a bulk_create. """
+    with transaction.atomic():
+        _delete_signatures(papers)
+        _store_signatures({
+            paper.id: _signature(paper.title, paper.abstract)
+            for paper in papers})
+
+
+def rebuild_signatures(batch_size=2000):
+    """ Recompute the signatures of all papers, returns how many. """
+    rows = (Paper.objects
+        .order_by('id')
+        .values_list('id', 'title', 'abstract')
+        .iterator(chunk_size=batch_size))
+    signatures = {paper_id: _signature(title, abstract)
+                  for paper_id, title, abstract in rows}
+    with transaction.atomic():
+        PaperSignature.objects.all().delete()
+        PaperSignatureBand.objects.all().delete()
+        _store_signatures(signatures)
+    return len(signatures)
+
+
+@receiver(post_save, sender=Paper)
+def sign_on_paper_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not (
+            {'title', 'abstract'} & set(update_fields)):
+        return
+    paper_hash = text_hash(instance.title, instance.abstract)
+    if PaperSignature.objects.filter(
+            paper_id=instance.id, text_hash=paper_hash).exists():
+        return
+    with transaction.atomic():
+        _delete_signatures([instance])
+        _store_signatures({instance.id: (paper_hash, _signature_bytes(
+            instance.title, instance.abstract))})
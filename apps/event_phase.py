@@ -0,0 +1,64 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Event
+
+# The current event only changes when an organizer moves the conference to
+# its next phase in admin. The saving worker drops its copy right away, the
+# TTL bounds how long other workers keep serving the previous phase.
+EVENT_PHASE_TTL = getattr(settings, 'EVENT_PHASE_TTL', 30)
+
+# event_seq used when no event is marked current (the Signup phase)
+DEFAULT_EVENT_SEQ = 0
+
+_lock = threading.Lock()
+_cached = {'event': None, 'expires_at': 0.0}
+
+
+def _load_current_event():
+    return (Event.objects.filter(is_current=True)
+        .order_by('-event_seq')
+        .first())
+
+
+def get_current_event():
+    """ Current Event (or None if no event is marked current), cached in
+        process memory for up to EVENT_PHASE_TTL seconds.
+    """
+    now = time.monotonic()
+    with _lock:
+        if now < _cached['expires_at']:
+            return _cached['event']
+    event = _load_current_event()
+    with _lock:
+        _cached['event'] = event
+        _cached['expires_at'] = now + EVENT_PHASE_TTL
+    return event
+
+
+def get_current_event_seq():
+    event = get_current_event()
+    if event is None:
+        return DEFAULT_EVENT_SEQ
+    return event.event_seq
+
+
+def invalidate_current_event():
+    with _lock:
+        _cached['event'] = None
+        _cached['expires_at'] = 0.0
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_current_event_on_change(sender, **kwargs):
+    invalidate_current_event()
+
+
+def current_event(request):
+    """ Template context processor exposing the current event phase. """
+    return {'current_event': get_current_event_seq()}
@@ -0,0 +1,230 @@
+import csv
+import itertools
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, Q
+
+from .models import Attendee, Paper, Review, scored_reviews
+
+# Exports stream projected rows straight from a database cursor, so memory
+# use depends on the chunk size and not on the number of rows exported.
+# The event phase decides which columns are exported (events have no dates
+# that rows could be filtered by), the accepted filter which rows.
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# (column, values() field, event_seq from which the column is exported),
+# a field of None marks a column filled in per chunk of rows
+PAPER_COLUMNS = [
+    ('id', 'id', 0),
+    ('paper_type', 'paper_type__paper_type_name', 0),
+    ('title', 'title', 0),
+    ('abstract', 'abstract', 0),
+    ('keywords', 'keywords', 0),
+    ('themes', None, 0),
+    ('primary_author', 'primary_author__name', 0),
+    ('primary_author_email', 'primary_author__email', 0),
+    ('co_authors', None, 0),
+    ('submitted_at', 'submitted_at', 0),
+    ('num_reviews', 'num_reviews', 20),
+    ('num_abstained', 'num_abstained', 20),
+    ('mean_score', 'mean_score', 20),
+    ('is_accepted', 'is_accepted', 30),
+    ('accept_speaker_invite', 'accept_speaker_invite', 40),
+    ('extra_long_paper', 'extra_long_paper', 40),
+    ('publish_abstract_in_ssrn', 'publish_abstract_in_ssrn', 40),
+    ('publish_full_paper_in_ssrn', 'publish_full_paper_in_ssrn', 40),
+    ('scheduled_at', 'scheduled_at', 50),
+    ('track', 'track', 50),
+]
+REVIEW_COLUMNS = [
+    ('id', 'id', 0),
+    ('paper_id', 'paper_id', 0),
+    ('paper_title', 'paper__title', 0),
+    ('reviewer', 'reviewer__name', 0),
+    ('reviewer_email', 'reviewer__email', 0),
+    ('decision', 'decision__review_decision', 0),
+    ('review_score', 'decision__review_score', 0),
+    ('reason_if_rejected', 'reason_if_rejected__reject_reason', 0),
+    ('comments', 'comments', 0),
+    ('reviewed_at', 'reviewed_at', 0),
+]
+ATTENDEE_COLUMNS = [
+    ('id', 'id', 0),
+    ('name', 'name', 0),
+    ('email', 'email', 0),
+    ('org', 'org__org_name', 0),
+    ('timezone', 'timezone__utc_offset', 0),
+    ('is_attendee', 'is_attendee', 0),
+    ('is_reviewer', 'is_reviewer', 0),
+    ('is_speaker', 'is_speaker', 30),
+    ('is_organizer', 'is_organizer', 0),
+]
+
+
+def _columns(columns, phase):
+    return [(name, field) for name, field, min_phase in columns
+            if phase >= min_phase]
+
+
+def _chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _group(pairs):
+    groups = {}
+    for key, value in pairs:
+        groups.setdefault(key, []).append(value)
+    return groups
+
+
+def _stream(queryset, columns, extra_columns=None):
+    """ Rows of queryset projected on columns, as tuples. extra_columns,
+        if given, maps a chunk of row dicts to {column: {id: value}} for
+        the columns without a field.
+    """
+    fields = [field for _, field in columns if field is not None]
+    rows = (queryset
+        .order_by('id')
+        .values(*fields)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    for chunk in _chunked(rows, EXPORT_CHUNK_SIZE):
+        extras = extra_columns(chunk) if extra_columns is not None else {}
+        for row in chunk:
+            yield tuple(row[field] if field is not None
+                        else extras[name].get(row['id'], '')
+                        for name, field in columns)
+
+
+def _paper_links(chunk):
+    paper_ids = [row['id'] for row in chunk]
+    themes = _group(Paper.themes.through.objects
+        .filter(paper_id__in=paper_ids)
+        .order_by('papertheme_id')
+        .values_list('paper_id', 'papertheme__paper_theme'))
+    co_authors = _group(Paper.co_authors.through.objects
+        .filter(paper_id__in=paper_ids)
+        .order_by('id')
+        .values_list('paper_id', 'attendee__name'))
+    return {
+        'themes': {k: '; '.join(v) for k, v in themes.items()},
+        'co_authors': {k: '; '.join(v) for k, v in co_authors.items()},
+    }
+
+
+def export_papers(phase, accepted=None):
+    """ (header, rows) of papers with themes, authors and, from the review
+        phase on, their review counts and mean score (abstains excluded).
+    """
+    columns = _columns(PAPER_COLUMNS, phase)
+    papers = Paper.objects.all()
+    if accepted is not None:
+        papers = papers.filter(is_accepted=accepted)
+    if phase >= 20:
+        papers = papers.annotate(
+            num_reviews=Count('paper'),
+            num_abstained=Count(
+                'paper', filter=~scored_reviews('paper__')),
+            mean_score=Avg(
+                'paper__decision__review_score',
+                filter=scored_reviews('paper__')))
+    return ([name for name, _ in columns],
+            _stream(papers, columns, _paper_links))
+
+
+def export_reviews(phase, accepted=None):
+    """ (header, rows) of reviews, optionally only those of accepted
+        (or not accepted) papers.
+    """
+    columns = _columns(REVIEW_COLUMNS, phase)
+    reviews = Review.objects.all()
+    if accepted is not None:
+        reviews = reviews.filter(paper__is_accepted=accepted)
+    return [name for name, _ in columns], _stream(reviews, columns)
+
+
+def export_attendees(phase, accepted=None):
+    """ (header, rows) of registered attendees, optionally only those who
+        are (or are not) an author of an accepted paper.
+    """
+    columns = _columns(ATTENDEE_COLUMNS, phase)
+    attendees = Attendee.objects.exclude(name__exact='')
+    if accepted is not None:
+        is_author = (
+            Q(id__in=Paper.objects
+                .filter(is_accepted=True)
+                .values('primary_author_id')) |
+            Q(id__in=Paper.co_authors.through.objects
+                .filter(paper__is_accepted=True)
+                .values('attendee_id')))
+        if accepted:
+            attendees = attendees.filter(is_author)
+        else:
+            attendees = attendees.exclude(is_author)
+    return [name for name, _ in columns], _stream(attendees, columns)
+
+
+class _Echo(object):
+    # file-like object for csv.writer, returns the line instead of storing it
+    def write(self, value):
+        return value
+
+
+# a text cell starting with one of these is read as a formula by
+# spreadsheets, so it gets a leading quote
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def _jsonl_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+EXPORTS = {
+    'papers': export_papers,
+    'reviews': export_reviews,
+    'attendees': export_attendees,
+}
+
+# format -> (content type, line writer)
+FORMATS = {
+    'csv': ('text/csv', _csv_lines),
+    'jsonl': ('application/x-ndjson', _jsonl_lines),
+}
+
+
+def _buffered(lines, size):
+    # the first line goes out on its own, so the download starts at once
+    lines = iter(lines)
+    for line in itertools.islice(lines, 1):
+        yield line
+    for chunk in _chunked(lines, size):
+        yield ''.join(chunk)
+
+
+def export(dataset, fmt, phase, accepted=None):
+    """ (content type, iterator of text chunks) exporting dataset (a key of
+        EXPORTS) in format fmt (a key of FORMATS).
+    """
+    content_type, write_lines = FORMATS[fmt]
+    header, rows = EXPORTS[dataset](phase, accepted=accepted)
+    return content_type, _buffered(write_lines(header, rows), 100)
@@ -1,8 +1,10 @@
 from django import forms
 from django.forms import widgets
+from django.forms.models import ModelChoiceIterator
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.urls import reverse_lazy
 
 from .models import (
     Organization,
@@ -15,6 +17,108 @@ from .models import (
     RejectionReason,
     Review
 )
+from . import reference_data
+from .author_index import author_label
+from .imports import format_of
+
+
+class _ReferenceChoiceIterator(ModelChoiceIterator):
+    # iterates the in-memory reference data instead of the queryset
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in reference_data.all_objects(self.queryset.model):
+            yield self.choice(obj)
+
+    def __len__(self):
+        return (len(reference_data.all_objects(self.queryset.model)) +
+                (1 if self.field.empty_label is not None else 0))
+
+    def __bool__(self):
+        return (self.field.empty_label is not None or
+                len(reference_data.all_objects(self.queryset.model)) > 0)
+
+
+def _reference_lookup(field, value):
+    model = field.queryset.model
+    if isinstance(value, model):
+        value = value.pk
+    try:
+        obj = reference_data.get(model, int(value))
+    except (TypeError, ValueError):
+        obj = None
+    if obj is None:
+        raise ValidationError(
+            field.error_messages['invalid_choice'],
+            code='invalid_choice',
+            params={'value': value})
+    return obj
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    """ ModelChoiceField for one of the reference data models, whose
+        choices and validation come from apps.reference_data rather than
+        a query on every render.
+    """
+    iterator = _ReferenceChoiceIterator
+
+    def __init__(self, model, **kwargs):
+        super().__init__(queryset=model.objects.all(), **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        return _reference_lookup(self, value)
+
+
+class ReferenceMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """ ModelMultipleChoiceField counterpart of ReferenceChoiceField. """
+    iterator = _ReferenceChoiceIterator
+
+    def __init__(self, model, **kwargs):
+        super().__init__(queryset=model.objects.all(), **kwargs)
+
+    def _check_values(self, value):
+        try:
+            value = frozenset(value)
+        except TypeError:
+            raise ValidationError(
+                self.error_messages['invalid_list'],
+                code='invalid_list')
+        return [_reference_lookup(self, pk) for pk in value]
+
+
+class _AuthorAutocompleteMixin(object):
+    # Renders only the selected authors as <option>s, the browser finds
+    # others through the attendee_search endpoint (see author_autocomplete.js)
+
+    class Media:
+        js = ('js/author_autocomplete.js',)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse_lazy('attendee_search')
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        options = []
+        for index, pk in enumerate(v for v in value if v not in ('', None)):
+            try:
+                label = author_label(int(pk))
+            except (TypeError, ValueError):
+                continue
+            options.append(self.create_option(
+                name, pk, label, True, index, attrs=attrs))
+        return [(None, options, 0)]
+
+
+class AuthorSelect(_AuthorAutocompleteMixin, widgets.Select):
+    pass
+
+
+class AuthorSelectMultiple(_AuthorAutocompleteMixin, widgets.SelectMultiple):
+    pass
 
 
 class RegisterForm(UserCreationForm):
@@ -26,12 +130,12 @@ class RegisterForm(UserCreationForm):
         max_length=128, 
         required=True, 
         help_text='Enter your email')
-    org = forms.ModelChoiceField(
-        queryset=Organization.objects.all().order_by("org_name"), 
+    org = ReferenceChoiceField(
+        Organization, 
         required=True, 
         help_text='Choose your organization')
-    timezone = forms.ModelChoiceField(
-        queryset=TimeZone.objects.all(), 
+    timezone = ReferenceChoiceField(
+        TimeZone, 
         required=True, 
         help_text='Choose your timezone')
     interested_in_volunteering = forms.BooleanField(
@@ -64,12 +168,12 @@ class ProfileForm(forms.ModelForm):
         max_length=128, 
         required=True, 
         help_text='Enter your email')
-    org = forms.ModelChoiceField(
-        queryset=Organization.objects.all().order_by("org_name"), 
+    org = ReferenceChoiceField(
+        Organization, 
         required=True, 
         help_text='Choose your organization')
-    timezone = forms.ModelChoiceField(
-        queryset=TimeZone.objects.all(), 
+    timezone = ReferenceChoiceField(
+        TimeZone, 
         required=True, 
         help_text='Choose your timezone')
     interested_in_volunteering = forms.BooleanField(
@@ -127,8 +231,8 @@ class PaperAcceptedForm(forms.ModelForm):
 
 
 class PaperForm(forms.ModelForm):
-    paper_type = forms.ModelChoiceField(
-        queryset=PaperType.objects.all(), 
+    paper_type = ReferenceChoiceField(
+        PaperType, 
         required=True, 
         help_text='Choose presentation type')
     title = forms.CharField(
@@ -139,8 +243,8 @@ class PaperForm(forms.ModelForm):
         widget=forms.Textarea,
         required=True, 
         help_text='Enter abstract for presentation (suggested max 500 words)')
-    themes = forms.ModelMultipleChoiceField(
-        queryset=PaperTheme.objects.all(),
+    themes = ReferenceMultipleChoiceField(
+        PaperTheme,
         required=True,
         help_text='Choose one or more themes for your paper')
     keywords = forms.CharField(
@@ -152,18 +256,28 @@ class PaperForm(forms.ModelForm):
     )
     primary_author = forms.ModelChoiceField(
         queryset=author_choices,
+        widget=AuthorSelect,
         required=True,
-        help_text='Choose primary author'
+        help_text='Choose primary author (type a name to search)'
     )
     co_authors = forms.ModelMultipleChoiceField(
         queryset=author_choices,
-        widget=widgets.SelectMultiple(attrs={'size': 20}),
+        widget=AuthorSelectMultiple(attrs={'size': 5}),
         required=False,
-        help_text='Add your co-authors, if any. Mac users select multiple'
-                  'authors by holding down [Cmd] while selecting with mouse.'
-                  'PC/Linux users hold down [Ctrl] while selecting with mouse.'
+        help_text='Add your co-authors, if any, by typing a name and '
+                  'picking from the list. Double click a co-author to '
+                  'remove them.'
     )
 
+    def clean(self):
+        cleaned_data = super().clean()
+        primary_author = cleaned_data.get('primary_author')
+        co_authors = cleaned_data.get('co_authors') or []
+        if primary_author is not None and primary_author in co_authors:
+            self.add_error('co_authors',
+                'The primary author cannot also be listed as a co-author')
+        return cleaned_data
+
     class Meta:
         model = Paper
         fields = [
@@ -175,12 +289,12 @@ class PaperForm(forms.ModelForm):
 
 class ReviewForm(forms.ModelForm):
     paper_choices = Paper.objects.all()
-    decision = forms.ModelChoiceField(
-        queryset=ReviewScore.objects.all(), 
+    decision = ReferenceChoiceField(
+        ReviewScore, 
         required=True, 
         help_text='Enter review score')
-    reason_if_rejected = forms.ModelChoiceField(
-        queryset=RejectionReason.objects.all(),
+    reason_if_rejected = ReferenceChoiceField(
+        RejectionReason,
         required=False,
         help_text='Reasons for rejection (if rejected)')
     comments = forms.CharField(
@@ -194,3 +308,16 @@ class ReviewForm(forms.ModelForm):
             'reason_if_rejected',
             'comments'
         ]
+
+
+class ImportForm(forms.Form):
+    kind = forms.ChoiceField(
+        choices=[('attendees', 'Attendees'), ('papers', 'Papers')])
+    data_file = forms.FileField(
+        help_text='CSV (with header row) or JSONL, see README for fields')
+
+    def clean_data_file(self):
+        data_file = self.cleaned_data['data_file']
+        if format_of(data_file.name) is None:
+            raise ValidationError('Upload a .csv or .jsonl file')
+        return data_file
@@ -0,0 +1,345 @@
+import collections
+import csv
+import itertools
+import json
+import os
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import (
+    author_index, dashboard, duplicates, paper_search, reference_data,
+    timeseries)
+from .models import (
+    Organization,
+    TimeZone,
+    Attendee,
+    PaperType,
+    PaperTheme,
+    Paper,
+    parse_utc_offset,
+)
+
+# Registrants and legacy submissions are imported in batches, each batch
+# validated, then written with bulk_create in its own transaction. Rows are
+# never save()d one by one, so no per-row signals (create_user_attendee,
+# cache invalidation, ...) fire; papers are added to the search index and
+# signed for duplicate detection with each batch, and the caches are
+# refreshed once at the end.
+IMPORT_BATCH_SIZE = getattr(settings, 'IMPORT_BATCH_SIZE', 1000)
+
+ImportResult = collections.namedtuple('ImportResult', [
+    'num_created',      # rows created
+    'num_skipped',      # rows already in the database
+    'errors',           # [(line number, message)] of rejected rows
+])
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def format_of(filename):
+    """ 'csv' or 'jsonl' by file extension, None if not supported. """
+    return FORMATS.get(os.path.splitext(filename)[1].lower())
+
+
+def _decoded_lines(fin):
+    # (line number, text) of a text or binary file, text is None for a
+    # line that is not UTF-8
+    for line_num, line in enumerate(fin, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8-sig' if line_num == 1 else 'utf-8')
+            except UnicodeDecodeError:
+                line = None
+        yield line_num, line
+
+
+def _csv_rows(lines):
+    position, undecodable = [0], []
+
+    def text_lines():
+        for line_num, line in lines:
+            position[0] = line_num
+            if line is None:
+                undecodable.append(line_num)
+            else:
+                yield line
+
+    reader = csv.DictReader(text_lines())
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            row = ValidationError('invalid CSV: {}'.format(e))
+        while undecodable:
+            yield undecodable.pop(0), ValidationError('not UTF-8 text')
+        yield position[0], row
+    for line_num in undecodable:
+        yield line_num, ValidationError('not UTF-8 text')
+
+
+def _jsonl_rows(lines):
+    for line_num, line in lines:
+        if line is None:
+            yield line_num, ValidationError('not UTF-8 text')
+        elif line.strip() != '':
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = ValidationError('invalid JSON: {}'.format(e))
+            if not isinstance(row, (dict, ValidationError)):
+                row = ValidationError('not a JSON object')
+            yield line_num, row
+
+
+def read_rows(fin, fmt):
+    """ (line number, row dict) pairs from a CSV (with header) or JSONL
+        file opened in text or binary mode. A line that cannot be read
+        (not UTF-8, not a JSON object, ...) gives a ValidationError in
+        place of the row, so the rest of the file is still imported.
+    """
+    if fmt == 'csv':
+        return _csv_rows(_decoded_lines(fin))
+    elif fmt == 'jsonl':
+        return _jsonl_rows(_decoded_lines(fin))
+    else:
+        raise ValueError('unknown import format: {}'.format(fmt))
+
+
+def _check_readable(row):
+    # rows read_rows() could not parse are passed on as their error
+    if isinstance(row, ValidationError):
+        raise row
+
+
+def _text(row, field):
+    value = row.get(field)
+    return '' if value is None else str(value).strip()
+
+
+def _flag(row, field):
+    value = row.get(field)
+    if isinstance(value, bool):
+        return value
+    return _text(row, field).lower() in _TRUE_VALUES
+
+
+def _names(row, field):
+    # list in JSONL, ';' separated in CSV
+    value = row.get(field) or []
+    if isinstance(value, str):
+        value = value.split(';')
+    return [str(v).strip() for v in value if str(v).strip() != '']
+
+
+def _lookup(model, name, label):
+    obj = reference_data.get_by_name(model, name)
+    if obj is None:
+        raise ValidationError('unknown {:s} {!r}'.format(label, name))
+    return obj
+
+
+def _timezone(name):
+    # also match offsets spelled differently, e.g. "UTC+05:00" for "UTC+5"
+    if name == '':
+        raise ValidationError('timezone is required')
+    obj = reference_data.get_by_name(TimeZone, name)
+    if obj is None:
+        try:
+            minutes = parse_utc_offset(name)
+        except ValueError:
+            minutes = None
+        obj = next((tz for tz in reference_data.timezones()
+                    if tz.utc_offset_minutes == minutes), None)
+    if obj is None:
+        raise ValidationError('unknown timezone {!r}'.format(name))
+    return obj
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _refresh_caches():
+    author_index.invalidate()
+    dashboard.invalidate_all()
+    timeseries.invalidate('signups')
+    timeseries.invalidate('submissions')
+
+
+def _validate_attendee(row):
+    _check_readable(row)
+    email = _text(row, 'email').lower()
+    validate_email(email)
+    name = _text(row, 'name')
+    if name == '':
+        raise ValidationError('name is required')
+    return {
+        'email': email,
+        'name': name,
+        'org': _lookup(Organization, _text(row, 'org'), 'organization'),
+        'timezone': _timezone(_text(row, 'timezone')),
+        'interested_in_volunteering': _flag(row, 'interested_in_volunteering'),
+        'interested_in_speaking': _flag(row, 'interested_in_speaking'),
+    }
+
+
+def _import_attendee_batch(batch, seen_emails, errors):
+    valid = []
+    for line_num, row in batch:
+        try:
+            values = _validate_attendee(row)
+        except ValidationError as e:
+            errors.append((line_num, '; '.join(e.messages)))
+            continue
+        if values['email'] in seen_emails:
+            errors.append((line_num, 'duplicate email {!r}'.format(
+                values['email'])))
+            continue
+        seen_emails.add(values['email'])
+        valid.append(values)
+    existing = set(User.objects
+        .annotate(username_lower=Lower('username'))
+        .filter(username_lower__in=[v['email'] for v in valid])
+        .values_list('username_lower', flat=True))
+    new = [v for v in valid if v['email'] not in existing]
+    # imported users log in after resetting their password
+    password = make_password(None)
+    with transaction.atomic():
+        User.objects.bulk_create([
+            User(username=v['email'], email=v['email'], password=password)
+            for v in new])
+        user_ids = dict(User.objects
+            .filter(username__in=[v['email'] for v in new])
+            .values_list('username', 'id'))
+        Attendee.objects.bulk_create([
+            Attendee(user_id=user_ids[v['email']], **v) for v in new])
+    return len(new), len(existing)
+
+
+def import_attendees(rows, batch_size=IMPORT_BATCH_SIZE):
+    """ Create a User / Attendee pair for each (line number, row) with
+        email, name, org, timezone and (optionally) the interested_in_*
+        flags. Emails already registered are skipped.
+    """
+    num_created, num_skipped, errors = 0, 0, []
+    seen_emails = set()
+    for batch in _batches(rows, batch_size):
+        created, skipped = _import_attendee_batch(batch, seen_emails, errors)
+        num_created += created
+        num_skipped += skipped
+    if num_created > 0:
+        _refresh_caches()
+    return ImportResult(num_created, num_skipped, errors)
+
+
+def _validate_paper(row, author_ids):
+    _check_readable(row)
+    values = {}
+    for field in ('title', 'abstract', 'keywords'):
+        values[field] = _text(row, field)
+        if values[field] == '':
+            raise ValidationError('{:s} is required'.format(field))
+    values['paper_type'] = _lookup(
+        PaperType, _text(row, 'paper_type'), 'paper type')
+    themes = [_lookup(PaperTheme, name, 'theme')
+              for name in _names(row, 'themes')]
+    if not themes:
+        raise ValidationError('at least one theme is required')
+    emails = [_text(row, 'primary_author').lower()] + [
+        email.lower() for email in _names(row, 'co_authors')]
+    unknown = [email for email in emails if email not in author_ids]
+    if unknown:
+        raise ValidationError('unknown author(s) {:s}'.format(
+            ', '.join(unknown)))
+    values['primary_author_id'] = author_ids[emails[0]]
+    if _text(row, 'submitted_at') != '':
+        try:
+            submitted_at = parse_datetime(_text(row, 'submitted_at'))
+        except ValueError:
+            submitted_at = None
+        if submitted_at is None:
+            raise ValidationError('invalid submitted_at {!r}'.format(
+                _text(row, 'submitted_at')))
+        if timezone.is_naive(submitted_at):
+            submitted_at = timezone.make_aware(submitted_at)
+        values['submitted_at'] = submitted_at
+    values['is_accepted'] = _flag(row, 'is_accepted')
+    co_author_ids = [author_ids[email] for email in emails[1:]]
+    return values, themes, co_author_ids
+
+
+def _import_paper_batch(batch, errors):
+    emails = set()
+    for _, row in batch:
+        if isinstance(row, ValidationError):
+            continue
+        emails.add(_text(row, 'primary_author').lower())
+        emails.update(email.lower() for email in _names(row, 'co_authors'))
+    author_ids = dict(Attendee.objects
+        .annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails)
+        .values_list('email_lower', 'id'))
+    valid = []
+    for line_num, row in batch:
+        try:
+            valid.append(_validate_paper(row, author_ids))
+        except ValidationError as e:
+            errors.append((line_num, '; '.join(e.messages)))
+    with transaction.atomic():
+        # needs a backend that returns primary keys from bulk inserts
+        # (PostgreSQL, SQLite 3.35+) for the m2m rows below
+        papers = Paper.objects.bulk_create([
+            Paper(**values) for values, _, _ in valid])
+        Paper.themes.through.objects.bulk_create([
+            Paper.themes.through(paper_id=paper.id, papertheme_id=theme.id)
+            for paper, (_, themes, _) in zip(papers, valid)
+            for theme in themes], ignore_conflicts=True)
+        Paper.co_authors.through.objects.bulk_create([
+            Paper.co_authors.through(paper_id=paper.id, attendee_id=author_id)
+            for paper, (_, _, co_author_ids) in zip(papers, valid)
+            for author_id in co_author_ids], ignore_conflicts=True)
+        paper_search.index_papers(papers)
+        duplicates.sign_papers(papers)
+    return len(papers)
+
+
+def import_papers(rows, batch_size=IMPORT_BATCH_SIZE):
+    """ Create a Paper for each (line number, row) with paper_type, title,
+        abstract, keywords, themes, primary_author and co_authors (author
+        emails) and optionally submitted_at and is_accepted. Authors must
+        already be registered.
+    """
+    num_created, errors = 0, []
+    for batch in _batches(rows, batch_size):
+        num_created += _import_paper_batch(batch, errors)
+    if num_created > 0:
+        _refresh_caches()
+    return ImportResult(num_created, 0, errors)
+
+
+IMPORTS = {
+    'attendees': import_attendees,
+    'papers': import_papers,
+}
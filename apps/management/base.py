@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class ReportCommand(BaseCommand):
+    """ Base for commands that write a report to --output ('-' for stdout)
+        and print how many rows they wrote and how long it took.
+
+        Subclasses implement write_report(fout, **options), returning the
+        number of rows written.
+    """
+    default_output = '-'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o', default=self.default_output,
+            help="file to write to, '-' for stdout (default: %(default)s)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='rows fetched per query (default: %(default)s)')
+
+    def write_report(self, fout, **options):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        start = time.time()
+        output = options['output']
+        if output == '-':
+            num_rows = self.write_report(self.stdout, **options)
+            # keep stdout clean for the report itself
+            summary_out = self.stderr
+        else:
+            with open(output, 'w') as fout:
+                num_rows = self.write_report(fout, **options)
+            summary_out = self.stdout
+        summary_out.write(self.style.SUCCESS(
+            '{:d} rows written to {:s} in {:.3f}s'.format(
+                num_rows, output, time.time() - start)))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from apps import review_assignment
+
+
+class Command(BaseCommand):
+    help = ('Assign papers to reviewers so that each paper gets the same '
+            'number of reviewers and reviewer loads stay balanced. Existing '
+            'assignments and reviews are kept, except assignments that have '
+            'become conflicts of interest and are not reviewed yet.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-k', '--reviews-per-paper', type=int,
+            default=review_assignment.REVIEWS_PER_PAPER,
+            help='reviewers per paper (default: %(default)s)')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='report the assignment without saving it')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            result = review_assignment.solve(options['reviews_per_paper'])
+        else:
+            result = review_assignment.assign_reviewers(
+                options['reviews_per_paper'])
+        if options['verbosity'] < 1:
+            return
+        loads = sorted(result.loads.values())
+        if loads:
+            self.stdout.write(
+                'reviewer load: min {:d}, max {:d}, capacity {:d}'.format(
+                    loads[0], loads[-1], result.capacity))
+        if result.dropped:
+            self.stdout.write(self.style.WARNING(
+                '{:d} conflicted assignments {:s}: {:s}'.format(
+                    len(result.dropped), 'would be dropped'
+                    if options['dry_run'] else 'dropped',
+                    ', '.join('reviewer {:d} / paper {:d}'.format(r, p)
+                              for r, p in sorted(result.dropped)))))
+        if result.shortfall:
+            self.stdout.write(self.style.WARNING(
+                '{:d} papers short of {:d} eligible reviewers: {:s}'.format(
+                    len(result.shortfall), options['reviews_per_paper'],
+                    ', '.join(str(p) for p in sorted(result.shortfall)))))
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} assignments {:s}'.format(
+                len(result.pairs), 'would be created (dry run, nothing saved)'
+                if options['dry_run'] else 'created')))
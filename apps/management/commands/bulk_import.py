@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps import imports
+
+
+class Command(BaseCommand):
+    help = ('Import attendees or papers from a CSV (with header) or JSONL '
+            'file, see apps/imports.py for the expected fields')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(imports.IMPORTS))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=sorted(set(imports.FORMATS.values())),
+            help='file format (default: from the file extension)')
+        parser.add_argument(
+            '--batch-size', type=int, default=imports.IMPORT_BATCH_SIZE,
+            help='rows validated and inserted per transaction '
+                 '(default: %(default)s)')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or imports.format_of(options['path'])
+        if fmt is None:
+            raise CommandError('unknown file format, use --format')
+        start = time.time()
+        with open(options['path'], 'rb') as fin:
+            result = imports.IMPORTS[options['kind']](
+                imports.read_rows(fin, fmt), batch_size=options['batch_size'])
+        for line_num, message in result.errors:
+            self.stderr.write('line {:d}: {:s}'.format(line_num, message))
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} {:s} created, {:d} already registered, {:d} rejected '
+            'in {:.3f}s'.format(
+                result.num_created, options['kind'], result.num_skipped,
+                len(result.errors), time.time() - start)))
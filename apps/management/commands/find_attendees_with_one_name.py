@@ -0,0 +1,19 @@
+from apps.management.base import ReportCommand
+from apps.models import Attendee
+from apps.streaming import iter_values_list
+
+
+class Command(ReportCommand):
+    help = 'List attendees whose name is a single word (id|email|name)'
+    default_output = 'scripts/attendees-with-one-name.tsv'
+
+    def write_report(self, fout, chunk_size, **options):
+        # one word, ignoring surrounding whitespace, matched in the database
+        attendees = Attendee.objects.filter(name__regex=r'^\s*\S+\s*$')
+        num_found = 0
+        fout.write("id|email|name\n")
+        for attendee_id, email, name in iter_values_list(
+                attendees, 'id', 'email', 'name', chunk_size=chunk_size):
+            fout.write("{:d}|{:s}|{:s}\n".format(attendee_id, email, name))
+            num_found += 1
+        return num_found
@@ -0,0 +1,65 @@
+from django.core.management.base import CommandError
+
+from apps import duplicates, imports
+from apps.management.base import ReportCommand
+from apps.models import Paper
+
+
+def _read_archive(path):
+    # a saved signature store, or a paper export with title and abstract
+    if path.endswith('.npz'):
+        return duplicates.SignatureStore.load(path)
+    fmt = imports.format_of(path)
+    if fmt is None:
+        raise CommandError('unsupported archive file: {:s}'.format(path))
+    with open(path, 'rb') as fin:
+        return duplicates.SignatureStore.from_rows(
+            row for _, row in imports.read_rows(fin, fmt)
+            if isinstance(row, dict))
+
+
+class Command(ReportCommand):
+    help = ('List pairs of submissions, and of submissions and archived '
+            'papers from previous summits, that look like duplicates '
+            '(paper_id|title|other|other_title|similarity)')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--archive', action='append', default=[],
+            help=('previous summit papers: a paper export (.csv / .jsonl) '
+                  'or a file written by --save-archive (.npz); repeatable'))
+        parser.add_argument(
+            '--threshold', type=float,
+            default=duplicates.DUPLICATE_THRESHOLD,
+            help='minimum estimated similarity (default: %(default)s)')
+        parser.add_argument(
+            '--save-archive',
+            help=("also save this summit's signatures (.npz) for comparing "
+                  'next year'))
+
+    def write_report(self, fout, archive, threshold, save_archive, chunk_size,
+                     **options):
+        store = duplicates.SignatureStore.from_papers()
+        archives = [_read_archive(path) for path in archive]
+        archived = duplicates.SignatureStore.from_signatures(
+            [label for a in archives for label in a.labels],
+            [signature for a in archives for signature in a.signatures])
+        titles = dict(Paper.objects.values_list('id', 'title').iterator(
+            chunk_size=chunk_size))
+        num_pairs = 0
+        fout.write("paper_id|title|other|other_title|similarity\n")
+        for pair in duplicates.find_duplicates(store, archived, threshold):
+            if isinstance(pair.second, int):
+                other, other_title = str(pair.second), titles[pair.second]
+            else:
+                other, other_title = 'archive', pair.second
+            fout.write("{:d}|{:s}|{:s}|{:s}|{:.2f}\n".format(
+                pair.first, titles[pair.first], other, other_title,
+                pair.similarity))
+            num_pairs += 1
+        if save_archive:
+            duplicates.SignatureStore(
+                [titles[paper_id] for paper_id in store.labels],
+                store.signatures).save(save_archive)
+        return num_pairs
@@ -0,0 +1,131 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps import event_phase, reference_data
+from apps.models import (
+    Organization,
+    TimeZone,
+    PaperType,
+    PaperTheme,
+    ReviewScore,
+    RejectionReason,
+    Event,
+    parse_utc_offset,
+)
+
+SUPPORTED_VERSIONS = {1}
+
+# file section -> (model, natural key field, other fields kept in sync)
+SECTIONS = [
+    ('organizations', Organization, 'org_name', []),
+    ('timezones', TimeZone, 'utc_offset', []),
+    ('paper_types', PaperType, 'paper_type_name', []),
+    ('paper_themes', PaperTheme, 'paper_theme', []),
+    ('review_scores', ReviewScore, 'review_decision', ['review_score']),
+    ('rejection_reasons', RejectionReason, 'reject_reason', []),
+    ('events', Event, 'event_seq', ['event_name']),
+]
+
+
+def _read(path):
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _new_object(model, values):
+    obj = model(**values)
+    # bulk_create bypasses save(), which fills these in
+    if model is TimeZone:
+        obj.utc_offset_minutes = parse_utc_offset(obj.utc_offset)
+    return obj
+
+
+def _sync(model, key_field, fields, entries):
+    """ Create / update rows of model to match entries, returns
+        (num created, num updated, num unchanged, keys not in entries).
+        A key listed twice in entries raises CommandError.
+    """
+    existing = {getattr(obj, key_field): obj
+                for obj in model.objects.select_for_update()}
+    to_create, to_update = [], []
+    seen = set()
+    for entry in entries:
+        values = entry if isinstance(entry, dict) else {key_field: entry}
+        key = values[key_field]
+        if key in seen:
+            raise CommandError('duplicate {:s} in reference data: {}'.format(
+                key_field, key))
+        seen.add(key)
+        obj = existing.get(key)
+        if obj is None:
+            to_create.append(_new_object(model, values))
+            continue
+        changed = [f for f in fields
+                   if f in values and getattr(obj, f) != values[f]]
+        for field in changed:
+            setattr(obj, field, values[field])
+        if changed:
+            to_update.append(obj)
+    if model is Event and to_create and not any(
+            obj.is_current for obj in existing.values()):
+        # a fresh install starts in the first (Signup) phase
+        min(to_create, key=lambda obj: obj.event_seq).is_current = True
+    model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update, fields)
+    num_unchanged = len(seen) - len(to_create) - len(to_update)
+    return (len(to_create), len(to_update), num_unchanged,
+            sorted(str(key) for key in existing if key not in seen))
+
+
+class Command(BaseCommand):
+    help = ('Create / update the reference tables from a versioned YAML or '
+            'JSON file. Safe to re-run, rows are never deleted.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?',
+            default=os.path.join(settings.BASE_DIR, 'reference_data.yaml'),
+            help='reference data file (default: %(default)s)')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='report what would change without saving it')
+
+    def handle(self, *args, **options):
+        data = _read(options['path'])
+        if data.get('version') not in SUPPORTED_VERSIONS:
+            raise CommandError('unsupported reference data version: {}'.format(
+                data.get('version')))
+        verbose = options['verbosity'] >= 1
+        num_changed = 0
+        with transaction.atomic():
+            for section, model, key_field, fields in SECTIONS:
+                created, updated, unchanged, missing = _sync(
+                    model, key_field, fields, data.get(section, []))
+                num_changed += created + updated
+                if not verbose:
+                    continue
+                self.stdout.write(
+                    '{:s}: {:d} created, {:d} updated, {:d} unchanged'.format(
+                        section, created, updated, unchanged))
+                if missing:
+                    self.stdout.write(self.style.WARNING(
+                        '  not in file (kept): {:s}'.format(', '.join(missing))))
+            if options['dry_run']:
+                transaction.set_rollback(True)
+        if not options['dry_run'] and num_changed > 0:
+            # bulk writes send no signals, drop this process' cached copies
+            reference_data.invalidate()
+            event_phase.invalidate_current_event()
+        if verbose:
+            self.stdout.write(self.style.SUCCESS(
+                '{:d} reference rows {:s}'.format(
+                    num_changed, 'would change (dry run, nothing saved)'
+                    if options['dry_run'] else 'changed')))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.paper_scores import rebuild_paper_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-paper review score summaries from all reviews'
+
+    def handle(self, *args, **options):
+        num_rows = rebuild_paper_scores()
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} paper score summary rows rebuilt'.format(num_rows)))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.paper_search import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Re-index the titles, abstracts and keywords of all papers'
+
+    def handle(self, *args, **options):
+        num_papers = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} papers indexed for search'.format(num_papers)))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.duplicates import rebuild_signatures
+
+
+class Command(BaseCommand):
+    help = 'Recompute the duplicate detection signatures of all papers'
+
+    def handle(self, *args, **options):
+        num_papers = rebuild_signatures()
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} paper signatures rebuilt'.format(num_papers)))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviewer_progress import rebuild_reviewer_progress
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-reviewer progress counters from all reviews'
+
+    def handle(self, *args, **options):
+        num_rows = rebuild_reviewer_progress()
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} reviewer progress rows rebuilt'.format(num_rows)))
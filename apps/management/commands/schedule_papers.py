@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from apps import schedule
+
+
+class Command(BaseCommand):
+    help = ('Schedule accepted papers with confirmed speakers into tracks and '
+            'slots (sets Paper.track and Paper.scheduled_at). Talks already '
+            'scheduled keep their slot unless moving them improves the '
+            'schedule enough.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='schedule from scratch, ignoring the saved schedule')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='report the schedule without saving it')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            result = schedule.solve(full=options['full'])
+        else:
+            result = schedule.schedule_papers(full=options['full'])
+        if options['verbosity'] < 1:
+            return
+        if options['verbosity'] > 1:
+            for paper_id, (track, scheduled_at) in sorted(
+                    result.placements.items(), key=lambda item: item[1]):
+                self.stdout.write('{:%Y-%m-%d %H:%M} track {:d}: paper {:d}'
+                                  .format(scheduled_at, track, paper_id))
+        if result.unscheduled:
+            self.stdout.write(self.style.WARNING(
+                '{:d} papers did not fit in the schedule: {:s}'.format(
+                    len(result.unscheduled),
+                    ', '.join(str(p) for p in result.unscheduled))))
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} papers scheduled, {:d} {:s} (cost {:.1f})'.format(
+                len(result.placements), len(result.moved),
+                'would move (dry run, nothing saved)'
+                if options['dry_run'] else 'moved', result.cost)))
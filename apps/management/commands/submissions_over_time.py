@@ -0,0 +1,63 @@
+import datetime
+
+from apps.management.base import ReportCommand
+from apps.models import Paper
+from apps.timeseries import (
+    CFP_OPEN_DATE,
+    CFP_CLOSE_DATE,
+    CFP_EXTN_DATE,
+    compute_series,
+)
+
+
+class Command(ReportCommand):
+    help = ('Daily and cumulative paper submissions relative to the CFP '
+            'dates, optionally plotted (needs matplotlib)')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--cfp-open', type=datetime.date.fromisoformat,
+                            default=CFP_OPEN_DATE)
+        parser.add_argument('--cfp-close', type=datetime.date.fromisoformat,
+                            default=CFP_CLOSE_DATE)
+        parser.add_argument('--cfp-extn', type=datetime.date.fromisoformat,
+                            default=CFP_EXTN_DATE)
+        parser.add_argument(
+            '--plot', metavar='PNG',
+            help='also plot cumulative submissions to this file, '
+                 'e.g. scripts/submissions_over_time.png')
+
+    def write_report(self, fout, cfp_open, cfp_close, cfp_extn, plot,
+                     **options):
+        # one row per day with submissions, counted in the database
+        days, counts, cumulative_counts = compute_series(
+            Paper.objects.all(), 'submitted_at', 'day')
+        elapsed_days = [(day.date() - cfp_open).days for day in days]
+        fout.write("date|days_after_cfp_open|submissions|total_submissions\n")
+        for day, elapsed, count, total in zip(
+                days, elapsed_days, counts, cumulative_counts):
+            fout.write("{:s}|{:d}|{:d}|{:d}\n".format(
+                day.date().isoformat(), elapsed, count, total))
+        if plot is not None:
+            self._plot(plot, elapsed_days, cumulative_counts,
+                       cfp_open, cfp_close, cfp_extn)
+        return len(elapsed_days)
+
+    def _plot(self, filename, elapsed_days, cumulative_counts,
+              cfp_open, cfp_close, cfp_extn):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        plt.step(elapsed_days, cumulative_counts, where="post")
+        plt.xlabel("number of days after CFP opened")
+        plt.ylabel("total number of submissions")
+        for day, color, label in [
+                (cfp_open, 'g', "CFP open"),
+                (cfp_close, 'r', "CFP close"),
+                (cfp_extn, 'orange', "CFP extn")]:
+            plt.axvline((day - cfp_open).days, color=color, linestyle='--',
+                        label=label)
+        plt.legend(loc="best")
+        plt.savefig(filename)
+        plt.close()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.related_papers import update_related_papers
+
+
+class Command(BaseCommand):
+    help = ('Recompute related papers for papers whose abstract, keywords '
+            'or themes changed since the last update')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true', dest='full',
+            help='recompute all papers, e.g. after changing the settings')
+
+    def handle(self, *args, **options):
+        result = update_related_papers(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            '{:d} paper vectors and {:d} related paper lists updated'.format(
+                result.num_vectors, result.num_lists)))
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def fill_reviewer_progress(apps, schema_editor):
+    # same counters as reviewer_progress.rebuild_reviewer_progress()
+    Attendee = apps.get_model('apps', 'Attendee')
+    Review = apps.get_model('apps', 'Review')
+    ReviewerProgress = apps.get_model('apps', 'ReviewerProgress')
+    counters = {
+        row.pop('reviewer'): row for row in (Review.objects
+            .values('reviewer')
+            .annotate(
+                num_reviewed=Count('id'),
+                num_abstained=Count(
+                    'id', filter=~Q(decision__review_score__gt=0)),
+                last_reviewed_at=Max('reviewed_at'))
+            .order_by())
+    }
+    reviewer_ids = set(counters) | set(Attendee.objects
+        .filter(is_reviewer=True)
+        .values_list('id', flat=True))
+    ReviewerProgress.objects.bulk_create([
+        ReviewerProgress(reviewer_id=reviewer_id,
+                         **counters.get(reviewer_id, {}))
+        for reviewer_id in reviewer_ids
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0024_event_event_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='reviewed_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ReviewerProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('num_reviewed', models.IntegerField(default=0)),
+                ('num_abstained', models.IntegerField(default=0)),
+                ('last_reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('reviewer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review_progress', to='apps.attendee')),
+            ],
+        ),
+        migrations.RunPython(fill_reviewer_progress, migrations.RunPython.noop),
+    ]
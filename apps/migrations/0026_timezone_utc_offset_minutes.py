@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+def fill_utc_offset_minutes(apps, schema_editor):
+    TimeZone = apps.get_model('apps', 'TimeZone')
+    for tz in TimeZone.objects.all():
+        offset = tz.utc_offset.strip().upper().replace("UTC", "")
+        sign = -1 if offset.startswith("-") else 1
+        hours, _, minutes = offset.lstrip("+-").partition(":")
+        tz.utc_offset_minutes = sign * (60 * int(hours or 0) + int(minutes or 0))
+        tz.save(update_fields=['utc_offset_minutes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0025_reviewerprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timezone',
+            name='utc_offset_minutes',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_utc_offset_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0026_timezone_utc_offset_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewAssignment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_assignments', to='apps.paper')),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_assignments', to='apps.attendee')),
+            ],
+            options={
+                'unique_together': {('reviewer', 'paper')},
+            },
+        ),
+    ]
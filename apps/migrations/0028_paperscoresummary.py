@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_paper_score_summaries(apps, schema_editor):
+    # same counters as paper_scores.rebuild_paper_scores()
+    Paper = apps.get_model('apps', 'Paper')
+    PaperScoreSummary = apps.get_model('apps', 'PaperScoreSummary')
+    Review = apps.get_model('apps', 'Review')
+    score = 'decision__review_score'
+    is_scored = Q(**{score + '__gt': 0})
+    counters = {
+        row.pop('paper'): row for row in (Review.objects
+            .values('paper')
+            .annotate(
+                num_reviews=Count('id'),
+                num_abstained=Count('id', filter=~is_scored),
+                score_sum=Coalesce(
+                    Sum(score, filter=is_scored),
+                    Value(0), output_field=IntegerField()),
+                score_sum_squares=Coalesce(
+                    Sum(F(score) * F(score), filter=is_scored),
+                    Value(0), output_field=IntegerField()),
+                min_score=Min(score, filter=is_scored),
+                max_score=Max(score, filter=is_scored))
+            .order_by())
+    }
+    PaperScoreSummary.objects.bulk_create([
+        PaperScoreSummary(paper_id=paper_id, **counters.get(paper_id, {}))
+        for paper_id in Paper.objects.values_list('id', flat=True)
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0027_reviewassignment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperScoreSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('num_reviews', models.IntegerField(default=0)),
+                ('num_abstained', models.IntegerField(default=0)),
+                ('score_sum', models.IntegerField(default=0)),
+                ('score_sum_squares', models.IntegerField(default=0)),
+                ('min_score', models.IntegerField(blank=True, null=True)),
+                ('max_score', models.IntegerField(blank=True, null=True)),
+                ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score_summary', to='apps.paper')),
+            ],
+        ),
+        migrations.RunPython(
+            fill_paper_score_summaries, migrations.RunPython.noop),
+    ]
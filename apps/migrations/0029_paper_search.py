@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.db import migrations
+
+# Full-text index of paper titles, abstracts and keywords, see
+# apps/paper_search.py. The table is backend specific, so it is created
+# with raw SQL; other backends get no table and search without an index.
+# Documents are built with the same text search configuration as the
+# search code uses (PAPER_SEARCH_CONFIG); after changing that setting, run
+# rebuild_paper_search.
+PAPER_SEARCH_CONFIG = getattr(settings, 'PAPER_SEARCH_CONFIG', 'english')
+
+POSTGRESQL_CREATE = [
+    """
+    CREATE TABLE apps_paper_search (
+        paper_id integer PRIMARY KEY,
+        document tsvector NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX apps_paper_search_document
+        ON apps_paper_search USING GIN (document)
+    """,
+    """
+    INSERT INTO apps_paper_search (paper_id, document)
+    SELECT id,
+           setweight(to_tsvector(%(config)s::regconfig, title), 'A') ||
+           setweight(to_tsvector(%(config)s::regconfig, keywords), 'B') ||
+           setweight(to_tsvector(%(config)s::regconfig, abstract), 'C')
+      FROM apps_paper
+    """,
+]
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE apps_paper_search
+        USING fts5(title, abstract, keywords, tokenize = 'porter unicode61')
+    """,
+    """
+    INSERT INTO apps_paper_search (rowid, title, abstract, keywords)
+    SELECT id, title, abstract, keywords FROM apps_paper
+    """,
+]
+
+CREATE = {
+    'postgresql': POSTGRESQL_CREATE,
+    'sqlite': SQLITE_CREATE,
+}
+
+PARAMS = {
+    'postgresql': {'config': PAPER_SEARCH_CONFIG},
+}
+
+
+def create_search_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in CREATE.get(vendor, []):
+        schema_editor.execute(sql, PARAMS.get(vendor))
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE:
+        schema_editor.execute('DROP TABLE apps_paper_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0028_paperscoresummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
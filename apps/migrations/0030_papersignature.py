@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_paper_signatures(apps, schema_editor):
+    # signatures must match the ones computed for new papers, so they come
+    # from apps.duplicates rather than a copy of it
+    from apps.duplicates import minhash, paper_text
+
+    Paper = apps.get_model('apps', 'Paper')
+    PaperSignature = apps.get_model('apps', 'PaperSignature')
+    PaperSignature.objects.bulk_create([
+        PaperSignature(
+            paper_id=paper_id,
+            signature=minhash(paper_text(title, abstract))
+                .astype('<u4').tobytes())
+        for paper_id, title, abstract in (Paper.objects
+            .values_list('id', 'title', 'abstract').iterator())
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0029_paper_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperSignature',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField()),
+                ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='apps.paper')),
+            ],
+        ),
+        migrations.RunPython(fill_paper_signatures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0030_papersignature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperTermVector',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=40)),
+                ('terms', models.BinaryField()),
+                ('counts', models.BinaryField()),
+                ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='term_vector', to='apps.paper')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RelatedPaper',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.IntegerField()),
+                ('score', models.FloatField()),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_papers', to='apps.paper')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='apps.paper')),
+            ],
+            options={
+                'unique_together': {('paper', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0031_related_papers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paper',
+            name='track',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:18
+
+import hashlib
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_signature_bands(apps, schema_editor):
+    # same buckets as apps.duplicates.band_buckets()
+    PaperSignature = apps.get_model('apps', 'PaperSignature')
+    PaperSignatureBand = apps.get_model('apps', 'PaperSignatureBand')
+    num_perm = getattr(settings, 'DUPLICATE_NUM_PERM', 128)
+    num_bands = getattr(settings, 'DUPLICATE_LSH_BANDS', 32)
+    size = 4 * num_perm // num_bands
+    bands = []
+    for paper_id, signature in (PaperSignature.objects
+            .values_list('paper_id', 'signature').iterator()):
+        signature = bytes(signature)
+        for band in range(num_bands):
+            bucket = int.from_bytes(
+                hashlib.blake2b(
+                    band.to_bytes(2, 'little') +
+                    signature[band * size:(band + 1) * size],
+                    digest_size=8).digest(),
+                'little', signed=True)
+            bands.append(PaperSignatureBand(paper_id=paper_id, bucket=bucket))
+    PaperSignatureBand.objects.bulk_create(bands, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0032_paper_track'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperSignatureBand',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='apps.paper')),
+            ],
+        ),
+        migrations.RunPython(fill_signature_bands, migrations.RunPython.noop),
+    ]
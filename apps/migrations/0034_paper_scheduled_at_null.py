@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0033_papersignatureband'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paper',
+            name='scheduled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:30
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_text_hashes(apps, schema_editor):
+    # same hash as apps.duplicates.text_hash()
+    PaperSignature = apps.get_model('apps', 'PaperSignature')
+    signatures = list(PaperSignature.objects.select_related('paper'))
+    for signature in signatures:
+        text = '{:s}\n{:s}'.format(signature.paper.title,
+                                   signature.paper.abstract)
+        signature.text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    PaperSignature.objects.bulk_update(
+        signatures, ['text_hash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0034_paper_scheduled_at_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='papersignature',
+            name='text_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.RunPython(fill_text_hashes, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+import math
 import os
 
 from django.db import models
@@ -16,8 +17,24 @@ class Organization(models.Model):
         return self.org_name
 
 
+def parse_utc_offset(utc_offset):
+    """ Convert a "UTC+n" / "UTC-n:30" string into minutes east of UTC. """
+    offset = utc_offset.strip().upper().replace("UTC", "")
+    if offset == '':
+        return 0
+    sign = -1 if offset.startswith("-") else 1
+    hours, _, minutes = offset.lstrip("+-").partition(":")
+    return sign * (60 * int(hours or 0) + int(minutes or 0))
+
+
 class TimeZone(models.Model):
     utc_offset = models.CharField(max_length=16, blank=True)
+    # sort key derived from utc_offset on save
+    utc_offset_minutes = models.IntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.utc_offset_minutes = parse_utc_offset(self.utc_offset)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.utc_offset
@@ -29,6 +46,13 @@ def _content_file_name(instance, filename):
     return os.path.join('avatars', filename)
 
 
+class AttendeeQuerySet(models.QuerySet):
+
+    def with_display_relations(self):
+        # everything __str__ and the attendee list need
+        return self.select_related('user', 'org', 'timezone')
+
+
 class Attendee(models.Model):
     # gets filled on initial signup
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -52,6 +76,8 @@ class Attendee(models.Model):
     is_speaker = models.BooleanField(default=False)
     is_organizer = models.BooleanField(default=False)
 
+    objects = AttendeeQuerySet.as_manager()
+
     def __str__(self):
         if self.name == '':
             return '{:s} (signup pending)'.format(self.user.username)
@@ -66,7 +92,10 @@ def create_user_attendee(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_attendee(sender, instance, **kwargs):
+def save_user_attendee(sender, instance, update_fields=None, **kwargs):
+    # partial saves (e.g. last_login on sign in) leave the attendee as is
+    if update_fields is not None:
+        return
     instance.attendee.save()
 
 
@@ -84,6 +113,20 @@ class PaperTheme(models.Model):
         return self.paper_theme
 
 
+class PaperQuerySet(models.QuerySet):
+
+    def with_display_relations(self):
+        # everything __str__ and the paper lists / dashboard need
+        return (self
+            .select_related('paper_type', 'primary_author__user',
+                            'primary_author__org')
+            .prefetch_related(
+                'themes',
+                models.Prefetch(
+                    'co_authors',
+                    queryset=Attendee.objects.select_related('user', 'org'))))
+
+
 class Paper(models.Model):
     # entered by author during submission
     paper_type = models.ForeignKey(
@@ -103,12 +146,17 @@ class Paper(models.Model):
     extra_long_paper = models.BooleanField(default=False)
     publish_abstract_in_ssrn = models.BooleanField(default=False)
     publish_full_paper_in_ssrn = models.BooleanField(default=False)
-    # updated by admin for conference schedule
-    scheduled_at = models.DateTimeField(default=datetime.now, blank=True)
+    # conference schedule, set by admin or by the schedule_papers command
+    # (apps/schedule.py), which also sets the 1-based track; None while
+    # the paper is not scheduled
+    scheduled_at = models.DateTimeField(null=True, blank=True)
+    track = models.IntegerField(null=True, blank=True)
     # updated by speaker after conference
     pres_slides = models.FileField(upload_to='slides', blank=True)
     pres_videos = models.FileField(upload_to='videos', blank=True)
 
+    objects = PaperQuerySet.as_manager()
+
     def __str__(self):
         return '{:s} ({:s} et al)'.format(
             self.title, self.primary_author.name.split()[-1])
@@ -129,6 +177,20 @@ class RejectionReason(models.Model):
         return self.reject_reason
 
 
+def scored_reviews(prefix=''):
+    """ Q for reviews with a score above 0. Every other review, Abstain or
+        no decision yet, counts as an abstain. prefix is the lookup path to
+        the review, e.g. 'paper__' from Paper.
+    """
+    return models.Q(**{prefix + 'decision__review_score__gt': 0})
+
+
+class ReviewQuerySet(models.QuerySet):
+
+    def with_display_relations(self):
+        return self.select_related('reviewer', 'paper', 'decision')
+
+
 class Review(models.Model):
     # create / update review
     reviewer = models.ForeignKey(
@@ -141,6 +203,131 @@ class Review(models.Model):
         'apps.RejectionReason', related_name='reason_if_rejected',
         null=True, on_delete=models.CASCADE)
     comments = models.TextField(blank=True)
+    reviewed_at = models.DateTimeField(auto_now=True, null=True)
+
+    objects = ReviewQuerySet.as_manager()
+
+    def __str__(self):
+        return "{:s} / {:s}".format(self.reviewer.name, self.paper.title)
+
+
+class ReviewerProgress(models.Model):
+    # maintained from Review save / delete (see apps/reviewer_progress.py)
+    reviewer = models.OneToOneField(
+        'apps.Attendee', related_name='review_progress',
+        on_delete=models.CASCADE)
+    num_reviewed = models.IntegerField(default=0)
+    num_abstained = models.IntegerField(default=0)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return "{:s} ({:d} reviewed)".format(
+            self.reviewer.name, self.num_reviewed)
+
+
+class PaperScoreSummary(models.Model):
+    # maintained from Review save / delete (see apps/paper_scores.py);
+    # sums, min and max are over scored (non-abstain) reviews only
+    paper = models.OneToOneField(
+        'apps.Paper', related_name='score_summary',
+        on_delete=models.CASCADE)
+    num_reviews = models.IntegerField(default=0)
+    num_abstained = models.IntegerField(default=0)
+    score_sum = models.IntegerField(default=0)
+    score_sum_squares = models.IntegerField(default=0)
+    min_score = models.IntegerField(null=True, blank=True)
+    max_score = models.IntegerField(null=True, blank=True)
+
+    @property
+    def num_scored(self):
+        return self.num_reviews - self.num_abstained
+
+    @property
+    def mean_score(self):
+        if self.num_scored == 0:
+            return None
+        return self.score_sum / self.num_scored
+
+    @property
+    def score_stddev(self):
+        if self.num_scored == 0:
+            return None
+        variance = (self.score_sum_squares / self.num_scored
+                    - self.mean_score ** 2)
+        return math.sqrt(max(variance, 0))
+
+    def __str__(self):
+        return "{:s} ({:d} reviews)".format(
+            self.paper.title, self.num_reviews)
+
+
+class PaperSignature(models.Model):
+    # MinHash of title + abstract, maintained from Paper save (see
+    # apps/duplicates.py); DUPLICATE_NUM_PERM little-endian uint32 values
+    paper = models.OneToOneField(
+        'apps.Paper', related_name='signature', on_delete=models.CASCADE)
+    text_hash = models.CharField(max_length=40, blank=True)
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return self.paper.title
+
+
+class PaperSignatureBand(models.Model):
+    # hashed LSH band of a PaperSignature, one row per band (see
+    # apps/duplicates.py); papers sharing a bucket are compared
+    paper = models.ForeignKey(
+        'apps.Paper', related_name='signature_bands', on_delete=models.CASCADE)
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return self.paper.title
+
+
+class PaperTermVector(models.Model):
+    # term counts of abstract + keywords, refreshed by the
+    # update_related_papers command (see apps/related_papers.py)
+    paper = models.OneToOneField(
+        'apps.Paper', related_name='term_vector', on_delete=models.CASCADE)
+    # sha1 of the abstract, keywords and themes the counts were taken from
+    text_hash = models.CharField(max_length=40)
+    # crc32 of each distinct term, little-endian uint32
+    terms = models.BinaryField()
+    # occurrences of each term, little-endian uint16
+    counts = models.BinaryField()
+
+    def __str__(self):
+        return self.paper.title
+
+
+class RelatedPaper(models.Model):
+    # top-k most similar papers (see apps/related_papers.py)
+    paper = models.ForeignKey(
+        'apps.Paper', related_name='related_papers', on_delete=models.CASCADE)
+    related = models.ForeignKey(
+        'apps.Paper', related_name='+', on_delete=models.CASCADE)
+    rank = models.IntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = [('paper', 'rank')]
+
+    def __str__(self):
+        return "{:s} -> {:s}".format(self.paper.title, self.related.title)
+
+
+class ReviewAssignment(models.Model):
+    # filled by the assign_reviewers command (see apps/review_assignment.py)
+    reviewer = models.ForeignKey(
+        'apps.Attendee', related_name='review_assignments',
+        on_delete=models.CASCADE)
+    paper = models.ForeignKey(
+        'apps.Paper', related_name='review_assignments',
+        on_delete=models.CASCADE)
+    assigned_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('reviewer', 'paper')]
 
     def __str__(self):
         return "{:s} / {:s}".format(self.reviewer.name, self.paper.title)
@@ -0,0 +1,136 @@
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+# List totals are shown on every page view but only need to be roughly
+# current, so they are cached for a short while. Large unfiltered tables
+# on PostgreSQL use the planner's row estimate instead of COUNT(*).
+COUNT_CACHE_TIMEOUT = getattr(settings, 'COUNT_CACHE_TIMEOUT', 60)
+ESTIMATED_COUNT_THRESHOLD = getattr(settings, 'ESTIMATED_COUNT_THRESHOLD', 50000)
+
+
+def _estimated_table_count(model):
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < ESTIMATED_COUNT_THRESHOLD:
+        return None
+    return row[0]
+
+
+def cached_count(queryset, cache_key):
+    """ Row count of queryset, cached for COUNT_CACHE_TIMEOUT seconds.
+
+        If the queryset is a whole (large) table on PostgreSQL, the
+        pg_class.reltuples estimate is used instead of counting.
+    """
+    count = cache.get(cache_key)
+    if count is None:
+        if not queryset.query.where:
+            count = _estimated_table_count(queryset.model)
+        if count is None:
+            count = queryset.count()
+        cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class SeekPage(object):
+    """ One page of a list, navigated by key cursors (?after= / ?before=,
+        ?last= for the final page) so that any page costs an index range
+        scan, however deep it is. Keyed pages have no page number, since
+        reaching page N by number would need an OFFSET scan.
+
+        Pages without a key (see paginate_list) are navigated by number
+        and carry a windowed list of page links, None marking a gap.
+    """
+
+    def __init__(self, object_list, key, has_previous, has_next,
+                 number=None, page_links=()):
+        self.object_list = object_list
+        self.key = key
+        self.has_previous = has_previous
+        self.has_next = has_next
+        self.number = number
+        self.page_links = page_links
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_previous or self.has_next
+
+    def previous_query(self):
+        if self.key is None:
+            return 'page={}'.format(self.number - 1)
+        return 'before={}'.format(getattr(self.object_list[0], self.key))
+
+    def next_query(self):
+        if self.key is None:
+            return 'page={}'.format(self.number + 1)
+        return 'after={}'.format(getattr(self.object_list[-1], self.key))
+
+
+def _int_param(request, name):
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _page_links(number, num_pages, window):
+    pages = sorted({1, num_pages} |
+                   set(range(max(1, number - window),
+                             min(num_pages, number + window) + 1)))
+    links, last = [], 0
+    for page in pages:
+        if page > last + 1:
+            links.append(None)
+        links.append(page)
+        last = page
+    return links
+
+
+def paginate(request, queryset, key, per_page=10):
+    """ Page of queryset (ordered by the unique integer field key) selected
+        by the request's after / before cursor, or the last page if ?last=
+        is given. Without a cursor, or with one that runs off either end
+        of the list, the first page is returned.
+    """
+    after = _int_param(request, 'after')
+    before = _int_param(request, 'before')
+    if after is not None:
+        rows = list(queryset
+            .filter(**{key + '__gt': after})
+            .order_by(key)[:per_page + 1])
+        if rows:
+            return SeekPage(rows[:per_page], key, True, len(rows) > per_page)
+    elif before is not None or 'last' in request.GET:
+        if before is not None:
+            queryset = queryset.filter(**{key + '__lt': before})
+        rows = list(queryset.order_by('-' + key)[:per_page + 1])
+        if rows:
+            return SeekPage(rows[:per_page][::-1], key,
+                            len(rows) > per_page, before is not None)
+    rows = list(queryset.order_by(key)[:per_page + 1])
+    return SeekPage(rows[:per_page], key, False, len(rows) > per_page)
+
+
+def paginate_list(request, items, per_page=10, window=2):
+    """ Page of an in-memory list (e.g. ranked search results) selected by
+        the request's page number.
+    """
+    num_pages = max(1, math.ceil(len(items) / per_page))
+    number = min(max(_int_param(request, 'page') or 1, 1), num_pages)
+    start = (number - 1) * per_page
+    return SeekPage(items[start:start + per_page], None, number > 1,
+                    start + per_page < len(items), number=number,
+                    page_links=_page_links(number, num_pages, window))
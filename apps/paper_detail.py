@@ -0,0 +1,101 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from .models import Attendee, Paper
+
+# Once acceptances go out, accepted paper pages are public and linked from
+# the conference site, so their rendered body is cached per paper. Each
+# paper has a version in the cache, replaced whenever the paper, its themes
+# or any of its authors change; bodies are stored under the version that
+# was current before rendering, so a stale body is never read back.
+PAPER_DETAIL_CACHE_TIMEOUT = getattr(
+    settings, 'PAPER_DETAIL_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def _version_key(paper_id):
+    return 'paper_detail:version:{}'.format(paper_id)
+
+
+def _body_key(paper_id, version):
+    return 'paper_detail:body:{}:{}'.format(paper_id, version)
+
+
+def _version(paper_id):
+    key = _version_key(paper_id)
+    version = cache.get(key)
+    if version is None:
+        # a fresh version (not 1) in case the old one was evicted
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_paper(paper_id):
+    cache.set(_version_key(paper_id), time.time_ns(), None)
+
+
+def invalidate_papers(paper_ids):
+    """ invalidate_paper() for many papers, e.g. after a bulk_update. """
+    version = time.time_ns()
+    cache.set_many({_version_key(paper_id): version
+                    for paper_id in paper_ids}, None)
+
+
+def get_cached_body(paper_id):
+    """ (version, rendered body) of an accepted paper, body is None on a
+        miss. Pass the version back to cache_body() after rendering.
+    """
+    version = _version(paper_id)
+    return version, cache.get(_body_key(paper_id, version))
+
+
+def cache_body(paper_id, version, body):
+    cache.set(_body_key(paper_id, version), body, PAPER_DETAIL_CACHE_TIMEOUT)
+
+
+def render_body(paper):
+    """ Paper details table, paper loaded with_display_relations(). """
+    return render_to_string('apps/paper_body.html', {'paper': paper})
+
+
+@receiver(post_save, sender=Paper)
+@receiver(post_delete, sender=Paper)
+def invalidate_on_paper_change(sender, instance, **kwargs):
+    invalidate_paper(instance.id)
+
+
+@receiver(m2m_changed, sender=Paper.themes.through)
+@receiver(m2m_changed, sender=Paper.co_authors.through)
+def invalidate_on_paper_links_change(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        paper_ids = [instance.id]
+    elif pk_set is not None:
+        paper_ids = pk_set
+    else:
+        paper_ids = instance.paper_set.values_list('id', flat=True)
+    for paper_id in paper_ids:
+        invalidate_paper(paper_id)
+
+
+@receiver(post_save, sender=Attendee)
+def invalidate_on_author_change(sender, instance, created,
+                                update_fields=None, **kwargs):
+    # authors are shown as name (org)
+    if created or update_fields is not None and not (
+            {'name', 'org'} & set(update_fields)):
+        return
+    paper_ids = (Paper.objects
+        .filter(Q(primary_author=instance) | Q(co_authors=instance))
+        .values_list('id', flat=True)
+        .distinct())
+    for paper_id in paper_ids:
+        invalidate_paper(paper_id)
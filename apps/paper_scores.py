@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.db.models import (
+    Count, F, IntegerField, Max, Min, Q, Sum, Value)
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import reference_data
+from .models import (
+    Paper, PaperScoreSummary, Review, ReviewScore, scored_reviews)
+
+# Each Review save / delete adjusts its paper's summary row with a single
+# UPDATE of counter deltas, so ranking and organizer views never rescan the
+# reviews. Abstains are defined by models.scored_reviews(). Min / max cannot
+# be decremented, they are re-read from the paper's reviews when a review
+# holding one of them goes away. Reviews remember the (paper, decision)
+# they were loaded with, so an edit moves the old score out and the new
+# one in.
+
+_UNKNOWN = object()
+
+_SCORE = 'decision__review_score'
+_IS_SCORED = scored_reviews()
+
+
+def _summary_counters():
+    return dict(
+        num_reviews=Count('id'),
+        num_abstained=Count('id', filter=~_IS_SCORED),
+        score_sum=Coalesce(
+            Sum(_SCORE, filter=_IS_SCORED),
+            Value(0), output_field=IntegerField()),
+        score_sum_squares=Coalesce(
+            Sum(F(_SCORE) * F(_SCORE), filter=_IS_SCORED),
+            Value(0), output_field=IntegerField()),
+        min_score=Min(_SCORE, filter=_IS_SCORED),
+        max_score=Max(_SCORE, filter=_IS_SCORED))
+
+
+def _score(decision_id):
+    decision = reference_data.get(ReviewScore, decision_id)
+    return 0 if decision is None else decision.review_score
+
+
+def refresh_paper_scores(paper_id):
+    """ Recompute the summary row for a single paper from its reviews. """
+    counters = (Review.objects
+        .filter(paper_id=paper_id)
+        .aggregate(**_summary_counters()))
+    PaperScoreSummary.objects.update_or_create(
+        paper_id=paper_id, defaults=counters)
+
+
+def rebuild_paper_scores():
+    """ Recompute summary rows for all papers with one grouped query.
+
+        Returns the number of rows written.
+    """
+    counters = {
+        row['paper']: row for row in (Review.objects
+            .values('paper')
+            .annotate(**_summary_counters())
+            .order_by())
+    }
+    rows = []
+    for paper_id in Paper.objects.values_list('id', flat=True).iterator():
+        row = counters.get(paper_id, {})
+        rows.append(PaperScoreSummary(
+            paper_id=paper_id,
+            num_reviews=row.get('num_reviews', 0),
+            num_abstained=row.get('num_abstained', 0),
+            score_sum=row.get('score_sum', 0),
+            score_sum_squares=row.get('score_sum_squares', 0),
+            min_score=row.get('min_score'),
+            max_score=row.get('max_score')))
+    with transaction.atomic():
+        PaperScoreSummary.objects.all().delete()
+        PaperScoreSummary.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def _deltas(score, sign):
+    deltas = {'num_reviews': F('num_reviews') + sign}
+    if score > 0:
+        deltas['score_sum'] = F('score_sum') + sign * score
+        deltas['score_sum_squares'] = (F('score_sum_squares') +
+                                       sign * score * score)
+    else:
+        deltas['num_abstained'] = F('num_abstained') + sign
+    return deltas
+
+
+def add_score(paper_id, score):
+    deltas = _deltas(score, 1)
+    if score > 0:
+        value = Value(score, output_field=IntegerField())
+        deltas['min_score'] = Least(Coalesce('min_score', value), value)
+        deltas['max_score'] = Greatest(Coalesce('max_score', value), value)
+    summary = PaperScoreSummary.objects.filter(paper_id=paper_id)
+    if summary.update(**deltas) == 0:
+        # first review, or the table has not been built yet
+        refresh_paper_scores(paper_id)
+
+
+def remove_score(paper_id, score):
+    # no row means the paper itself is being deleted (or the table was
+    # never built), neither needs one
+    summary = PaperScoreSummary.objects.filter(paper_id=paper_id)
+    if summary.update(**_deltas(score, -1)) == 0:
+        return
+    if score > 0 and summary.filter(
+            Q(min_score=score) | Q(max_score=score)).exists():
+        summary.update(**(Review.objects
+            .filter(_IS_SCORED, paper_id=paper_id)
+            .aggregate(min_score=Min(_SCORE), max_score=Max(_SCORE))))
+
+
+@receiver(post_init, sender=Review)
+def remember_scored_values(sender, instance, **kwargs):
+    # read __dict__, not the attributes, so deferred fields stay deferred
+    values = instance.__dict__
+    instance._scored_as = (values.get('paper_id', _UNKNOWN),
+                           values.get('decision_id', _UNKNOWN))
+
+
+@receiver(post_save, sender=Review)
+def update_paper_scores_on_save(sender, instance, created, **kwargs):
+    scored_as = (instance.paper_id, instance.decision_id)
+    old_paper_id, old_decision_id = getattr(
+        instance, '_scored_as', (_UNKNOWN, _UNKNOWN))
+    if created:
+        add_score(instance.paper_id, _score(instance.decision_id))
+    elif _UNKNOWN in (old_paper_id, old_decision_id):
+        refresh_paper_scores(instance.paper_id)
+        if old_paper_id not in (_UNKNOWN, instance.paper_id):
+            refresh_paper_scores(old_paper_id)
+    elif (old_paper_id, old_decision_id) != scored_as:
+        remove_score(old_paper_id, _score(old_decision_id))
+        add_score(instance.paper_id, _score(instance.decision_id))
+    instance._scored_as = scored_as
+
+
+@receiver(post_delete, sender=Review)
+def update_paper_scores_on_delete(sender, instance, **kwargs):
+    paper_id, decision_id = getattr(
+        instance, '_scored_as', (_UNKNOWN, _UNKNOWN))
+    if paper_id is _UNKNOWN:
+        paper_id = instance.paper_id
+    if decision_id is _UNKNOWN:
+        decision_id = instance.decision_id
+    remove_score(paper_id, _score(decision_id))
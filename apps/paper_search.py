@@ -0,0 +1,264 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Paper
+
+# Paper titles, abstracts and keywords are indexed in the apps_paper_search
+# table (created by migration 0029): a tsvector column with a GIN index on
+# PostgreSQL, an FTS5 virtual table on SQLite. Paper saves and deletes
+# update it; bulk writes call index_papers() themselves. Searches return
+# paper ids ranked by relevance (title, then keywords, then abstract),
+# at most PAPER_SEARCH_MAX_RESULTS of them, optionally only those an
+# attendee may see (accepted, or their own). Ranking costs time for every
+# match, so queries matching more than PAPER_SEARCH_RANK_CANDIDATES papers
+# (words found in nearly every abstract) rank only the newest that many.
+PAPER_SEARCH_MAX_RESULTS = getattr(settings, 'PAPER_SEARCH_MAX_RESULTS', 1000)
+PAPER_SEARCH_RANK_CANDIDATES = getattr(
+    settings, 'PAPER_SEARCH_RANK_CANDIDATES', 10000)
+PAPER_SEARCH_CONFIG = getattr(settings, 'PAPER_SEARCH_CONFIG', 'english')
+
+SEARCH_FIELDS = ('title', 'abstract', 'keywords')
+
+
+def search_terms(query):
+    """ Lowercased words of a search box query; all of them must match. """
+    return re.findall(r'\w+', query.lower())
+
+
+def _visible_sql(paper_id_column, attendee_id):
+    # (condition, params) keeping the papers attendee_id is allowed to see,
+    # the same rule as views._can_view_paper(); none for attendee_id None
+    if attendee_id is None:
+        return '', []
+    return (
+        """
+        AND EXISTS (
+            SELECT 1 FROM apps_paper p
+             WHERE p.id = {0} AND (
+                   p.is_accepted OR p.primary_author_id = %s OR EXISTS (
+                       SELECT 1 FROM apps_paper_co_authors c
+                        WHERE c.paper_id = p.id AND c.attendee_id = %s)))
+        """.format(paper_id_column),
+        [attendee_id, attendee_id])
+
+
+class SearchBackend(object):
+    """ Interface of the full-text index, one implementation per database
+        vendor. Papers are passed as (id, title, abstract, keywords).
+    """
+
+    def index(self, cursor, papers):
+        raise NotImplementedError
+
+    def remove(self, cursor, paper_ids):
+        raise NotImplementedError
+
+    def clear(self, cursor):
+        raise NotImplementedError
+
+    def search(self, cursor, terms, limit, visible_to=None):
+        """ Ids of the papers matching all terms, best match first. If
+            visible_to (an attendee id) is given, only the papers that
+            attendee can see are returned.
+        """
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+
+    def index(self, cursor, papers):
+        cursor.executemany(
+            """
+            INSERT INTO apps_paper_search (paper_id, document)
+            VALUES (%s,
+                setweight(to_tsvector(%s::regconfig, %s), 'A') ||
+                setweight(to_tsvector(%s::regconfig, %s), 'B') ||
+                setweight(to_tsvector(%s::regconfig, %s), 'C'))
+            ON CONFLICT (paper_id) DO UPDATE SET document = EXCLUDED.document
+            """,
+            [(paper_id,
+              PAPER_SEARCH_CONFIG, title,
+              PAPER_SEARCH_CONFIG, keywords,
+              PAPER_SEARCH_CONFIG, abstract)
+             for paper_id, title, abstract, keywords in papers])
+
+    def remove(self, cursor, paper_ids):
+        cursor.execute(
+            "DELETE FROM apps_paper_search WHERE paper_id = ANY(%s)",
+            [list(paper_ids)])
+
+    def clear(self, cursor):
+        cursor.execute("TRUNCATE apps_paper_search")
+
+    def search(self, cursor, terms, limit, visible_to=None):
+        visible, visible_params = _visible_sql(
+            'apps_paper_search.paper_id', visible_to)
+        cursor.execute(
+            """
+            WITH query AS (
+                SELECT plainto_tsquery(%s::regconfig, %s) AS query
+            ), candidates AS (
+                SELECT paper_id, document
+                  FROM apps_paper_search, query
+                 WHERE document @@ query {:s}
+                 ORDER BY paper_id DESC
+                 LIMIT %s
+            )
+            SELECT paper_id
+              FROM candidates, query
+             ORDER BY ts_rank(document, query) DESC, paper_id
+             LIMIT %s
+            """.format(visible),
+            [PAPER_SEARCH_CONFIG, ' '.join(terms), *visible_params,
+             PAPER_SEARCH_RANK_CANDIDATES, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class SqliteSearchBackend(SearchBackend):
+
+    # bm25() weights of the title, abstract and keywords columns
+    WEIGHTS = (10.0, 1.0, 5.0)
+
+    def index(self, cursor, papers):
+        papers = list(papers)
+        self.remove(cursor, [paper[0] for paper in papers])
+        cursor.executemany(
+            """
+            INSERT INTO apps_paper_search (rowid, title, abstract, keywords)
+            VALUES (%s, %s, %s, %s)
+            """, papers)
+
+    def remove(self, cursor, paper_ids):
+        cursor.executemany(
+            "DELETE FROM apps_paper_search WHERE rowid = %s",
+            [(paper_id,) for paper_id in paper_ids])
+
+    def clear(self, cursor):
+        cursor.execute("DELETE FROM apps_paper_search")
+
+    def search(self, cursor, terms, limit, visible_to=None):
+        # quoted, so that words like AND / NOT are not FTS5 operators
+        match = ' '.join('"{:s}"'.format(term) for term in terms)
+        visible, visible_params = _visible_sql(
+            'apps_paper_search.rowid', visible_to)
+        # lowest paper id among the newest candidates, 0 if fewer match
+        cursor.execute(
+            """
+            SELECT rowid
+              FROM apps_paper_search
+             WHERE apps_paper_search MATCH %s {:s}
+             ORDER BY rowid DESC
+             LIMIT 1 OFFSET %s
+            """.format(visible),
+            [match, *visible_params, PAPER_SEARCH_RANK_CANDIDATES - 1])
+        row = cursor.fetchone()
+        cursor.execute(
+            """
+            SELECT rowid
+              FROM apps_paper_search
+             WHERE apps_paper_search MATCH %s AND rowid >= %s {:s}
+             ORDER BY bm25(apps_paper_search, %s, %s, %s), rowid
+             LIMIT %s
+            """.format(visible),
+            [match, 0 if row is None else row[0], *visible_params,
+             *self.WEIGHTS, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class UnindexedSearchBackend(SearchBackend):
+    """ Substring search over the paper table, for databases without a
+        search table. Not ranked.
+    """
+
+    def index(self, cursor, papers):
+        pass
+
+    def remove(self, cursor, paper_ids):
+        pass
+
+    def clear(self, cursor):
+        pass
+
+    def search(self, cursor, terms, limit, visible_to=None):
+        papers = Paper.objects.all()
+        if visible_to is not None:
+            papers = papers.filter(id__in=Paper.objects.filter(
+                Q(is_accepted=True) |
+                Q(primary_author_id=visible_to) |
+                Q(co_authors__id=visible_to)).values('id'))
+        for term in terms:
+            papers = papers.filter(
+                Q(title__icontains=term) |
+                Q(abstract__icontains=term) |
+                Q(keywords__icontains=term))
+        return list(papers.order_by('id').values_list('id', flat=True)[:limit])
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SqliteSearchBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, UnindexedSearchBackend)()
+
+
+def index_papers(papers):
+    """ Add or replace the index entries of Paper objects. """
+    with connection.cursor() as cursor:
+        get_backend().index(cursor, [
+            (paper.id, paper.title, paper.abstract, paper.keywords)
+            for paper in papers])
+
+
+def search(query, limit=PAPER_SEARCH_MAX_RESULTS, visible_to=None):
+    """ Ids of the papers matching every word of query, best first. With
+        visible_to (an attendee id), only the papers that attendee can see.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    with connection.cursor() as cursor:
+        return get_backend().search(cursor, terms, limit, visible_to)
+
+
+def rebuild(batch_size=2000):
+    """ Re-index all papers, returns the number of papers indexed. """
+    backend = get_backend()
+    num_papers = 0
+    rows = (Paper.objects
+        .order_by('id')
+        .values_list('id', *SEARCH_FIELDS)
+        .iterator(chunk_size=batch_size))
+    with transaction.atomic(), connection.cursor() as cursor:
+        backend.clear(cursor)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                backend.index(cursor, batch)
+                num_papers += len(batch)
+                batch = []
+        backend.index(cursor, batch)
+        num_papers += len(batch)
+    return num_papers
+
+
+@receiver(post_save, sender=Paper)
+def index_on_paper_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not (
+            set(update_fields) & set(SEARCH_FIELDS)):
+        return
+    index_papers([instance])
+
+
+@receiver(post_delete, sender=Paper)
+def remove_on_paper_delete(sender, instance, **kwargs):
+    with connection.cursor() as cursor:
+        get_backend().remove(cursor, [instance.id])
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+from .models import (
+    Organization,
+    TimeZone,
+    PaperType,
+    PaperTheme,
+    ReviewScore,
+    RejectionReason,
+)
+
+# The lookup tables are seeded once by load_reference_data and almost never
+# change, so each process keeps all of them in memory. A save / delete in
+# this process reloads them right away, the TTL bounds how long other
+# workers keep serving an older copy.
+REFERENCE_DATA_TTL = getattr(settings, 'REFERENCE_DATA_TTL', 300)
+
+# model -> (name field, display ordering)
+REFERENCE_MODELS = {
+    Organization: ('org_name', ('org_name',)),
+    TimeZone: ('utc_offset', ('utc_offset_minutes',)),
+    PaperType: ('paper_type_name', ('id',)),
+    PaperTheme: ('paper_theme', ('id',)),
+    ReviewScore: ('review_decision', ('id',)),
+    RejectionReason: ('reject_reason', ('id',)),
+}
+
+
+class _ReferenceTable(object):
+
+    def __init__(self, model, name_field, ordering):
+        self.objects = list(model.objects.order_by(*ordering))
+        self.by_id = {obj.id: obj for obj in self.objects}
+        self.by_name = {getattr(obj, name_field): obj for obj in self.objects}
+
+
+_lock = threading.Lock()
+_state = {'tables': None, 'expires_at': 0.0}
+
+
+def load():
+    """ Load all reference tables in one pass, replacing any cached copy. """
+    tables = {model: _ReferenceTable(model, name_field, ordering)
+              for model, (name_field, ordering) in REFERENCE_MODELS.items()}
+    with _lock:
+        _state['tables'] = tables
+        _state['expires_at'] = time.monotonic() + REFERENCE_DATA_TTL
+    return tables
+
+
+def _tables():
+    with _lock:
+        if (_state['tables'] is not None
+                and time.monotonic() < _state['expires_at']):
+            return _state['tables']
+    return load()
+
+
+def invalidate():
+    with _lock:
+        _state['tables'] = None
+        _state['expires_at'] = 0.0
+
+
+def all_objects(model):
+    """ All rows of a reference model, in display order. """
+    return _tables()[model].objects
+
+
+def get(model, pk):
+    """ Row of a reference model by id, None if there is no such row. """
+    return _tables()[model].by_id.get(pk)
+
+
+def get_by_name(model, name):
+    """ Row of a reference model by its name (org_name, utc_offset, ...). """
+    return _tables()[model].by_name.get(name)
+
+
+def timezones():
+    """ All TimeZone rows sorted by their integer utc_offset_minutes. """
+    return all_objects(TimeZone)
+
+
+def _invalidate_on_change(sender, **kwargs):
+    invalidate()
+
+
+for _model in REFERENCE_MODELS:
+    post_save.connect(_invalidate_on_change, sender=_model)
+    post_delete.connect(_invalidate_on_change, sender=_model)
@@ -0,0 +1,374 @@
+import collections
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+
+from .models import Paper, PaperTermVector, RelatedPaper
+
+# Papers are related by the cosine similarity of their TF-IDF vectors over
+# abstract and keywords (keyword occurrences count
+# RELATED_PAPERS_KEYWORD_WEIGHT times), mixed with the Jaccard similarity
+# of their themes, weighted RELATED_PAPERS_THEME_WEIGHT. The top
+# RELATED_PAPERS_TOP_K of each paper are kept in the RelatedPaper table by
+# update_related_papers(), and the paper page shows up to
+# RELATED_PAPERS_SHOWN of those the viewer can see. Term counts are stored
+# per paper with a hash of the text they came from, so an update only
+# re-counts papers whose abstract, keywords or themes changed and only
+# recomputes the lists of those papers and of the papers they enter or
+# leave. Lists that are not recomputed keep the scores (and IDF weights)
+# they were computed with; a full update recomputes everything. Terms found
+# in more than RELATED_PAPERS_MAX_DF of the papers carry little weight and
+# are dropped, which also bounds the cost of the similarity products.
+RELATED_PAPERS_TOP_K = getattr(settings, 'RELATED_PAPERS_TOP_K', 10)
+RELATED_PAPERS_SHOWN = getattr(settings, 'RELATED_PAPERS_SHOWN', 5)
+RELATED_PAPERS_THEME_WEIGHT = getattr(
+    settings, 'RELATED_PAPERS_THEME_WEIGHT', 0.3)
+RELATED_PAPERS_KEYWORD_WEIGHT = getattr(
+    settings, 'RELATED_PAPERS_KEYWORD_WEIGHT', 3)
+RELATED_PAPERS_MAX_DF = getattr(settings, 'RELATED_PAPERS_MAX_DF', 0.5)
+
+# terms are only dropped for document frequency above this many papers, so
+# small conferences keep all their terms
+_MIN_MAX_DF = 10
+# papers whose similarities to all others are computed at once
+_BLOCK_SIZE = 128
+# most frequent terms, multiplied as a dense matrix
+_DENSE_TERMS = 512
+# ids per query when deleting by id
+_DELETE_BATCH_SIZE = 500
+
+STOP_WORDS = frozenset("""
+    about above after again against all also among and any are been before
+    being below between both but can could did does doing down during each
+    few for from further had has have having her here hers him his how into
+    its itself may more most not now off once only other our ours out over
+    own same she should some such than that the their theirs them then there
+    these they this those through too under until upon use used using very
+    was were what when where which while who whom why will with within would
+    you your yours
+""".split())
+
+UpdateResult = collections.namedtuple('UpdateResult', [
+    'num_vectors',      # papers whose term counts were (re)computed
+    'num_lists',        # papers whose related papers were recomputed
+])
+
+
+def _words(text):
+    return [word for word in re.findall(r'\w+', text.lower())
+            if len(word) > 2 and not word.isdigit()
+            and word not in STOP_WORDS]
+
+
+def term_counts(abstract, keywords):
+    """ (terms, counts) of a paper: crc32 of each distinct word as uint32,
+        and its number of occurrences as uint16.
+    """
+    import numpy as np
+
+    counts = collections.Counter(_words(abstract))
+    for word in _words(keywords):
+        counts[word] += RELATED_PAPERS_KEYWORD_WEIGHT
+    terms = np.array([zlib.crc32(word.encode('utf-8')) for word in counts],
+                     dtype='<u4')
+    return terms, np.minimum(list(counts.values()), 0xffff).astype('<u2')
+
+
+def text_hash(abstract, keywords, theme_ids):
+    text = '\0'.join([abstract, keywords,
+                      ','.join(str(pk) for pk in sorted(theme_ids))])
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _paper_themes():
+    themes = collections.defaultdict(list)
+    for paper_id, theme_id in (Paper.themes.through.objects
+            .values_list('paper_id', 'papertheme_id')):
+        themes[paper_id].append(theme_id)
+    return themes
+
+
+def _delete_by_id(queryset, field, ids):
+    ids = list(ids)
+    for start in range(0, len(ids), _DELETE_BATCH_SIZE):
+        batch = ids[start:start + _DELETE_BATCH_SIZE]
+        queryset.filter(**{field + '__in': batch}).delete()
+
+
+def update_vectors(full=False, batch_size=2000):
+    """ Re-count the terms of papers whose abstract, keywords or themes
+        changed since their counts were stored (all papers if full).
+        Returns the ids of those papers.
+    """
+    themes = _paper_themes()
+    stored = dict(PaperTermVector.objects.values_list('paper_id', 'text_hash'))
+    vectors = []
+    rows = (Paper.objects
+        .order_by('id')
+        .values_list('id', 'abstract', 'keywords')
+        .iterator(chunk_size=batch_size))
+    for paper_id, abstract, keywords in rows:
+        paper_hash = text_hash(abstract, keywords, themes.get(paper_id, []))
+        if not full and stored.get(paper_id) == paper_hash:
+            continue
+        terms, counts = term_counts(abstract, keywords)
+        vectors.append(PaperTermVector(
+            paper_id=paper_id, text_hash=paper_hash,
+            terms=terms.tobytes(), counts=counts.tobytes()))
+    with transaction.atomic():
+        if full:
+            PaperTermVector.objects.all().delete()
+        else:
+            _delete_by_id(PaperTermVector.objects, 'paper_id',
+                          [vector.paper_id for vector in vectors])
+        PaperTermVector.objects.bulk_create(vectors, batch_size=1000)
+    return [vector.paper_id for vector in vectors]
+
+
+def _ranges(starts, lengths):
+    """ Concatenation of arange(start, start + length) for each pair. """
+    import numpy as np
+
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + (np.arange(lengths.sum()) - offsets)
+
+
+class RelatednessMatrix(object):
+    """ L2-normalized TF-IDF vectors of the papers as a sparse matrix (one
+        row per paper id, in compressed sparse row form: indptr, columns,
+        weights), with a column-sorted copy to multiply rows by, and the
+        papers' themes as a dense 0 / 1 matrix.
+    """
+
+    def __init__(self, paper_ids, lengths, terms, counts, themes):
+        import numpy as np
+
+        self.paper_ids = paper_ids
+        num_papers = len(paper_ids)
+        rows = np.repeat(np.arange(num_papers), lengths)
+        vocabulary, columns = np.unique(terms, return_inverse=True)
+        columns = columns.ravel()
+        df = np.bincount(columns, minlength=len(vocabulary))
+        keep = df[columns] <= max(RELATED_PAPERS_MAX_DF * num_papers,
+                                  _MIN_MAX_DF)
+        rows, columns = rows[keep], columns[keep]
+        idf = np.log((1.0 + num_papers) / (1.0 + df)) + 1.0
+        weights = (1.0 + np.log(counts[keep])) * idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2,
+                                    minlength=num_papers))
+        weights /= norms[rows]
+        # the cost of the sparse product grows with the square of the
+        # document frequency, so the most frequent terms go into a dense
+        # matrix instead
+        kept_df = np.bincount(columns, minlength=len(vocabulary))
+        dense_columns = np.argsort(-kept_df, kind='stable')[:_DENSE_TERMS]
+        dense_columns = dense_columns[kept_df[dense_columns] > 1]
+        dense_index = np.full(len(vocabulary), -1)
+        dense_index[dense_columns] = np.arange(len(dense_columns))
+        is_dense = dense_index[columns] >= 0
+        self.dense = np.zeros((num_papers, len(dense_columns)))
+        self.dense[rows[is_dense],
+                   dense_index[columns[is_dense]]] = weights[is_dense]
+        rows, columns = rows[~is_dense], columns[~is_dense]
+        weights = weights[~is_dense]
+        # rows are already in order, columns are sorted for the copy
+        self.indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(rows, minlength=num_papers))])
+        self.columns = columns
+        self.weights = weights
+        order = np.argsort(columns, kind='stable')
+        self.column_indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(columns, minlength=len(vocabulary)))])
+        self.column_rows = rows[order]
+        self.column_weights = weights[order]
+        self.themes = themes
+        self.theme_sizes = themes.sum(axis=1)
+
+    def __len__(self):
+        return len(self.paper_ids)
+
+    @classmethod
+    def from_vectors(cls):
+        """ Matrix of the stored term counts, rows in paper id order. """
+        import numpy as np
+
+        rows = list(PaperTermVector.objects
+            .values_list('paper_id', 'terms', 'counts')
+            .order_by('paper_id'))
+        paper_ids = [paper_id for paper_id, _, _ in rows]
+        terms = [np.frombuffer(bytes(terms), dtype='<u4')
+                 for _, terms, _ in rows]
+        counts = [np.frombuffer(bytes(counts), dtype='<u2')
+                  for _, _, counts in rows]
+        position = {paper_id: i for i, paper_id in enumerate(paper_ids)}
+        paper_themes = [(position[paper_id], theme_id)
+                        for paper_id, theme_ids in _paper_themes().items()
+                        if paper_id in position for theme_id in theme_ids]
+        theme_ids = sorted({theme_id for _, theme_id in paper_themes})
+        theme_column = {theme_id: i for i, theme_id in enumerate(theme_ids)}
+        themes = np.zeros((len(rows), len(theme_ids)))
+        for row, theme_id in paper_themes:
+            themes[row, theme_column[theme_id]] = 1
+        return cls(paper_ids, np.array([len(t) for t in terms], dtype=np.int64),
+                   np.concatenate(terms + [np.zeros(0, dtype='<u4')]),
+                   np.concatenate(counts + [np.zeros(0, dtype='<u2')]),
+                   themes)
+
+    def text_similarities(self, rows):
+        """ Cosine similarities of the given rows to all rows, as a dense
+            (len(rows) x papers) array. Each sparse term a row has adds its
+            weight times the other weight to every row holding the same
+            term.
+        """
+        import numpy as np
+
+        num_papers = len(self)
+        lengths = self.indptr[rows + 1] - self.indptr[rows]
+        entries = _ranges(self.indptr[rows], lengths)
+        local = np.repeat(np.arange(len(rows)), lengths)
+        columns = self.columns[entries]
+        df = self.column_indptr[columns + 1] - self.column_indptr[columns]
+        postings = _ranges(self.column_indptr[columns], df)
+        cells = (np.repeat(local, df) * num_papers +
+                 self.column_rows[postings])
+        products = (np.repeat(self.weights[entries], df) *
+                    self.column_weights[postings])
+        return np.bincount(cells, weights=products,
+                           minlength=len(rows) * num_papers
+                           ).reshape(len(rows), num_papers) + (
+            self.dense[rows] @ self.dense.T)
+
+    def theme_similarities(self, rows):
+        """ Jaccard similarities of the themes of rows to all rows. """
+        import numpy as np
+
+        shared = self.themes[rows] @ self.themes.T
+        union = self.theme_sizes[rows][:, None] + self.theme_sizes - shared
+        return np.divide(shared, union, out=np.zeros_like(shared),
+                         where=union > 0)
+
+    def similarities(self, rows):
+        """ Relatedness of rows to all rows, a row is not related to
+            itself.
+        """
+        import numpy as np
+
+        weight = RELATED_PAPERS_THEME_WEIGHT
+        scores = ((1 - weight) * self.text_similarities(rows) +
+                  weight * self.theme_similarities(rows))
+        scores[np.arange(len(rows)), rows] = -np.inf
+        return scores
+
+
+def _top_k(scores, k):
+    """ (columns, scores) of the k best scores of each row, best first,
+        equal scores in paper id order.
+    """
+    import numpy as np
+
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    best.sort(axis=1)
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return (np.take_along_axis(best, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1))
+
+
+def _neighbor_lists():
+    """ {paper id: (number of related papers, lowest score)} """
+    return {row['paper']: (row['num_related'], row['min_score'])
+            for row in (RelatedPaper.objects
+                .values('paper')
+                .annotate(num_related=Count('id'), min_score=Min('score'))
+                .order_by())}
+
+
+def _lists_holding(paper_ids):
+    paper_ids = list(paper_ids)
+    holders = set()
+    for start in range(0, len(paper_ids), _DELETE_BATCH_SIZE):
+        holders.update(RelatedPaper.objects
+            .filter(related_id__in=paper_ids[start:start + _DELETE_BATCH_SIZE])
+            .values_list('paper_id', flat=True))
+    return holders
+
+
+def update_related_papers(full=False):
+    """ Bring term counts and related paper lists up to date, recomputing
+        only what papers changed since the last update (everything if
+        full). Returns an UpdateResult.
+    """
+    import numpy as np
+
+    changed_ids = update_vectors(full=full)
+    matrix = RelatednessMatrix.from_vectors()
+    num_papers = len(matrix)
+    k = min(RELATED_PAPERS_TOP_K, num_papers - 1)
+    if k < 1:
+        RelatedPaper.objects.all().delete()
+        return UpdateResult(len(changed_ids), 0)
+    position = {paper_id: i for i, paper_id in enumerate(matrix.paper_ids)}
+    paper_ids = np.array(matrix.paper_ids)
+
+    lists = {}
+    if full:
+        pending = np.arange(num_papers)
+    else:
+        pending = np.array(sorted(position[pk] for pk in changed_ids),
+                           dtype=np.int64)
+    # best score any changed paper gets with each paper
+    best_changed = np.full(num_papers, -np.inf)
+    for start in range(0, len(pending), _BLOCK_SIZE):
+        rows = pending[start:start + _BLOCK_SIZE]
+        scores = matrix.similarities(rows)
+        best_changed = np.maximum(best_changed, scores.max(axis=0))
+        lists.update(zip(rows.tolist(), zip(*_top_k(scores, k))))
+
+    if not full:
+        # lists that held a changed paper (its score moved), lists a changed
+        # paper now beats the last entry of, and lists that are short (new
+        # papers, or a related paper was deleted)
+        stored = _neighbor_lists()
+        stale = _lists_holding(changed_ids)
+        affected = []
+        for paper_id, row in position.items():
+            if row in lists:
+                continue
+            num_related, min_score = stored.get(paper_id, (0, None))
+            if (paper_id in stale or num_related < k or
+                    best_changed[row] > min_score):
+                affected.append(row)
+        affected = np.array(sorted(affected), dtype=np.int64)
+        for start in range(0, len(affected), _BLOCK_SIZE):
+            rows = affected[start:start + _BLOCK_SIZE]
+            lists.update(zip(rows.tolist(),
+                             zip(*_top_k(matrix.similarities(rows), k))))
+
+    related = [
+        RelatedPaper(paper_id=matrix.paper_ids[row], related_id=related_id,
+                     rank=rank, score=score)
+        for row, (columns, scores) in lists.items()
+        for rank, (related_id, score) in enumerate(
+            zip(paper_ids[columns].tolist(), scores.tolist()), 1)]
+    with transaction.atomic():
+        if full:
+            RelatedPaper.objects.all().delete()
+        else:
+            _delete_by_id(RelatedPaper.objects, 'paper_id',
+                          [matrix.paper_ids[row] for row in lists])
+        RelatedPaper.objects.bulk_create(related, batch_size=1000)
+    return UpdateResult(len(changed_ids), len(lists))
+
+
+def get_related_papers(paper_id):
+    """ [(id, title, is_accepted)] of the papers related to a paper, most
+        related first. Papers with nothing in common are left out.
+    """
+    return list(RelatedPaper.objects
+        .filter(paper_id=paper_id, score__gt=0)
+        .order_by('rank')
+        .values_list('related_id', 'related__title', 'related__is_accepted'))
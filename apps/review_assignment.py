@@ -0,0 +1,221 @@
+import collections
+import functools
+import math
+import operator
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from . import dashboard
+from .models import Attendee, Organization, Paper, Review, ReviewAssignment
+
+# Each paper should get REVIEWS_PER_PAPER reviewers and every reviewer about
+# the same number of papers. Reviewers have no themes of their own, their
+# expertise is the mix of themes of the papers they (co-)authored. Among
+# the eligible reviewers for a paper the one with the lowest
+#   load / capacity - REVIEW_ASSIGNMENT_THEME_WEIGHT * theme overlap
+# is picked, so theme overlap only decides between similarly loaded
+# reviewers. Papers are filled greedily, then a repair step moves new
+# assignments away from reviewers over capacity along chains of reviewers
+# who can take over each other's papers. Assignments that have become
+# conflicts (e.g. the reviewer was added as a co-author) and are not
+# reviewed yet are dropped and replaced.
+REVIEWS_PER_PAPER = getattr(settings, 'REVIEWS_PER_PAPER', 3)
+REVIEW_ASSIGNMENT_THEME_WEIGHT = getattr(
+    settings, 'REVIEW_ASSIGNMENT_THEME_WEIGHT', 0.5)
+
+# Sharing the primary author's organization is a conflict of interest,
+# except for catch-all organizations.
+REVIEW_CONFLICT_EXEMPT_ORGS = getattr(
+    settings, 'REVIEW_CONFLICT_EXEMPT_ORGS', ['External'])
+
+# added to the cost of reviewers already at capacity, who are only picked
+# when no one else is eligible
+_OVER_CAPACITY_PENALTY = 1e6
+
+AssignmentResult = collections.namedtuple('AssignmentResult', [
+    'pairs',            # new (reviewer id, paper id) assignments
+    'dropped',          # conflicted (reviewer id, paper id) assignments
+    'shortfall',        # {paper id: reviewers still missing}
+    'loads',            # {reviewer id: assigned or reviewed papers}
+    'capacity',         # papers per reviewer for a balanced load
+])
+
+
+def _index(ids):
+    return {id_: i for i, id_ in enumerate(ids)}
+
+
+def _pairs(rows, row_index, col_index):
+    """ (row indices, column indices) arrays of the (row id, column id)
+        rows with both ids in the indexes.
+    """
+    import numpy as np
+
+    pairs = [(row_index[r], col_index[c]) for r, c in rows
+             if r in row_index and c in col_index]
+    if not pairs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return tuple(np.array(pairs, dtype=np.int64).T)
+
+
+def _problem():
+    """ Papers x reviewers matrices of theme overlap (0 to 1), conflicts,
+        existing assignments and reviews, with the paper and reviewer ids.
+    """
+    import numpy as np
+
+    reviewers = list(Attendee.objects
+        .filter(is_reviewer=True)
+        .order_by('id')
+        .values_list('id', 'org_id'))
+    papers = list(Paper.objects
+        .order_by('id')
+        .values_list('id', 'primary_author_id', 'primary_author__org_id'))
+    reviewer_ids = [r for r, _ in reviewers]
+    paper_ids = [p for p, _, _ in papers]
+    r_index, p_index = _index(reviewer_ids), _index(paper_ids)
+
+    theme_rows = list(Paper.themes.through.objects
+        .values_list('paper_id', 'papertheme_id'))
+    t_index = _index(sorted({t for _, t in theme_rows}))
+    paper_themes = np.zeros((len(papers), len(t_index)), dtype=np.float32)
+    paper_themes[_pairs(theme_rows, p_index, t_index)] = 1
+
+    author_rows = [(p, a) for p, a, _ in papers] + list(
+        Paper.co_authors.through.objects.values_list('paper_id', 'attendee_id'))
+    ap, ar = _pairs(author_rows, p_index, r_index)
+    # share of each reviewer's own papers in each theme
+    reviewer_themes = np.zeros((len(reviewers), len(t_index)), dtype=np.float32)
+    np.add.at(reviewer_themes, ar, paper_themes[ap])
+    reviewer_themes /= np.maximum(reviewer_themes.sum(axis=1, keepdims=True), 1)
+    overlap = paper_themes @ reviewer_themes.T
+    overlap /= np.maximum(paper_themes.sum(axis=1, keepdims=True), 1)
+
+    conflict = np.zeros((len(papers), len(reviewers)), dtype=bool)
+    conflict[ap, ar] = True
+    exempt = set(Organization.objects
+        .filter(org_name__in=REVIEW_CONFLICT_EXEMPT_ORGS)
+        .values_list('id', flat=True))
+    paper_orgs = np.array([-1 if o is None or o in exempt else o
+                           for _, _, o in papers], dtype=np.int64)
+    reviewer_orgs = np.array([-2 if o is None or o in exempt else o
+                              for _, o in reviewers], dtype=np.int64)
+    conflict |= np.equal.outer(paper_orgs, reviewer_orgs)
+
+    assigned, reviewed = (
+        np.zeros((len(papers), len(reviewers)), dtype=bool) for _ in range(2))
+    for model, matrix in ((ReviewAssignment, assigned), (Review, reviewed)):
+        rows = model.objects.values_list('paper_id', 'reviewer_id')
+        matrix[_pairs(rows, p_index, r_index)] = True
+    return paper_ids, reviewer_ids, overlap, conflict, assigned, reviewed
+
+
+def _repair(new, eligible, load, capacity):
+    """ Move new assignments (papers x reviewers bool matrix, changed in
+        place with load) from reviewers over capacity to reviewers under
+        it. A move may go through a chain of reviewers, each handing one of
+        their new papers to the next, found by breadth first search.
+    """
+    import numpy as np
+
+    for start in np.flatnonzero(load > capacity):
+        while load[start] > capacity:
+            # reviewer -> (previous reviewer, paper handed over)
+            came_from = {start: None}
+            queue, end = collections.deque([start]), None
+            while queue and end is None:
+                reviewer = queue.popleft()
+                for paper in np.flatnonzero(new[:, reviewer]):
+                    takers = np.flatnonzero(eligible[paper] & ~new[paper])
+                    for taker in takers:
+                        if taker in came_from:
+                            continue
+                        came_from[taker] = (reviewer, paper)
+                        if load[taker] + 1 <= capacity:
+                            end = taker
+                            break
+                        queue.append(taker)
+                    if end is not None:
+                        break
+            if end is None:
+                break
+            reviewer = end
+            while came_from[reviewer] is not None:
+                giver, paper = came_from[reviewer]
+                new[paper, giver] = False
+                new[paper, reviewer] = True
+                reviewer = giver
+            load[start] -= 1
+            load[end] += 1
+
+
+def solve(reviews_per_paper=REVIEWS_PER_PAPER):
+    """ New review assignments that bring every paper up to
+        reviews_per_paper reviewers (existing assignments and reviews
+        count), never assigning a paper to its authors or to reviewers from
+        the primary author's organization. Existing assignments that are
+        now conflicts and not reviewed yet are dropped. Nothing is saved.
+
+        Papers are filled most-constrained first (fewest eligible
+        reviewers), picking the cheapest reviewers for each paper with one
+        argpartition over all reviewers, then _repair() rebalances loads.
+    """
+    import numpy as np
+
+    (paper_ids, reviewer_ids, overlap, conflict, assignments,
+     reviewed) = _problem()
+    stale = assignments & conflict & ~reviewed
+    dropped = [(reviewer_ids[r], paper_ids[p])
+               for p, r in zip(*np.nonzero(stale))]
+    assigned = (assignments & ~stale) | reviewed
+    if not reviewer_ids:
+        return AssignmentResult(
+            [], dropped, {p: reviews_per_paper for p in paper_ids}, {}, 0)
+    capacity = math.ceil(reviews_per_paper * len(paper_ids) / len(reviewer_ids))
+    load = assigned.sum(axis=0).astype(np.float64)
+    need = np.maximum(reviews_per_paper - assigned.sum(axis=1), 0)
+    eligible = ~conflict & ~assigned
+    num_eligible = eligible.sum(axis=1)
+
+    new = np.zeros_like(assigned)
+    shortfall = {}
+    for p in np.argsort(num_eligible, kind='stable'):
+        if need[p] == 0:
+            continue
+        n = min(need[p], num_eligible[p])
+        if n < need[p]:
+            shortfall[paper_ids[p]] = int(need[p] - n)
+        if n == 0:
+            continue
+        cost = load / capacity - REVIEW_ASSIGNMENT_THEME_WEIGHT * overlap[p]
+        cost[load >= capacity] += _OVER_CAPACITY_PENALTY
+        cost[~eligible[p]] = np.inf
+        picks = np.argpartition(cost, n - 1)[:n]
+        load[picks] += 1
+        new[p, picks] = True
+    _repair(new, eligible, load, capacity)
+
+    pairs = [(reviewer_ids[r], paper_ids[p]) for p, r in zip(*np.nonzero(new))]
+    loads = dict(zip(reviewer_ids, load.astype(int).tolist()))
+    return AssignmentResult(pairs, dropped, shortfall, loads, capacity)
+
+
+def assign_reviewers(reviews_per_paper=REVIEWS_PER_PAPER):
+    """ solve(), delete the dropped assignments and save the new ones. """
+    result = solve(reviews_per_paper)
+    with transaction.atomic():
+        if result.dropped:
+            # a queryset delete() still sends post_delete for every row, so
+            # the dashboard receivers run
+            ReviewAssignment.objects.filter(functools.reduce(operator.or_, (
+                Q(reviewer_id=reviewer_id, paper_id=paper_id)
+                for reviewer_id, paper_id in result.dropped))).delete()
+        ReviewAssignment.objects.bulk_create([
+            ReviewAssignment(reviewer_id=reviewer_id, paper_id=paper_id)
+            for reviewer_id, paper_id in result.pairs],
+            batch_size=1000, ignore_conflicts=True)
+    # bulk_create sends no signals
+    dashboard.invalidate({reviewer_id for reviewer_id, _ in result.pairs})
+    return result
@@ -0,0 +1,54 @@
+import itertools
+
+from django.db.models import (
+    Exists, IntegerField, OuterRef, Q, Subquery, Value)
+from django.db.models.functions import Coalesce
+
+from .models import Paper, Review, ReviewAssignment
+
+
+def get_review_tasks(reviewer):
+    """ Papers assigned to this reviewer (see review_assignment.py) or
+        already reviewed by them, with the review status and score, in one
+        query.
+
+        Each paper is annotated with `is_reviewed` (reviewer has a Review
+        for it) and `star_rating` (the review score, 0 if not reviewed),
+        and comes with its paper_type already joined in.
+    """
+    my_reviews = Review.objects.filter(reviewer=reviewer, paper=OuterRef('pk'))
+    my_assignments = ReviewAssignment.objects.filter(
+        reviewer=reviewer, paper=OuterRef('pk'))
+    return (Paper.objects
+        .select_related('paper_type')
+        .annotate(
+            is_assigned=Exists(my_assignments),
+            is_reviewed=Exists(my_reviews),
+            star_rating=Coalesce(
+                Subquery(my_reviews.values('decision__review_score')[:1]),
+                Value(0), output_field=IntegerField()))
+        .filter(Q(is_assigned=True) | Q(is_reviewed=True))
+        .order_by('title'))
+
+
+def as_review_task(paper):
+    """ (paper, is_reviewed, star_rating) tuple for an annotated paper. """
+    if paper.is_reviewed:
+        return (paper, True, range(paper.star_rating))
+    return (paper, False, None)
+
+
+def group_review_tasks(reviewer):
+    """ Review tasks grouped by paper type name.
+
+        Returns a list of (paper_type_name, tasks) sorted by paper type
+        name, where tasks is a title sorted list of (paper, is_reviewed,
+        star_rating) tuples as expected by the dashboard template.
+    """
+    papers = (get_review_tasks(reviewer)
+        .order_by('paper_type__paper_type_name', 'title'))
+    return [
+        (paper_type, [as_review_task(paper) for paper in papers_by_type])
+        for paper_type, papers_by_type in itertools.groupby(
+            papers, key=lambda p: p.paper_type.paper_type_name)
+    ]
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Attendee, Review, ReviewerProgress, scored_reviews
+
+
+def _progress_counters():
+    return dict(
+        num_reviewed=Count('id'),
+        num_abstained=Count('id', filter=~scored_reviews()),
+        last_reviewed_at=Max('reviewed_at'))
+
+
+def refresh_reviewer_progress(reviewer_id, create=True):
+    """ Recompute the progress row for a single reviewer.
+
+        With create=False only an existing row is updated, which is what
+        we want while the reviewer itself is being deleted.
+    """
+    counters = (Review.objects
+        .filter(reviewer_id=reviewer_id)
+        .aggregate(**_progress_counters()))
+    if create:
+        ReviewerProgress.objects.update_or_create(
+            reviewer_id=reviewer_id, defaults=counters)
+    else:
+        ReviewerProgress.objects.filter(
+            reviewer_id=reviewer_id).update(**counters)
+
+
+def rebuild_reviewer_progress():
+    """ Recompute progress rows for all reviewers with one grouped query.
+
+        Returns the number of rows written.
+    """
+    counters = {
+        row['reviewer']: row for row in (Review.objects
+            .values('reviewer')
+            .annotate(**_progress_counters())
+            .order_by())
+    }
+    reviewer_ids = set(counters.keys()) | set(Attendee.objects
+        .filter(is_reviewer=True)
+        .values_list('id', flat=True))
+    rows = []
+    for reviewer_id in reviewer_ids:
+        row = counters.get(reviewer_id, {})
+        rows.append(ReviewerProgress(
+            reviewer_id=reviewer_id,
+            num_reviewed=row.get('num_reviewed', 0),
+            num_abstained=row.get('num_abstained', 0),
+            last_reviewed_at=row.get('last_reviewed_at')))
+    with transaction.atomic():
+        ReviewerProgress.objects.all().delete()
+        ReviewerProgress.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+@receiver(post_init, sender=Review)
+def remember_reviewer(sender, instance, **kwargs):
+    # read __dict__, not the attribute, so a deferred field stays deferred;
+    # a review moved to another reviewer must refresh both rows
+    instance._progress_reviewer_id = instance.__dict__.get('reviewer_id')
+
+
+@receiver(post_save, sender=Review)
+def update_reviewer_progress_on_save(sender, instance, **kwargs):
+    refresh_reviewer_progress(instance.reviewer_id)
+    old_reviewer_id = getattr(instance, '_progress_reviewer_id', None)
+    if old_reviewer_id not in (None, instance.reviewer_id):
+        refresh_reviewer_progress(old_reviewer_id)
+    instance._progress_reviewer_id = instance.reviewer_id
+
+
+@receiver(post_delete, sender=Review)
+def update_reviewer_progress_on_delete(sender, instance, **kwargs):
+    reviewer_id = getattr(instance, '_progress_reviewer_id', None)
+    refresh_reviewer_progress(reviewer_id or instance.reviewer_id,
+                              create=False)
@@ -0,0 +1,71 @@
+import collections
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, ReviewScore
+from .review_tasks import as_review_task, get_review_tasks
+
+NUM_SCORE_BINS = 4
+GLOBAL_DISTRIBUTION_CACHE_KEY = 'reviewer_reports:global_distribution'
+
+ReviewerReport = collections.namedtuple('ReviewerReport', [
+    'papers_reviewed',      # title sorted (paper, is_reviewed, star_rating)
+    'num_reviewed',         # number of papers reviewed, abstains included
+    'score_counts',         # [(score, count)] for scores 1..NUM_SCORE_BINS
+    'global_distribution',  # [(score, percent of all reviews)]
+])
+
+
+def score_histogram(scores, nbins=NUM_SCORE_BINS):
+    """ Counts of scores 1..nbins in a single pass, abstains (0) dropped. """
+    import numpy as np
+
+    counts = np.bincount(np.asarray(scores, dtype=np.int64),
+                         minlength=nbins + 1)
+    return [(v, int(c)) for v, c in enumerate(counts[1:nbins + 1], start=1)]
+
+
+def _compute_global_distribution():
+    score_counts = (Review.objects
+        .values_list('decision__review_score')
+        .annotate(num_reviews=Count('id'))
+        .order_by())
+    num_reviews = sum(c for _, c in score_counts)
+    return sorted(
+        (score, 100 * count / num_reviews)
+        for score, count in score_counts
+        if score)
+
+
+def get_global_distribution():
+    """ Percentage of all reviews at each non-abstain score, sorted by score.
+
+        Computed with one grouped query and cached until a Review or a
+        ReviewScore is saved or deleted.
+    """
+    distribution = cache.get(GLOBAL_DISTRIBUTION_CACHE_KEY)
+    if distribution is None:
+        distribution = _compute_global_distribution()
+        cache.set(GLOBAL_DISTRIBUTION_CACHE_KEY, distribution, None)
+    return distribution
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=ReviewScore)
+@receiver(post_delete, sender=ReviewScore)
+def invalidate_global_distribution(sender, **kwargs):
+    cache.delete(GLOBAL_DISTRIBUTION_CACHE_KEY)
+
+
+def get_reviewer_report(reviewer):
+    papers = list(get_review_tasks(reviewer))
+    scores = [paper.star_rating for paper in papers if paper.is_reviewed]
+    return ReviewerReport(
+        papers_reviewed=[as_review_task(paper) for paper in papers],
+        num_reviewed=len(scores),
+        score_counts=score_histogram(scores),
+        global_distribution=get_global_distribution())
@@ -0,0 +1,453 @@
+import collections
+import datetime
+import math
+import random
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Paper
+
+# The conference runs SCHEDULE_TRACKS parallel tracks on each of
+# SCHEDULE_DAYS, in SCHEDULE_SLOTS_PER_DAY slots of SCHEDULE_SLOT_MINUTES
+# from SCHEDULE_DAY_START (UTC). Accepted papers whose speaker confirmed
+# (accept_speaker_invite) get a track and Paper.scheduled_at; a time
+# without a track was entered by hand (admin) and is left alone. Extra long
+# papers take SCHEDULE_EXTRA_LONG_SLOTS consecutive slots of a day. Two
+# talks never share a track and slot, and papers sharing an author (primary
+# or co-author) never overlap. Within those rules the schedule minimizes
+#   SCHEDULE_LOCAL_HOURS_WEIGHT * hours each talk runs outside
+#       SCHEDULE_LOCAL_HOURS of its primary author's time zone
+#   + SCHEDULE_THEME_WEIGHT * (1 - Jaccard similarity of the themes) of
+#       each pair of back-to-back talks in a track, so tracks form themed
+#       sessions
+#   + SCHEDULE_MOVE_PENALTY per talk moved from its saved slot
+# The move penalty only applies when re-solving around a saved schedule,
+# so a single change (a speaker confirming or withdrawing, a new co-author)
+# moves as few talks as possible; a full solve ignores the saved schedule.
+SCHEDULE_DAYS = getattr(settings, 'SCHEDULE_DAYS', [
+    datetime.date(2021, 10, 12),
+    datetime.date(2021, 10, 13),
+    datetime.date(2021, 10, 14),
+])
+SCHEDULE_DAY_START = getattr(
+    settings, 'SCHEDULE_DAY_START', datetime.time(13, 0))
+SCHEDULE_SLOTS_PER_DAY = getattr(settings, 'SCHEDULE_SLOTS_PER_DAY', 12)
+SCHEDULE_SLOT_MINUTES = getattr(settings, 'SCHEDULE_SLOT_MINUTES', 30)
+SCHEDULE_TRACKS = getattr(settings, 'SCHEDULE_TRACKS', 2)
+SCHEDULE_EXTRA_LONG_SLOTS = getattr(settings, 'SCHEDULE_EXTRA_LONG_SLOTS', 2)
+SCHEDULE_LOCAL_HOURS = getattr(settings, 'SCHEDULE_LOCAL_HOURS', (8, 20))
+SCHEDULE_LOCAL_HOURS_WEIGHT = getattr(
+    settings, 'SCHEDULE_LOCAL_HOURS_WEIGHT', 1.0)
+SCHEDULE_THEME_WEIGHT = getattr(settings, 'SCHEDULE_THEME_WEIGHT', 1.0)
+SCHEDULE_MOVE_PENALTY = getattr(settings, 'SCHEDULE_MOVE_PENALTY', 2.0)
+
+# Placements are improved by simulated annealing (moving a talk to a free
+# slot, or swapping two talks of the same length), this many moves per talk.
+# Re-solving around a saved schedule only accepts improving moves, this
+# many per talk that had to be (re)inserted.
+SCHEDULE_MOVES_PER_TALK = getattr(settings, 'SCHEDULE_MOVES_PER_TALK', 500)
+_START_TEMPERATURE = 0.1
+_SEED = 20211012
+
+# cost of a talk without a slot, more than any placement can cost
+_UNSCHEDULED_PENALTY = 1000.0
+
+ScheduleResult = collections.namedtuple('ScheduleResult', [
+    'placements',       # {paper id: (track, scheduled_at)}
+    'unscheduled',      # ids of papers that did not fit
+    'moved',            # ids of papers placed differently than saved
+    'cost',             # objective value of the placed talks, see above
+])
+
+
+class SlotGrid(object):
+    """ Days, slots and tracks of the conference. Slots are numbered
+        across days, slot g is slot g % slots_per_day of day
+        g // slots_per_day; tracks are numbered from 1.
+    """
+
+    def __init__(self, days, day_start, slots_per_day, slot_minutes, tracks):
+        self.days = list(days)
+        self.day_start = day_start
+        self.slots_per_day = slots_per_day
+        self.slot_minutes = slot_minutes
+        self.tracks = tracks
+
+    @classmethod
+    def from_settings(cls):
+        return cls(SCHEDULE_DAYS, SCHEDULE_DAY_START, SCHEDULE_SLOTS_PER_DAY,
+                   SCHEDULE_SLOT_MINUTES, SCHEDULE_TRACKS)
+
+    @property
+    def num_slots(self):
+        return len(self.days) * self.slots_per_day
+
+    def start_of(self, slot):
+        day, index = divmod(slot, self.slots_per_day)
+        start = datetime.datetime.combine(
+            self.days[day], self.day_start, tzinfo=datetime.timezone.utc)
+        return start + datetime.timedelta(minutes=index * self.slot_minutes)
+
+    def slot_of(self, start):
+        """ Slot starting at the datetime start, None if there is none. """
+        for day in range(len(self.days)):
+            minutes, seconds = divmod(
+                (start - self.start_of(day * self.slots_per_day))
+                .total_seconds(), 60)
+            index, offset = divmod(int(minutes), self.slot_minutes)
+            if (seconds == 0 and offset == 0 and
+                    0 <= index < self.slots_per_day):
+                return day * self.slots_per_day + index
+        return None
+
+    def utc_minutes(self):
+        """ Minutes after midnight UTC at which each slot starts. """
+        start = self.day_start.hour * 60 + self.day_start.minute
+        return [start + (slot % self.slots_per_day) * self.slot_minutes
+                for slot in range(self.num_slots)]
+
+
+def _outside_minutes(starts, lengths, window):
+    """ Minutes of [starts, starts + lengths) (local minutes after midnight,
+        numpy arrays) outside the daily window (start hour, end hour).
+    """
+    import numpy as np
+
+    ends = starts + lengths
+    inside = np.zeros(np.broadcast(starts, ends).shape)
+    for day in (-1440, 0, 1440):
+        low = day + window[0] * 60
+        high = day + window[1] * 60
+        inside += np.maximum(
+            np.minimum(ends, high) - np.maximum(starts, low), 0)
+    return lengths - inside
+
+
+def _problem(grid):
+    """ Papers to schedule, as (ids, lengths in slots, authors, saved
+        (track, slot) or None) with papers x slots time costs (inf where a
+        talk would run past the end of the day) and papers x papers theme
+        costs.
+    """
+    import numpy as np
+
+    papers = list(Paper.objects
+        .filter(is_accepted=True, accept_speaker_invite=True)
+        .order_by('id')
+        .values_list('id', 'extra_long_paper', 'primary_author_id',
+                     'primary_author__timezone__utc_offset_minutes',
+                     'track', 'scheduled_at'))
+    paper_ids = [row[0] for row in papers]
+    index = {paper_id: i for i, paper_id in enumerate(paper_ids)}
+    lengths = np.array([SCHEDULE_EXTRA_LONG_SLOTS if row[1] else 1
+                        for row in papers], dtype=np.int64)
+
+    authors = [{row[2]} for row in papers]
+    for paper_id, attendee_id in (Paper.co_authors.through.objects
+            .filter(paper_id__in=paper_ids)
+            .values_list('paper_id', 'attendee_id')):
+        authors[index[paper_id]].add(attendee_id)
+
+    saved = []
+    for row in papers:
+        track, scheduled_at = row[4], row[5]
+        slot = None
+        if (track is not None and scheduled_at is not None and
+                1 <= track <= grid.tracks):
+            slot = grid.slot_of(scheduled_at)
+        saved.append(None if slot is None else (track, slot))
+
+    utc_minutes = np.array(grid.utc_minutes())
+    offsets = np.array([row[3] or 0 for row in papers])[:, None]
+    local = (utc_minutes[None, :] + offsets) % 1440
+    time_cost = (SCHEDULE_LOCAL_HOURS_WEIGHT / 60 * _outside_minutes(
+        local, lengths[:, None] * grid.slot_minutes, SCHEDULE_LOCAL_HOURS))
+    # no time zone, no preference
+    time_cost[[row[3] is None for row in papers]] = 0
+    slot_index = np.arange(grid.num_slots) % grid.slots_per_day
+    time_cost[slot_index[None, :] + lengths[:, None] >
+              grid.slots_per_day] = np.inf
+
+    theme_rows = list(Paper.themes.through.objects
+        .filter(paper_id__in=paper_ids)
+        .values_list('paper_id', 'papertheme_id'))
+    theme_index = {theme_id: i for i, theme_id in enumerate(
+        sorted({theme_id for _, theme_id in theme_rows}))}
+    themes = np.zeros((len(papers), len(theme_index)))
+    for paper_id, theme_id in theme_rows:
+        themes[index[paper_id], theme_index[theme_id]] = 1
+    shared = themes @ themes.T
+    sizes = themes.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - shared
+    similarity = np.divide(shared, union, out=np.zeros_like(shared),
+                           where=union > 0)
+    theme_cost = SCHEDULE_THEME_WEIGHT * (1 - similarity)
+    return (paper_ids, lengths.tolist(), [frozenset(a) for a in authors],
+            saved, time_cost, theme_cost)
+
+
+class _Schedule(object):
+    """ Placements of talks in the slot grid, with what is needed to check
+        a placement and to price a change in O(1): the talk in each (track,
+        slot) cell and the authors busy in each slot.
+    """
+
+    def __init__(self, grid, lengths, authors, saved, time_cost, theme_cost,
+                 move_penalty):
+        self.grid = grid
+        self.lengths = lengths
+        self.authors = authors
+        self.saved = saved
+        self.time_cost = time_cost.tolist()
+        self.theme_cost = theme_cost.tolist()
+        self.move_penalty = move_penalty
+        self.positions = [None] * len(lengths)
+        self.cells = [[None] * grid.num_slots for _ in range(grid.tracks)]
+        self.busy = [collections.Counter() for _ in range(grid.num_slots)]
+
+    def fits(self, paper, track, slot):
+        if self.time_cost[paper][slot] == math.inf:
+            return False
+        cells = self.cells[track - 1]
+        authors = self.authors[paper]
+        for s in range(slot, slot + self.lengths[paper]):
+            if cells[s] is not None:
+                return False
+            busy = self.busy[s]
+            if any(busy[author] for author in authors):
+                return False
+        return True
+
+    def place(self, paper, track, slot):
+        cells = self.cells[track - 1]
+        for s in range(slot, slot + self.lengths[paper]):
+            cells[s] = paper
+            self.busy[s].update(self.authors[paper])
+        self.positions[paper] = (track, slot)
+
+    def remove(self, paper):
+        track, slot = self.positions[paper]
+        cells = self.cells[track - 1]
+        for s in range(slot, slot + self.lengths[paper]):
+            cells[s] = None
+            self.busy[s].subtract(self.authors[paper])
+        self.positions[paper] = None
+
+    def neighbors(self, track, slot, length):
+        """ Talks right before and right after [slot, slot + length) in a
+            track, on the same day (None where there is no talk).
+        """
+        cells = self.cells[track - 1]
+        index = slot % self.grid.slots_per_day
+        before = cells[slot - 1] if index > 0 else None
+        after = (cells[slot + length]
+                 if index + length < self.grid.slots_per_day else None)
+        return before, after
+
+    def placement_cost(self, paper, track, slot):
+        """ Cost of paper at (track, slot) on its own, without themes. """
+        cost = self.time_cost[paper][slot]
+        saved = self.saved[paper]
+        if self.move_penalty and saved is not None and saved != (track, slot):
+            cost += self.move_penalty
+        return cost
+
+    def cost_of(self, papers):
+        """ Cost of placing papers, and of the back-to-back pairs they are
+            part of.
+        """
+        cost = 0.0
+        pairs = set()
+        for paper in papers:
+            position = self.positions[paper]
+            if position is None:
+                cost += _UNSCHEDULED_PENALTY
+                continue
+            cost += self.placement_cost(paper, *position)
+            before, after = self.neighbors(*position, self.lengths[paper])
+            if before is not None:
+                pairs.add((before, paper))
+            if after is not None:
+                pairs.add((paper, after))
+        return cost + sum(self.theme_cost[a][b] for a, b in pairs)
+
+    def total_cost(self):
+        return self.cost_of(range(len(self.lengths)))
+
+    def insertion_cost(self, paper, track, slot):
+        cost = self.placement_cost(paper, track, slot)
+        for other in self.neighbors(track, slot, self.lengths[paper]):
+            if other is not None:
+                cost += self.theme_cost[paper][other]
+        return cost
+
+    def insert(self, paper):
+        """ Place paper where it costs least, returns False if no slot
+            fits it.
+        """
+        best, best_cost = None, math.inf
+        saved = self.saved[paper]
+        if saved is not None and self.fits(paper, *saved):
+            best, best_cost = saved, self.insertion_cost(paper, *saved)
+        for track in range(1, self.grid.tracks + 1):
+            for slot in range(self.grid.num_slots):
+                if self.time_cost[paper][slot] >= best_cost:
+                    continue
+                if self.fits(paper, track, slot):
+                    cost = self.insertion_cost(paper, track, slot)
+                    if cost < best_cost:
+                        best, best_cost = (track, slot), cost
+        if best is None:
+            return False
+        self.place(paper, *best)
+        return True
+
+    def _relocate(self, rng, paper):
+        old = self.positions[paper]
+        track = rng.randint(1, self.grid.tracks)
+        slot = rng.randrange(self.grid.num_slots)
+        if old == (track, slot):
+            return None
+        before = self.cost_of([paper])
+        if old is not None:
+            self.remove(paper)
+        if not self.fits(paper, track, slot):
+            if old is not None:
+                self.place(paper, *old)
+            return None
+        self.place(paper, track, slot)
+
+        def undo():
+            self.remove(paper)
+            if old is not None:
+                self.place(paper, *old)
+        return self.cost_of([paper]) - before, undo
+
+    def _swap(self, rng, paper, other):
+        first, second = self.positions[paper], self.positions[other]
+        if (first is None or second is None or paper == other or
+                self.lengths[paper] != self.lengths[other]):
+            return None
+        before = self.cost_of([paper, other])
+        self.remove(paper)
+        self.remove(other)
+        if self.fits(paper, *second):
+            self.place(paper, *second)
+            if self.fits(other, *first):
+                self.place(other, *first)
+
+                def undo():
+                    self.remove(paper)
+                    self.remove(other)
+                    self.place(paper, *first)
+                    self.place(other, *second)
+                return self.cost_of([paper, other]) - before, undo
+            self.remove(paper)
+        self.place(paper, *first)
+        self.place(other, *second)
+        return None
+
+    def anneal(self, num_moves, temperature, seed=_SEED):
+        """ Improve the placements with num_moves random moves, accepting a
+            move that costs delta more with probability
+            exp(-delta / temperature), temperature falling linearly to 0.
+            Ends with the best placements seen.
+        """
+        rng = random.Random(seed)
+        num_papers = len(self.lengths)
+        if num_papers == 0:
+            return
+        cost = best_cost = self.total_cost()
+        best = list(self.positions)
+        for move in range(num_moves):
+            paper = rng.randrange(num_papers)
+            if self.positions[paper] is not None and rng.random() < 0.5:
+                change = self._swap(rng, paper, rng.randrange(num_papers))
+            else:
+                change = self._relocate(rng, paper)
+            if change is None:
+                continue
+            delta, undo = change
+            if delta > 0:
+                current = temperature * (1 - move / num_moves)
+                if current <= 0 or rng.random() >= math.exp(-delta / current):
+                    undo()
+                    continue
+            cost += delta
+            if cost < best_cost - 1e-9:
+                best_cost, best = cost, list(self.positions)
+        if best != self.positions:
+            for paper in range(num_papers):
+                if self.positions[paper] is not None:
+                    self.remove(paper)
+            for paper, position in enumerate(best):
+                if position is not None:
+                    self.place(paper, *position)
+
+
+def solve(grid=None, full=False, moves_per_talk=SCHEDULE_MOVES_PER_TALK):
+    """ Schedule accepted, confirmed papers in grid (SlotGrid.from_settings()
+        by default). Nothing is saved.
+
+        Unless full, saved placements that still fit are kept and only the
+        talks without one are inserted, after which a few moves that lower
+        the cost (moving a talk costs SCHEDULE_MOVE_PENALTY) are applied.
+        A full solve inserts all talks, most constrained (longest, most
+        authors) first, and anneals from there.
+    """
+    grid = grid or SlotGrid.from_settings()
+    paper_ids, lengths, authors, saved, time_cost, theme_cost = _problem(grid)
+    schedule = _Schedule(grid, lengths, authors, saved, time_cost, theme_cost,
+                         0 if full else SCHEDULE_MOVE_PENALTY)
+    if full:
+        schedule.saved = [None] * len(paper_ids)
+    else:
+        for paper, position in enumerate(saved):
+            if position is not None and schedule.fits(paper, *position):
+                schedule.place(paper, *position)
+    pending = sorted(
+        (paper for paper in range(len(paper_ids))
+         if schedule.positions[paper] is None),
+        key=lambda paper: (-lengths[paper], -len(authors[paper]), paper))
+    for paper in pending:
+        schedule.insert(paper)
+    if full:
+        schedule.anneal(moves_per_talk * len(paper_ids), _START_TEMPERATURE)
+    else:
+        schedule.anneal(moves_per_talk * max(len(pending), 1), 0)
+
+    placements, unscheduled, moved = {}, [], []
+    for paper, position in enumerate(schedule.positions):
+        if position is None:
+            unscheduled.append(paper_ids[paper])
+            continue
+        track, slot = position
+        placements[paper_ids[paper]] = (track, grid.start_of(slot))
+        if saved[paper] != position:
+            moved.append(paper_ids[paper])
+    return ScheduleResult(
+        placements, unscheduled, moved,
+        schedule.total_cost() - _UNSCHEDULED_PENALTY * len(unscheduled))
+
+
+def schedule_papers(grid=None, full=False):
+    """ solve() and save the tracks and times of the papers it placed
+        differently. Papers it had placed that are no longer scheduled (did
+        not fit, or are not accepted and confirmed any more) lose their
+        track and scheduled_at; times entered by hand (no track) are kept.
+    """
+    result = solve(grid, full)
+    papers = Paper.objects.in_bulk(result.moved)
+    for paper_id in result.moved:
+        papers[paper_id].track, papers[paper_id].scheduled_at = (
+            result.placements[paper_id])
+    with transaction.atomic():
+        # no signals are needed, nothing derived depends on the schedule
+        Paper.objects.bulk_update(
+            list(papers.values()), ['track', 'scheduled_at'], batch_size=500)
+        (Paper.objects
+            .filter(track__isnull=False)
+            .exclude(id__in=list(result.placements))
+            .update(track=None, scheduled_at=None))
+    return result
@@ -0,0 +1,55 @@
+from django.db.models import Count, Q
+
+from .models import Attendee, Paper, TimeZone
+
+
+def _value_counts(queryset, field):
+    """ Sorted (value, count) pairs for field, counted with one GROUP BY. """
+    return list(queryset
+        .filter(**{field + '__isnull': False})
+        .values_list(field)
+        .annotate(num_rows=Count('id'))
+        .order_by(field))
+
+
+def _timezone_value_counts(count_expr):
+    """ (utc_offset, count) for every timezone, zero-filled and sorted by
+        the precomputed offset, in one LEFT JOIN / GROUP BY query.
+    """
+    return list(TimeZone.objects
+        .annotate(num_rows=count_expr)
+        .order_by('utc_offset_minutes')
+        .values_list('utc_offset', 'num_rows'))
+
+
+def _registered_attendees():
+    return Attendee.objects.exclude(name__exact='')
+
+
+def papers_by_type():
+    return _value_counts(Paper.objects, 'paper_type__paper_type_name')
+
+
+def papers_by_org():
+    return _value_counts(Paper.objects, 'primary_author__org__org_name')
+
+
+def papers_by_theme():
+    return _value_counts(Paper.objects, 'themes__paper_theme')
+
+
+def papers_by_timezone():
+    return _timezone_value_counts(Count('timezone__primary_author'))
+
+
+def attendees_by_org():
+    return _value_counts(_registered_attendees(), 'org__org_name')
+
+
+def attendees_by_timezone():
+    return _timezone_value_counts(
+        Count('timezone', filter=~Q(timezone__name__exact='')))
+
+
+def sum_value_counts(value_counts):
+    return sum(c for _, c in value_counts)
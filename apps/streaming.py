@@ -0,0 +1,20 @@
+def iter_values_list(queryset, *fields, chunk_size=2000):
+    """ values_list(*fields) rows of queryset in primary key order.
+
+        Rows are fetched in keyset batches of chunk_size (WHERE pk > last
+        ORDER BY pk LIMIT chunk_size), each its own short query, so neither
+        the process nor the database holds more than one batch at a time
+        and no transaction stays open while the caller works on the rows.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        batch = queryset
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch.values_list('pk', *fields)[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
@@ -1,3 +1,1256 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import (
+    RequestFactory, TestCase, TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+
+from . import (
+    author_index, dashboard, duplicates, event_phase, exports, imports,
+    paper_detail, paper_scores, paper_search, reference_data, related_papers,
+    review_assignment, schedule, timeseries)
+from .forms import PaperForm
+from .pagination import paginate
+from .models import (
+    Attendee,
+    Event,
+    Organization,
+    Paper,
+    PaperSignature,
+    PaperSignatureBand,
+    PaperTheme,
+    PaperScoreSummary,
+    PaperType,
+    Review,
+    ReviewAssignment,
+    ReviewerProgress,
+    ReviewScore,
+    TimeZone,
+)
+from .review_tasks import get_review_tasks, group_review_tasks
+from .reviewer_reports import get_reviewer_report, score_histogram
+from .streaming import iter_values_list
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SherpaTestCase(TestCase):
+    """ Reference data loaded, with shared and in-process caches emptied
+        before each test.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('load_reference_data', verbosity=0)
+
+    def setUp(self):
+        self.clear_caches()
+
+    def clear_caches(self):
+        cache.clear()
+        author_index.invalidate()
+        event_phase.invalidate_current_event()
+        reference_data.invalidate()
+
+    def set_current_event(self, event_seq):
+        Event.objects.update(is_current=False)
+        Event.objects.filter(event_seq=event_seq).update(is_current=True)
+        event_phase.invalidate_current_event()
+
+    def make_attendee(self, email, **fields):
+        user = User.objects.create_user(email, email=email, password='pw')
+        attendee = user.attendee
+        attendee.name = fields.pop('name', 'Test ' + email.split('@')[0])
+        attendee.email = email
+        attendee.org = fields.pop('org', Organization.objects.first())
+        attendee.timezone = fields.pop('timezone', TimeZone.objects.first())
+        for field, value in fields.items():
+            setattr(attendee, field, value)
+        attendee.save()
+        return attendee
+
+    def make_paper(self, author, co_authors=(), themes=None, **fields):
+        fields.setdefault('title', 'Paper {:d}'.format(Paper.objects.count()))
+        fields.setdefault('abstract', 'An abstract about search.')
+        fields.setdefault('keywords', 'search')
+        paper = Paper.objects.create(
+            paper_type=PaperType.objects.first(), primary_author=author,
+            **fields)
+        paper.themes.set(themes or PaperTheme.objects.all()[:1])
+        paper.co_authors.set(co_authors)
+        return paper
+
+    def count_queries(self, fn):
+        self.clear_caches()
+        with CaptureQueriesContext(connection) as queries:
+            fn()
+        return len(queries)
+
+    def assertQueriesFlat(self, fn, grow):
+        """ fn runs as many queries after grow() added more rows. """
+        expected = self.count_queries(fn)
+        grow()
+        self.clear_caches()
+        with self.assertNumQueries(expected):
+            fn()
+
+
+class ReviewTaskQueryTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.reviewer = self.make_attendee(
+            'reviewer@example.com', is_reviewer=True)
+        self.author = self.make_attendee('author@example.com')
+        self.add_review_tasks(3)
+
+    def add_review_tasks(self, num_papers):
+        score = ReviewScore.objects.order_by('-review_score').first()
+        for i in range(num_papers):
+            paper = self.make_paper(self.author)
+            ReviewAssignment.objects.create(reviewer=self.reviewer, paper=paper)
+            if i % 2 == 0:
+                Review.objects.create(
+                    reviewer=self.reviewer, paper=paper, decision=score)
+
+    def test_get_review_tasks(self):
+        other = self.make_attendee('other@example.com', is_reviewer=True)
+        unassigned = self.make_paper(self.author)
+        ReviewAssignment.objects.create(reviewer=other, paper=unassigned)
+        # reviewed without being assigned
+        reviewed = self.make_paper(self.author)
+        Review.objects.create(reviewer=self.reviewer, paper=reviewed,
+                              decision=ReviewScore.objects.get(review_score=2))
+        self.clear_caches()
+        with self.assertNumQueries(1):
+            tasks = [(paper.title, paper.is_assigned, paper.is_reviewed,
+                      paper.star_rating, paper.paper_type.paper_type_name)
+                     for paper in get_review_tasks(self.reviewer)]
+        paper_type = PaperType.objects.first().paper_type_name
+        self.assertEqual(tasks, [
+            ('Paper 0', True, True, 4, paper_type),
+            ('Paper 1', True, False, 0, paper_type),
+            ('Paper 2', True, True, 4, paper_type),
+            ('Paper 4', False, True, 2, paper_type),
+        ])
+
+    def test_group_review_tasks_queries_do_not_grow(self):
+        def num_tasks():
+            return sum(len(tasks) for _, tasks in
+                       group_review_tasks(self.reviewer))
+
+        self.assertQueriesFlat(num_tasks, lambda: self.add_review_tasks(10))
+        self.assertEqual(num_tasks(), 13)
+
+    def test_dashboard_queries_do_not_grow(self):
+        self.set_current_event(20)
+        self.client.force_login(self.reviewer.user)
+
+        def get_dashboard():
+            response = self.client.get('/dashboard/')
+            self.assertEqual(response.status_code, 200)
+            return response
+
+        self.assertQueriesFlat(get_dashboard,
+                               lambda: self.add_review_tasks(10))
+        self.assertContains(get_dashboard(), '/review/', count=13)
+
+
+class ReviewerProgressTests(SherpaTestCase):
+
+    def test_moving_a_review_refreshes_both_reviewers(self):
+        first = self.make_attendee('first@example.com', is_reviewer=True)
+        second = self.make_attendee('second@example.com', is_reviewer=True)
+        paper = self.make_paper(self.make_attendee('author@example.com'))
+        Review.objects.create(reviewer=first, paper=paper,
+                              decision=ReviewScore.objects.first())
+
+        review = Review.objects.get(paper=paper)
+        review.reviewer = second
+        review.save()
+
+        progress = {row.reviewer_id: row.num_reviewed
+                    for row in ReviewerProgress.objects.all()}
+        self.assertEqual(progress, {first.id: 0, second.id: 1})
+
+        review.delete()
+        self.assertEqual(ReviewerProgress.objects.get(
+            reviewer=second).num_reviewed, 0)
+
+    def test_abstains_agree_with_paper_scores(self):
+        reviewer = self.make_attendee('reviewer@example.com', is_reviewer=True)
+        paper = self.make_paper(self.make_attendee('author@example.com'))
+        for decision in (None, ReviewScore.objects.get(review_score=0),
+                         ReviewScore.objects.get(review_score=3)):
+            Review.objects.create(reviewer=reviewer, paper=paper,
+                                  decision=decision)
+        self.assertEqual(ReviewerProgress.objects.get(
+            reviewer=reviewer).num_abstained, 2)
+        self.assertEqual(PaperScoreSummary.objects.get(
+            paper=paper).num_abstained, 2)
+
+
+class PaperScoreTests(SherpaTestCase):
+    """ The summaries kept up to date review by review match a rebuild. """
+
+    def setUp(self):
+        super().setUp()
+        author = self.make_attendee('author@example.com')
+        self.papers = [self.make_paper(author) for _ in range(2)]
+        self.reviewers = [
+            self.make_attendee('r{:d}@example.com'.format(i), is_reviewer=True)
+            for i in range(3)]
+        self.scores = {s.review_score: s for s in ReviewScore.objects.all()}
+        for reviewer, score in zip(self.reviewers, (1, 3, 4)):
+            Review.objects.create(reviewer=reviewer, paper=self.papers[0],
+                                  decision=self.scores[score])
+        Review.objects.create(reviewer=self.reviewers[0], paper=self.papers[1],
+                              decision=None)
+
+    def review(self, reviewer, paper):
+        return Review.objects.get(reviewer=reviewer, paper=paper)
+
+    def assertMatchesRebuild(self):
+        fields = ('paper_id', 'num_reviews', 'num_abstained', 'score_sum',
+                  'score_sum_squares', 'min_score', 'max_score')
+
+        def summaries():
+            return sorted(PaperScoreSummary.objects.values_list(*fields))
+
+        incremental = summaries()
+        paper_scores.rebuild_paper_scores()
+        self.assertEqual(incremental, summaries())
+        return {row[0]: row for row in incremental}
+
+    def test_create(self):
+        self.assertMatchesRebuild()
+        Review.objects.create(reviewer=self.reviewers[1], paper=self.papers[1],
+                              decision=self.scores[2])
+        summary = self.assertMatchesRebuild()[self.papers[1].id]
+        self.assertEqual(summary[1:], (2, 1, 2, 4, 2, 2))
+
+    def test_decision_change(self):
+        review = self.review(self.reviewers[2], self.papers[0])
+        review.decision = self.scores[0]
+        review.save()
+        summary = self.assertMatchesRebuild()[self.papers[0].id]
+        self.assertEqual(summary[1:], (3, 1, 4, 10, 1, 3))
+
+    def test_deferred_decision_change(self):
+        review = Review.objects.only('id').get(
+            reviewer=self.reviewers[0], paper=self.papers[0])
+        review.decision = self.scores[2]
+        review.save()
+        self.assertMatchesRebuild()
+
+    def test_move_to_another_paper(self):
+        review = self.review(self.reviewers[1], self.papers[0])
+        review.paper = self.papers[1]
+        review.save()
+        summaries = self.assertMatchesRebuild()
+        self.assertEqual(summaries[self.papers[0].id][1:], (2, 0, 5, 17, 1, 4))
+        self.assertEqual(summaries[self.papers[1].id][1:], (2, 1, 3, 9, 3, 3))
+
+    def test_delete_extremes(self):
+        self.review(self.reviewers[2], self.papers[0]).delete()
+        summary = self.assertMatchesRebuild()[self.papers[0].id]
+        self.assertEqual(summary[5:], (1, 3))
+        self.review(self.reviewers[0], self.papers[0]).delete()
+        summary = self.assertMatchesRebuild()[self.papers[0].id]
+        self.assertEqual(summary[5:], (3, 3))
+        self.review(self.reviewers[1], self.papers[0]).delete()
+        summary = self.assertMatchesRebuild()[self.papers[0].id]
+        self.assertEqual(summary[1:], (0, 0, 0, 0, None, None))
+
+    def test_delete_abstain(self):
+        self.review(self.reviewers[0], self.papers[1]).delete()
+        summary = self.assertMatchesRebuild()[self.papers[1].id]
+        self.assertEqual(summary[1:], (0, 0, 0, 0, None, None))
+
+
+class ReviewerReportTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        author = self.make_attendee('author@example.com')
+        self.reviewer = self.make_attendee('r1@example.com', is_reviewer=True)
+        other = self.make_attendee('r2@example.com', is_reviewer=True)
+        self.scores = {s.review_score: s for s in ReviewScore.objects.all()}
+        for reviewer, score in ((self.reviewer, 4), (self.reviewer, 2),
+                                (self.reviewer, 0), (other, 4)):
+            Review.objects.create(reviewer=reviewer,
+                                  paper=self.make_paper(author),
+                                  decision=self.scores[score])
+        ReviewAssignment.objects.create(reviewer=self.reviewer,
+                                        paper=self.make_paper(author))
+
+    def test_score_histogram(self):
+        self.assertEqual(score_histogram([0, 1, 1, 4, 3]),
+                         [(1, 2), (2, 0), (3, 1), (4, 1)])
+        self.assertEqual(score_histogram([]),
+                         [(1, 0), (2, 0), (3, 0), (4, 0)])
+        self.assertEqual(score_histogram([2, 5], nbins=2), [(1, 0), (2, 1)])
+
+    def test_reviewer_report(self):
+        report = get_reviewer_report(self.reviewer)
+        self.assertEqual([(paper.title, is_reviewed)
+                          for paper, is_reviewed, _ in report.papers_reviewed],
+                         [('Paper 0', True), ('Paper 1', True),
+                          ('Paper 2', True), ('Paper 4', False)])
+        self.assertEqual(report.num_reviewed, 3)
+        self.assertEqual(report.score_counts,
+                         [(1, 0), (2, 1), (3, 0), (4, 1)])
+        self.assertEqual(report.global_distribution, [(2, 25.0), (4, 50.0)])
+
+    def test_score_change_refreshes_global_distribution(self):
+        get_reviewer_report(self.reviewer)
+        strong_accept = self.scores[4]
+        strong_accept.review_score = 3
+        strong_accept.save()
+        self.assertEqual(get_reviewer_report(self.reviewer).global_distribution,
+                         [(2, 25.0), (3, 50.0)])
+
+
+class PaperAuthorTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee(
+            'ada.lovelace@example.com', name='Ada Lovelace')
+        self.client.force_login(self.author.user)
+
+    def paper_data(self, **fields):
+        data = {
+            'paper_type': PaperType.objects.first().id,
+            'title': 'Search at scale',
+            'abstract': 'An abstract about search.',
+            'themes': [PaperTheme.objects.first().id],
+            'keywords': 'search',
+            'primary_author': self.author.id,
+        }
+        data.update(fields)
+        return data
+
+    def test_primary_author_cannot_be_co_author(self):
+        form = PaperForm(self.paper_data(co_authors=[self.author.id]))
+        self.assertFalse(form.is_valid())
+        self.assertIn('co_authors', form.errors)
+
+        response = self.client.post(
+            '/paper/new', self.paper_data(co_authors=[self.author.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Paper.objects.exists())
+
+    def test_other_co_author_is_accepted(self):
+        co_author = self.make_attendee('grace@example.com', name='Grace Hopper')
+        form = PaperForm(self.paper_data(co_authors=[co_author.id]))
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_author_search_matches_names_not_emails(self):
+        def search(query):
+            response = self.client.get('/attendee/search', {'q': query})
+            return [row['id'] for row in response.json()['results']]
+
+        self.assertEqual(search('lovel'), [self.author.id])
+        self.assertEqual(search('ada.lovelace@'), [])
+        self.assertEqual(search('example.com'), [])
+
+
+class ListPageQueryTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizer = self.make_attendee(
+            'organizer@example.com', is_organizer=True)
+        self.client.force_login(self.organizer.user)
+        self.add_papers(2)
+
+    def add_papers(self, num_papers):
+        orgs = list(Organization.objects.all()[:3])
+        timezones = list(TimeZone.objects.all()[:3])
+        for _ in range(num_papers):
+            i = Paper.objects.count()
+            author = self.make_attendee(
+                'author{:d}@example.com'.format(i),
+                org=orgs[i % len(orgs)], timezone=timezones[i % len(timezones)])
+            co_author = self.make_attendee(
+                'coauthor{:d}@example.com'.format(i),
+                org=orgs[(i + 1) % len(orgs)])
+            self.make_paper(author, co_authors=[co_author],
+                            themes=PaperTheme.objects.all()[:2],
+                            is_accepted=(i % 2 == 0))
+
+    def assertPageQueriesFlat(self, url):
+        def get_page():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+        self.assertQueriesFlat(get_page, lambda: self.add_papers(2))
+
+    def test_attendee_list_queries_do_not_grow(self):
+        self.assertPageQueriesFlat('/attendees/')
+
+    def test_paper_list_queries_do_not_grow(self):
+        self.assertPageQueriesFlat('/papers/')
+
+    def test_accepted_paper_list_queries_do_not_grow(self):
+        self.assertPageQueriesFlat('/papers/accepted')
+
+    def test_organizer_dashboard_queries_do_not_grow(self):
+        self.set_current_event(20)
+        self.assertPageQueriesFlat('/dashboard/')
+
+
+class PaginationTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        author = self.make_attendee('author@example.com')
+        for _ in range(25):
+            self.make_paper(author)
+        self.papers = Paper.objects.all()
+        self.ids = list(self.papers.order_by('id').values_list('id', flat=True))
+
+    def get_page(self, **params):
+        request = RequestFactory().get('/papers/', params)
+        with CaptureQueriesContext(connection) as queries:
+            page = paginate(request, self.papers, 'id')
+        for query in queries:
+            self.assertNotIn('OFFSET', query['sql'].upper())
+        return page
+
+    def test_walks_forward_and_back_by_cursor(self):
+        page = self.get_page()
+        self.assertFalse(page.has_previous)
+        seen = []
+        while True:
+            seen.extend(paper.id for paper in page)
+            if not page.has_next:
+                break
+            page = self.get_page(after=page.next_query().split('=')[1])
+        self.assertEqual(seen, self.ids)
+
+        page = self.get_page(before=page.previous_query().split('=')[1])
+        self.assertEqual([paper.id for paper in page], self.ids[10:20])
+        self.assertTrue(page.has_previous)
+        self.assertTrue(page.has_next)
+
+    def test_last_page(self):
+        page = self.get_page(last=1)
+        self.assertEqual([paper.id for paper in page], self.ids[-10:])
+        self.assertTrue(page.has_previous)
+        self.assertFalse(page.has_next)
+
+    def test_cursor_past_the_end_gives_first_page(self):
+        page = self.get_page(after=self.ids[-1])
+        self.assertEqual([paper.id for paper in page], self.ids[:10])
+
+
+class CacheInvalidationTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com')
+        self.paper = self.make_paper(self.author, is_accepted=True)
+
+    def versions(self):
+        return (dashboard.get_version(self.author.id),
+                paper_detail.get_cached_body(self.paper.id)[0])
+
+    def test_sign_in_keeps_cached_fragments(self):
+        before = self.versions()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.client.login(
+                username='author@example.com', password='pw'))
+        self.assertEqual(self.versions(), before)
+        self.assertFalse([query for query in queries
+                          if 'apps_paper' in query['sql']])
+
+    def test_name_change_invalidates_fragments(self):
+        before = self.versions()
+        self.author.name = 'Renamed Author'
+        self.author.save(update_fields=['name'])
+        after = self.versions()
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+
+    def test_paper_change_invalidates_its_attendees_only(self):
+        co_author = self.make_attendee('co@example.com')
+        reviewer = self.make_attendee('reviewer@example.com', is_reviewer=True)
+        bystander = self.make_attendee('bystander@example.com')
+        self.paper.co_authors.add(co_author)
+        ReviewAssignment.objects.create(reviewer=reviewer, paper=self.paper)
+        attendees = [self.author, co_author, reviewer, bystander]
+
+        def versions():
+            return [dashboard.get_version(a.id) for a in attendees]
+
+        before = versions()
+        self.paper.title = 'Retitled'
+        self.paper.save()
+        after = versions()
+        self.assertEqual([b != a for b, a in zip(before, after)],
+                         [True, True, True, False])
+
+        self.paper.co_authors.remove(co_author)
+        self.assertNotEqual(dashboard.get_version(co_author.id), after[1])
+        self.assertEqual(dashboard.get_version(bystander.id), after[3])
+
+    def test_new_primary_author_and_previous_one_are_invalidated(self):
+        other = self.make_attendee('other@example.com')
+        before = [dashboard.get_version(a.id) for a in (self.author, other)]
+        paper = Paper.objects.get(id=self.paper.id)
+        paper.primary_author = other
+        paper.save()
+        after = [dashboard.get_version(a.id) for a in (self.author, other)]
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+
+
+
+class ExportTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com', name='Ann')
+        self.co_author = self.make_attendee('co@example.com', name='Bob')
+        self.reviewer = self.make_attendee('rev@example.com', name='Cy',
+                                           is_reviewer=True)
+        self.accepted = self.make_paper(
+            self.author, co_authors=[self.co_author], title='=1+1',
+            is_accepted=True)
+        self.rejected = self.make_paper(self.reviewer, title='Rejected')
+        self.score = ReviewScore.objects.get(review_score=3)
+        self.review = Review.objects.create(
+            reviewer=self.reviewer, paper=self.accepted, decision=self.score,
+            comments='-great')
+
+    def export(self, export_fn, phase, **kwargs):
+        header, rows = export_fn(phase, **kwargs)
+        return header, [dict(zip(header, row)) for row in rows]
+
+    def test_papers(self):
+        header, rows = self.export(exports.export_papers, 10)
+        self.assertNotIn('num_reviews', header)
+        self.assertNotIn('is_accepted', header)
+        self.assertEqual([row['title'] for row in rows], ['=1+1', 'Rejected'])
+        self.assertEqual(rows[0]['co_authors'], 'Bob')
+
+        header, rows = self.export(exports.export_papers, 30, accepted=True)
+        self.assertIn('is_accepted', header)
+        self.assertNotIn('scheduled_at', header)
+        self.assertEqual([(row['title'], row['num_reviews'], row['mean_score'])
+                          for row in rows], [('=1+1', 1, 3)])
+
+    def test_reviews(self):
+        header, rows = self.export(exports.export_reviews, 20)
+        self.assertEqual(header, [name for name, _, _ in
+                                  exports.REVIEW_COLUMNS])
+        self.assertEqual([(row['paper_id'], row['reviewer'],
+                           row['review_score']) for row in rows],
+                         [(self.accepted.id, 'Cy', 3)])
+        _, rows = self.export(exports.export_reviews, 20, accepted=False)
+        self.assertEqual(rows, [])
+
+    def test_attendees(self):
+        header, rows = self.export(exports.export_attendees, 20)
+        self.assertNotIn('is_speaker', header)
+        self.assertEqual([row['name'] for row in rows], ['Ann', 'Bob', 'Cy'])
+
+        header, rows = self.export(exports.export_attendees, 30, accepted=True)
+        self.assertIn('is_speaker', header)
+        self.assertEqual([row['name'] for row in rows], ['Ann', 'Bob'])
+
+    def test_csv_cells_are_not_formulas(self):
+        _, lines = exports.export('reviews', 'csv', 20)
+        text = ''.join(lines)
+        self.assertIn("'=1+1", text)
+        self.assertIn("'-great", text)
+        self.assertNotIn(',=1+1', text)
+        _, lines = exports.export('reviews', 'jsonl', 20)
+        self.assertEqual(json.loads(''.join(lines))['paper_title'], '=1+1')
+
+
+class LoadReferenceDataTests(SherpaTestCase):
+
+    def write_data(self, data):
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.json', delete=False) as f:
+            json.dump(data, f)
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def test_duplicate_keys_are_rejected(self):
+        path = self.write_data({
+            'version': 1,
+            'review_scores': [
+                {'review_decision': 'Accept', 'review_score': 5},
+                {'review_decision': 'Accept', 'review_score': 1},
+            ],
+        })
+        with self.assertRaisesMessage(CommandError, 'Accept'):
+            call_command('load_reference_data', path, verbosity=0)
+
+    def test_rerun_changes_nothing(self):
+        out = io.StringIO()
+        call_command('load_reference_data', stdout=out)
+        self.assertIn('0 reference rows changed', out.getvalue())
+
+
+class ImportTests(SherpaTestCase):
+
+    def attendee_line(self, email, **fields):
+        row = {'email': email, 'name': 'Imported ' + email.split('@')[0],
+               'org': Organization.objects.first().org_name,
+               'timezone': TimeZone.objects.first().utc_offset}
+        row.update(fields)
+        return json.dumps(row).encode('utf-8')
+
+    def import_attendees(self, lines):
+        return imports.import_attendees(
+            imports.read_rows(io.BytesIO(b'\n'.join(lines)), 'jsonl'),
+            batch_size=2)
+
+    def test_unreadable_lines_are_rejected(self):
+        result = self.import_attendees([
+            self.attendee_line('a@example.com'),
+            b'not json',
+            b'[1, 2]',
+            b'{"email": "\xff\xfe@example.com"}',
+            self.attendee_line('b@example.com'),
+        ])
+        self.assertEqual(result.num_created, 2)
+        self.assertEqual([line_num for line_num, _ in result.errors],
+                         [2, 3, 4])
+        self.assertIn('invalid JSON', result.errors[0][1])
+        self.assertIn('not a JSON object', result.errors[1][1])
+        self.assertIn('not UTF-8', result.errors[2][1])
+
+    def test_missing_timezone_is_rejected(self):
+        line = json.loads(self.attendee_line('c@example.com'))
+        del line['timezone']
+        result = self.import_attendees([
+            json.dumps(line).encode('utf-8'),
+            self.attendee_line('d@example.com', timezone=''),
+        ])
+        self.assertEqual(result.num_created, 0)
+        self.assertEqual(result.errors, [(1, 'timezone is required'),
+                                         (2, 'timezone is required')])
+
+    def test_unreadable_csv_line_is_rejected(self):
+        data = ('email,name,org,timezone\n'
+                'e@example.com,Imported E,{0},{1}\n').format(
+                    Organization.objects.first().org_name,
+                    TimeZone.objects.first().utc_offset).encode('utf-8')
+        result = imports.import_attendees(imports.read_rows(
+            io.BytesIO(data + b'\xff,x,y,z\n'), 'csv'))
+        self.assertEqual(result.num_created, 1)
+        self.assertEqual(result.errors, [(3, 'not UTF-8 text')])
+
+    def test_import_page_reports_bad_papers(self):
+        organizer = self.make_attendee(
+            'organizer@example.com', is_organizer=True)
+        self.client.force_login(organizer.user)
+        data_file = SimpleUploadedFile('papers.jsonl', b'\n'.join([
+            b'{"title": "No authors"}',
+            b'not json',
+            b'\xff',
+        ]))
+        response = self.client.post(
+            '/import/', {'kind': 'papers', 'data_file': data_file})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['import_result'].errors), 3)
+        self.assertFalse(Paper.objects.exists())
+
+
+class PaperAcceptanceTests(SherpaTestCase):
+
+    def test_applying_cutoffs_redirects(self):
+        organizer = self.make_attendee(
+            'organizer@example.com', is_organizer=True, is_reviewer=True)
+        paper = self.make_paper(self.make_attendee('author@example.com'))
+        Review.objects.create(
+            reviewer=organizer, paper=paper,
+            decision=ReviewScore.objects.order_by('-review_score').first())
+        self.client.force_login(organizer.user)
+
+        response = self.client.post('/papers/acceptance', {
+            'cutoff_{:d}'.format(paper.paper_type_id): '1.0'})
+        self.assertRedirects(response, '/papers/acceptance',
+                             fetch_redirect_response=False)
+        paper.refresh_from_db()
+        self.assertTrue(paper.is_accepted)
+        self.assertContains(self.client.get('/papers/acceptance'),
+                            '1 paper(s) changed.')
+
+
+class PaperSearchTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com')
+        other = self.make_attendee('other@example.com')
+        self.own = self.make_paper(self.author, title='Own search paper')
+        self.co_authored = self.make_paper(
+            other, co_authors=[self.author], title='Shared search paper')
+        self.accepted = self.make_paper(
+            other, title='Accepted search paper', is_accepted=True)
+        # newer and better matches the author cannot see
+        for i in range(5):
+            self.make_paper(other, title='Search search hidden {:d}'.format(i))
+        self.visible = {self.own.id, self.co_authored.id, self.accepted.id}
+
+    def test_limit_counts_visible_papers_only(self):
+        paper_ids = paper_search.search(
+            'search', limit=3, visible_to=self.author.id)
+        self.assertEqual(set(paper_ids), self.visible)
+        self.assertEqual(len(paper_search.search('search', limit=3)), 3)
+        self.assertEqual(len(paper_search.search('search')), 8)
+        self.assertEqual(set(paper_search.UnindexedSearchBackend().search(
+            None, ['search'], 3, self.author.id)), self.visible)
+
+    def test_search_page_shows_visible_papers(self):
+        self.client.force_login(self.author.user)
+        response = self.client.get('/papers/search', {'q': 'search'})
+        self.assertEqual(response.context['num_papers'], 3)
+        self.assertEqual({paper.id for paper in response.context['papers']},
+                         self.visible)
+        self.assertNotContains(response, 'hidden')
+
+
+class RelatedPaperTests(SherpaTestCase):
+
+    TOPICS = [
+        'learning rank gradient boosted trees clicks',
+        'query autocomplete prefix suggestions typing',
+        'vector embeddings nearest neighbor index',
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com')
+        self.themes = list(PaperTheme.objects.order_by('id')[:3])
+
+    def make_topic_paper(self, topic, extra='', **fields):
+        return self.make_paper(
+            self.author, themes=[self.themes[topic]], keywords='',
+            abstract='{:s} {:s}'.format(self.TOPICS[topic], extra), **fields)
+
+    def related(self):
+        return {paper_id: [pk for pk, _, _ in
+                           related_papers.get_related_papers(paper_id)]
+                for paper_id in Paper.objects.values_list('id', flat=True)}
+
+    def test_incremental_update_matches_full_update(self):
+        papers = [self.make_topic_paper(topic, extra)
+                  for topic in range(3) for extra in ('', 'offline study')]
+        related_papers.update_related_papers(full=True)
+
+        moved = papers[0]
+        moved.abstract = self.TOPICS[2]
+        moved.save()
+        moved.themes.set([self.themes[2]])
+        papers[3].delete()
+        self.make_topic_paper(1, 'mobile keyboards')
+        result = related_papers.update_related_papers()
+        self.assertEqual(result.num_vectors, 2)
+        incremental = self.related()
+
+        related_papers.update_related_papers(full=True)
+        self.assertEqual(incremental, self.related())
+        self.assertEqual(incremental[moved.id], [papers[4].id, papers[5].id])
+        self.assertEqual(related_papers.update_related_papers(),
+                         related_papers.UpdateResult(0, 0))
+
+    def test_similarities_match_dense_tf_idf(self):
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        num_papers, num_terms = 12, 20
+        counts = rng.integers(0, 3, size=(num_papers, num_terms))
+        counts[counts.sum(axis=1) == 0, 0] = 1
+        themes = rng.integers(0, 2, size=(num_papers, 4)).astype(float)
+        rows, terms = np.nonzero(counts)
+
+        # reference: dense TF-IDF cosine mixed with theme Jaccard
+        df = (counts > 0).sum(axis=0)
+        idf = np.log((1.0 + num_papers) / (1.0 + df)) + 1.0
+        tf_idf = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)),
+                          0) * idf
+        # terms in too many papers are dropped
+        tf_idf[:, df > max(related_papers.RELATED_PAPERS_MAX_DF * num_papers,
+                           related_papers._MIN_MAX_DF)] = 0
+        tf_idf /= np.linalg.norm(tf_idf, axis=1, keepdims=True)
+        shared = themes @ themes.T
+        union = themes.sum(axis=1)[:, None] + themes.sum(axis=1) - shared
+        jaccard = np.divide(shared, union, out=np.zeros_like(shared),
+                            where=union > 0)
+        weight = related_papers.RELATED_PAPERS_THEME_WEIGHT
+        expected = (1 - weight) * (tf_idf @ tf_idf.T) + weight * jaccard
+        np.fill_diagonal(expected, -np.inf)
+
+        # some terms in the dense block, the rest multiplied sparsely
+        with mock.patch.object(related_papers, '_DENSE_TERMS', 5):
+            matrix = related_papers.RelatednessMatrix(
+                list(range(num_papers)), np.bincount(rows),
+                terms.astype('<u4'), counts[rows, terms].astype('<u2'),
+                themes)
+        block = np.array([1, 5, 7])
+        np.testing.assert_allclose(matrix.similarities(block),
+                                   expected[block])
+
+    def test_paper_page_shows_visible_related_papers_only(self):
+        other = self.make_attendee('other@example.com')
+        paper = self.make_topic_paper(0, is_accepted=True)
+        own = self.make_topic_paper(0, 'own draft')
+        accepted = self.make_paper(
+            other, themes=[self.themes[0]], abstract=self.TOPICS[0],
+            title='Accepted elsewhere', is_accepted=True)
+        self.make_paper(other, themes=[self.themes[0]],
+                        abstract=self.TOPICS[0], title='Confidential')
+        related_papers.update_related_papers()
+
+        response = self.client.get('/paper/{:d}'.format(paper.id))
+        self.assertEqual([pk for pk, _ in response.context['related_papers']],
+                         [accepted.id])
+        self.client.force_login(self.author.user)
+        response = self.client.get('/paper/{:d}'.format(paper.id))
+        self.assertEqual(
+            sorted(pk for pk, _ in response.context['related_papers']),
+            sorted([own.id, accepted.id]))
+        self.assertNotContains(response, 'Confidential')
+
+
+class DuplicateWarningTests(SherpaTestCase):
+
+    ABSTRACT = ('We describe a learning to rank pipeline for legal search '
+                'that combines citation features with query logs and '
+                'evaluate it on two years of traffic.')
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com')
+        self.client.force_login(self.author.user)
+
+    def submit(self, title):
+        return self.client.post('/paper/new', {
+            'paper_type': PaperType.objects.first().id,
+            'title': title,
+            'abstract': self.ABSTRACT,
+            'themes': [PaperTheme.objects.first().id],
+            'keywords': 'ranking',
+            'primary_author': self.author.id,
+        }, follow=True)
+
+    def test_similar_papers_uses_band_buckets(self):
+        first = self.make_paper(self.author, abstract=self.ABSTRACT)
+        self.make_paper(self.author, abstract='Something else entirely.')
+        second = self.make_paper(self.author, abstract=self.ABSTRACT)
+        self.assertEqual(PaperSignatureBand.objects.filter(
+            paper=first).count(), duplicates.DUPLICATE_LSH_BANDS)
+        with self.assertNumQueries(1):
+            similar = duplicates.similar_papers(second)
+        self.assertEqual([pk for pk, _ in similar], [first.id])
+
+        self.assertEqual(duplicates.rebuild_signatures(), 3)
+        self.assertEqual(duplicates.similar_papers(second), similar)
+
+    def test_unchanged_text_is_not_signed_again(self):
+        paper = self.make_paper(self.author, abstract=self.ABSTRACT)
+        signature_id = PaperSignature.objects.get(paper=paper).id
+        paper.is_accepted = True
+        paper.save()
+        self.assertEqual(PaperSignature.objects.get(paper=paper).id,
+                         signature_id)
+
+        paper.abstract = 'Something else entirely.'
+        paper.save()
+        signature = PaperSignature.objects.get(paper=paper)
+        self.assertNotEqual(signature.id, signature_id)
+        self.assertEqual(signature.text_hash, duplicates.text_hash(
+            paper.title, paper.abstract))
+        self.assertEqual(PaperSignatureBand.objects.filter(
+            paper=paper).count(), duplicates.DUPLICATE_LSH_BANDS)
+
+    def test_archive_rows_may_lack_text(self):
+        store = duplicates.SignatureStore.from_rows([
+            {'title': 'Old paper'}, {'abstract': self.ABSTRACT},
+            {'title': None, 'abstract': None}])
+        self.assertEqual(store.labels, ['Old paper', '', ''])
+        self.assertEqual(store.signatures.shape,
+                         (3, duplicates.DUPLICATE_NUM_PERM))
+
+    def test_warns_about_own_papers(self):
+        self.make_paper(self.author, title='My first try',
+                        abstract=self.ABSTRACT)
+        response = self.submit('My second try')
+        self.assertContains(response, 'My first try')
+
+    def test_says_nothing_about_hidden_papers(self):
+        other = self.make_attendee('other@example.com')
+        self.make_paper(other, title='Confidential', abstract=self.ABSTRACT)
+        response = self.submit('My paper')
+        self.assertNotContains(response, 'Confidential')
+        self.assertNotContains(response, 'looks very similar')
+
+
+class ScheduleTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.grid = schedule.SlotGrid(
+            [datetime.date(2021, 10, 12), datetime.date(2021, 10, 13)],
+            datetime.time(13, 0), 3, 30, 2)
+        self.busy = self.make_attendee('busy@example.com')
+        self.papers = [
+            self.make_talk(self.busy),
+            self.make_talk(self.busy),
+            self.make_talk(self.make_attendee('co@example.com'),
+                           co_authors=[self.busy]),
+            self.make_talk(self.make_attendee('long1@example.com'),
+                           extra_long_paper=True),
+            self.make_talk(self.make_attendee('long2@example.com'),
+                           extra_long_paper=True),
+            self.make_talk(self.make_attendee('other@example.com')),
+        ]
+
+    def make_talk(self, author, **fields):
+        return self.make_paper(author, is_accepted=True,
+                               accept_speaker_invite=True, **fields)
+
+    def cells(self, placements):
+        # {paper id: [(track, slot)]} of the cells each talk occupies
+        extra_long = dict(Paper.objects.values_list('id', 'extra_long_paper'))
+        cells = {}
+        for paper_id, (track, start) in placements.items():
+            slot = self.grid.slot_of(start)
+            length = (schedule.SCHEDULE_EXTRA_LONG_SLOTS
+                      if extra_long[paper_id] else 1)
+            cells[paper_id] = [(track, s) for s in range(slot, slot + length)]
+        return cells
+
+    def test_hard_constraints(self):
+        result = schedule.solve(self.grid, full=True)
+        self.assertEqual(result.unscheduled, [])
+        cells = self.cells(result.placements)
+        taken = [cell for talk in cells.values() for cell in talk]
+        self.assertEqual(len(taken), len(set(taken)))
+
+        busy_slots = [slot for paper in self.papers[:3]
+                      for _, slot in cells[paper.id]]
+        self.assertEqual(len(busy_slots), len(set(busy_slots)))
+
+        for paper in self.papers[3:5]:
+            (track, first), (other_track, second) = cells[paper.id]
+            self.assertEqual(track, other_track)
+            self.assertEqual(second, first + 1)
+            self.assertEqual(first // self.grid.slots_per_day,
+                             second // self.grid.slots_per_day)
+
+    def test_rerun_keeps_saved_placements(self):
+        saved = schedule.schedule_papers(self.grid, full=True).placements
+        self.make_talk(self.make_attendee('late@example.com'))
+        result = schedule.schedule_papers(self.grid)
+        self.assertEqual(len(result.moved), 1)
+        self.assertEqual(
+            {pk: result.placements[pk] for pk in saved}, saved)
+        stored = Paper.objects.filter(id__in=saved).values_list(
+            'id', 'track', 'scheduled_at')
+        self.assertEqual({pk: (track, scheduled_at)
+                          for pk, track, scheduled_at in stored}, saved)
+
+    def test_withdrawn_talk_is_unscheduled(self):
+        schedule.schedule_papers(self.grid, full=True)
+        withdrawn = self.papers[0]
+        Paper.objects.filter(id=withdrawn.id).update(
+            accept_speaker_invite=False)
+        schedule.schedule_papers(self.grid)
+        withdrawn.refresh_from_db()
+        self.assertIsNone(withdrawn.track)
+        self.assertIsNone(withdrawn.scheduled_at)
+        self.assertIsNone(self.make_paper(self.busy).scheduled_at)
+
+    def test_hand_entered_times_are_kept(self):
+        start = datetime.datetime(2021, 10, 12, 9, 0,
+                                  tzinfo=datetime.timezone.utc)
+        keynote = self.make_paper(self.busy, is_accepted=True,
+                                  scheduled_at=start)
+        schedule.schedule_papers(self.grid, full=True)
+        keynote.refresh_from_db()
+        self.assertIsNone(keynote.track)
+        self.assertEqual(keynote.scheduled_at, start)
+
+
+class ReviewAssignmentTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        org_a, org_b, org_c, org_d = (
+            Organization.objects.create(org_name=name)
+            for name in ('Org A', 'Org B', 'Org C', 'Org D'))
+        self.author = self.make_attendee('author@example.com', org=org_a)
+        self.ra, self.rb, self.rc1, self.rc2, self.rd = (
+            self.make_attendee(name + '@example.com', org=org,
+                               is_reviewer=True)
+            for name, org in (('ra', org_a), ('rb', org_b), ('rc1', org_c),
+                              ('rc2', org_c), ('rd', org_d)))
+        self.p1 = self.make_paper(self.author, co_authors=[self.rb])
+        self.p2 = self.make_paper(self.rc1)
+        self.p3 = self.make_paper(self.author)
+        self.p4 = self.make_paper(self.author)
+
+    def reviewers(self, paper):
+        return set(ReviewAssignment.objects.filter(paper=paper)
+                   .values_list('reviewer_id', flat=True))
+
+    def assertConflictFree(self):
+        conflicts = {
+            self.p1: {self.ra, self.rb},
+            self.p2: {self.rc1, self.rc2},
+            self.p3: {self.ra},
+            self.p4: {self.ra},
+        }
+        for paper, reviewers in conflicts.items():
+            self.assertFalse(self.reviewers(paper) & {r.id for r in reviewers})
+
+    def test_assignments(self):
+        result = review_assignment.assign_reviewers(2)
+        self.assertConflictFree()
+        self.assertEqual(result.shortfall, {})
+        for paper in (self.p1, self.p2, self.p3, self.p4):
+            self.assertEqual(len(self.reviewers(paper)), 2)
+        self.assertEqual(result.capacity, 2)
+        self.assertLessEqual(max(result.loads.values()), result.capacity)
+
+    def test_exempt_organizations(self):
+        Paper.objects.exclude(pk=self.p2.pk).delete()
+        for exempt_orgs, expected in (([], set()), (['Org C'], {self.rc2.id})):
+            with mock.patch.object(review_assignment,
+                                   'REVIEW_CONFLICT_EXEMPT_ORGS', exempt_orgs):
+                result = review_assignment.solve(4)
+            self.assertEqual(
+                {r for r, p in result.pairs if r in (self.rc1.id, self.rc2.id)},
+                expected)
+
+    def test_rerun_only_tops_up(self):
+        review_assignment.assign_reviewers(2)
+        before = set(ReviewAssignment.objects.values_list(
+            'reviewer_id', 'paper_id'))
+        p5 = self.make_paper(self.author)
+        result = review_assignment.assign_reviewers(2)
+        self.assertEqual({p for _, p in result.pairs}, {p5.id})
+        after = set(ReviewAssignment.objects.values_list(
+            'reviewer_id', 'paper_id'))
+        self.assertEqual(after - before, set(result.pairs))
+        self.assertLessEqual(before, after)
+        self.assertEqual(review_assignment.solve(2).pairs, [])
+
+    def test_new_conflicts_are_dropped(self):
+        review_assignment.assign_reviewers(2)
+        reviewer_id = min(self.reviewers(self.p3))
+        self.p3.co_authors.add(reviewer_id)
+        result = review_assignment.assign_reviewers(2)
+        self.assertEqual(result.dropped, [(reviewer_id, self.p3.id)])
+        self.assertNotIn(reviewer_id, self.reviewers(self.p3))
+        self.assertEqual(len(self.reviewers(self.p3)), 2)
+        self.assertNotIn(self.p3, get_review_tasks(
+            self.p3.co_authors.get(pk=reviewer_id)))
+
+    def test_reviewed_conflicts_are_kept(self):
+        ReviewAssignment.objects.create(reviewer=self.rd, paper=self.p3)
+        Review.objects.create(reviewer=self.rd, paper=self.p3,
+                              decision=ReviewScore.objects.first())
+        self.p3.co_authors.add(self.rd)
+        self.assertEqual(review_assignment.solve(2).dropped, [])
+
+    def test_repair_moves_load_along_a_chain(self):
+        import numpy as np
+
+        # p0 can go to r0 or r1, p1 only to r0, p2 to r1 or r2
+        eligible = np.array([[1, 1, 0], [1, 0, 0], [0, 1, 1]], dtype=bool)
+        new = np.array([[1, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=bool)
+        load = new.sum(axis=0).astype(np.float64)
+        review_assignment._repair(new, eligible, load, 1)
+        self.assertEqual(new.tolist(), np.eye(3)[[1, 0, 2]].astype(bool)
+                         .tolist())
+        self.assertEqual(load.tolist(), [1, 1, 1])
+
+
+class ReportCommandTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.attendees = [
+            self.make_attendee('a{:d}@example.com'.format(i), name=name)
+            for i, name in enumerate(
+                ['Ann', 'Bob Smith', ' Cy ', 'Di', 'Ed Jones', 'Flo'])]
+
+    def test_keyset_batches_cover_every_row_once(self):
+        attendees = Attendee.objects.filter(
+            id__in=[a.id for a in self.attendees])
+        expected = sorted((a.id, a.name) for a in self.attendees)
+        for chunk_size, num_batches in ((2, 4), (4, 2), (6, 2), (10, 1)):
+            with self.assertNumQueries(num_batches):
+                rows = list(iter_values_list(
+                    attendees, 'id', 'name', chunk_size=chunk_size))
+            self.assertEqual(rows, expected)
+
+    def test_one_name_report(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('find_attendees_with_one_name', output='-',
+                     chunk_size=2, stdout=out, stderr=err)
+        self.assertEqual(out.getvalue().splitlines(), ['id|email|name'] + [
+            '{:d}|{:s}|{:s}'.format(a.id, a.email, a.name)
+            for a in self.attendees if len(a.name.split()) == 1])
+        self.assertIn('4 rows written to -', err.getvalue())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.tsv')
+            call_command('find_attendees_with_one_name', output=path,
+                         stdout=out, stderr=err)
+            with open(path) as f:
+                self.assertEqual(len(f.read().splitlines()), 5)
+
+
+class TimeSeriesTests(SherpaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_attendee('author@example.com',
+                                         is_organizer=True)
+        for day, hour in ((1, 9), (1, 15), (3, 12)):
+            self.make_paper(self.author, submitted_at=datetime.datetime(
+                2021, 4, day, hour, tzinfo=datetime.timezone.utc))
+
+    def test_counts_and_running_totals(self):
+        starts, counts, totals = timeseries.compute_series(
+            Paper.objects.all(), 'submitted_at', 'day')
+        self.assertEqual([start.day for start in starts], [1, 3])
+        self.assertEqual(counts, [2, 1])
+        self.assertEqual(totals, [2, 3])
+
+        _, counts, totals = timeseries.compute_series(
+            Paper.objects.all(), 'submitted_at', 'hour')
+        self.assertEqual(counts, [1, 1, 1])
+        self.assertEqual(totals, [1, 2, 3])
+
+    def test_endpoint_sees_new_submissions(self):
+        self.client.force_login(self.author.user)
+
+        def submission_totals():
+            response = self.client.get('/paper/timeseries')
+            return [row['total'] for row in response.json()['submissions']]
+
+        self.assertEqual(submission_totals(), [2, 3])
+        self.make_paper(self.author, submitted_at=datetime.datetime(
+            2021, 4, 3, 18, tzinfo=datetime.timezone.utc))
+        self.assertEqual(submission_totals(), [2, 4])
+
+
+class DataMigrationTests(TransactionTestCase):
+    """ Rows that exist before a migration are carried over or backfilled. """
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def migrate_to_latest(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def make_old_paper(self, old_apps, **fields):
+        OldUser = old_apps.get_model('auth', 'User')
+        OldAttendee = old_apps.get_model('apps', 'Attendee')
+        OldPaper = old_apps.get_model('apps', 'Paper')
+        OldPaperType = old_apps.get_model('apps', 'PaperType')
+        user, created = OldUser.objects.get_or_create(
+            username='author@example.com')
+        author = (OldAttendee.objects.create(user=user) if created
+                  else OldAttendee.objects.get(user=user))
+        paper_type, _ = OldPaperType.objects.get_or_create(
+            paper_type_name='Talk')
+        return OldPaper.objects.create(
+            paper_type=paper_type, primary_author=author, **fields)
+
+    def test_existing_times_survive(self):
+        # 0034 made scheduled_at nullable, times set before must survive
+        old_apps = self.migrate([('apps', '0033_papersignatureband')])
+        try:
+            start = datetime.datetime(2021, 10, 12, 15, 0,
+                                      tzinfo=datetime.timezone.utc)
+            paper = self.make_old_paper(
+                old_apps, title='Keynote', scheduled_at=start)
+        finally:
+            self.migrate_to_latest()
+        self.assertEqual(Paper.objects.get(id=paper.id).scheduled_at, start)
+
+    def test_reviewer_progress_is_backfilled(self):
+        old_apps = self.migrate([('apps', '0024_event_event_seq')])
+        try:
+            OldAttendee = old_apps.get_model('apps', 'Attendee')
+            OldReview = old_apps.get_model('apps', 'Review')
+            OldReviewScore = old_apps.get_model('apps', 'ReviewScore')
+            paper = self.make_old_paper(old_apps, title='Reviewed')
+            reviewer = paper.primary_author
+            for score in (None, 0, 2):
+                OldReview.objects.create(
+                    reviewer=reviewer, paper=paper,
+                    decision=None if score is None else
+                    OldReviewScore.objects.create(
+                        review_decision=str(score), review_score=score))
+            idle = OldAttendee.objects.create(
+                user=old_apps.get_model('auth', 'User').objects.create(
+                    username='idle@example.com'),
+                is_reviewer=True)
+        finally:
+            self.migrate_to_latest()
+        progress = dict(ReviewerProgress.objects.values_list(
+            'reviewer_id', 'num_reviewed'))
+        self.assertEqual(progress, {reviewer.id: 3, idle.id: 0})
+        self.assertEqual(ReviewerProgress.objects.get(
+            reviewer_id=reviewer.id).num_abstained, 2)
+
+    def test_paper_signatures_are_backfilled(self):
+        abstract = DuplicateWarningTests.ABSTRACT
+        old_apps = self.migrate([('apps', '0029_paper_search')])
+        try:
+            paper = self.make_old_paper(
+                old_apps, title='Submitted early', abstract=abstract)
+        finally:
+            self.migrate_to_latest()
+        signature = PaperSignature.objects.get(paper_id=paper.id)
+        self.assertEqual(signature.text_hash, duplicates.text_hash(
+            'Submitted early', abstract))
+        copy = Paper(id=0, title='Submitted late', abstract=abstract)
+        self.assertEqual([pk for pk, _ in duplicates.similar_papers(copy)],
+                         [paper.id])
+
+    def test_paper_scores_are_backfilled(self):
+        old_apps = self.migrate([('apps', '0027_reviewassignment')])
+        try:
+            OldReview = old_apps.get_model('apps', 'Review')
+            OldReviewScore = old_apps.get_model('apps', 'ReviewScore')
+            paper = self.make_old_paper(old_apps, title='Reviewed')
+            unreviewed = self.make_old_paper(old_apps, title='Unreviewed')
+            for score in (0, 2, 4):
+                OldReview.objects.create(
+                    reviewer=paper.primary_author, paper=paper,
+                    decision=OldReviewScore.objects.create(
+                        review_decision=str(score), review_score=score))
+        finally:
+            self.migrate_to_latest()
+        summaries = {row[0]: row[1:] for row in PaperScoreSummary.objects
+                     .values_list('paper_id', 'num_reviews', 'num_abstained',
+                                  'score_sum', 'min_score', 'max_score')}
+        self.assertEqual(summaries, {paper.id: (3, 1, 6, 2, 4),
+                                     unreviewed.id: (0, 0, 0, None, None)})
@@ -0,0 +1,91 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncHour
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Paper
+
+CFP_OPEN_DATE = getattr(settings, 'CFP_OPEN_DATE', datetime.date(2021, 4, 1))
+CFP_CLOSE_DATE = getattr(settings, 'CFP_CLOSE_DATE', datetime.date(2021, 5, 28))
+CFP_EXTN_DATE = getattr(settings, 'CFP_EXTN_DATE', datetime.date(2021, 6, 11))
+
+# Series are cached until the next submission / signup, the timeout only
+# bounds how long a missed invalidation (e.g. a bulk import) can linger.
+TIME_SERIES_CACHE_TIMEOUT = getattr(settings, 'TIME_SERIES_CACHE_TIMEOUT', 60 * 60)
+
+BUCKETS = {
+    'day': TruncDay,
+    'hour': TruncHour,
+}
+
+
+def _sources():
+    # series name -> (queryset, timestamp field)
+    return {
+        'submissions': (Paper.objects.all(), 'submitted_at'),
+        'signups': (User.objects.all(), 'date_joined'),
+    }
+
+
+def compute_series(queryset, field, bucket='day'):
+    """ (bucket starts, counts, running totals) of the rows of queryset by
+        their field timestamp, bucketed and counted in the database. Empty
+        buckets are left out.
+    """
+    import numpy as np
+
+    rows = list(queryset
+        .annotate(bucket_start=BUCKETS[bucket](field))
+        .values_list('bucket_start')
+        .annotate(num_rows=Count('id'))
+        .order_by('bucket_start'))
+    counts = np.fromiter((n for _, n in rows), dtype=np.int64, count=len(rows))
+    return ([start for start, _ in rows], counts.tolist(),
+            np.cumsum(counts).tolist())
+
+
+def _cache_key(name, bucket):
+    return 'timeseries:{:s}:{:s}'.format(name, bucket)
+
+
+def get_series(name, bucket='day'):
+    """ Cached compute_series() of the 'submissions' or 'signups' series. """
+    key = _cache_key(name, bucket)
+    series = cache.get(key)
+    if series is None:
+        queryset, field = _sources()[name]
+        series = compute_series(queryset, field, bucket)
+        cache.set(key, series, TIME_SERIES_CACHE_TIMEOUT)
+    return series
+
+
+def invalidate(name):
+    cache.delete_many([_cache_key(name, bucket) for bucket in BUCKETS])
+
+
+def cfp_dates():
+    return {
+        'open': CFP_OPEN_DATE,
+        'close': CFP_CLOSE_DATE,
+        'extension': CFP_EXTN_DATE,
+    }
+
+
+@receiver(post_save, sender=Paper)
+@receiver(post_delete, sender=Paper)
+def invalidate_submissions(sender, created=True, **kwargs):
+    # edits do not move submitted_at, only new and deleted papers count
+    if created:
+        invalidate('submissions')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_signups(sender, created=True, **kwargs):
+    if created:
+        invalidate('signups')
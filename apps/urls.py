@@ -10,19 +10,26 @@ from .views import (
     attendeeSpeakerUpdatePage,
     attendeeSpeakerViewPage,
     attendeeStatsPage,
+    attendeeSearchPage,
     paperCreatePage,
     paperRetrievePage,
     paperUpdatePage,
     paperDeletePage,
     paperListPage,
+    paperSearchPage,
+    paperDuplicatesPage,
     paperAcceptedPage,
     paperStatsPage,
     paperAcceptedListPage,
+    paperTimeSeriesPage,
+    paperAcceptancePage,
     reviewCreatePage,
     reviewUpdatePage,
     reviewRetrievePage,
     reviewerStats,
     reviewerDetail,
+    exportPage,
+    importPage,
     dashboardPage,
 )
 
@@ -37,15 +44,20 @@ urlpatterns = [
     path('attendee/speaker/update', attendeeSpeakerUpdatePage, name='speaker_update'),
     path('attendee/speaker/<int:pk>', attendeeSpeakerViewPage, name='speaker_view'),
     path('attendee/stats', attendeeStatsPage, name='attendee_stats'),
+    path('attendee/search', attendeeSearchPage, name='attendee_search'),
     # papers
     path('paper/new', paperCreatePage, name='paper_create'),
     path('paper/<int:pk>/update', paperUpdatePage, name='paper_update'),
     path('paper/<int:pk>/delete', paperDeletePage, name='paper_delete'),
     path('paper/<int:pk>', paperRetrievePage, name='paper_retrieve'),
     path('papers/', paperListPage, name='paper_list'),
+    path('papers/search', paperSearchPage, name='paper_search'),
+    path('papers/duplicates', paperDuplicatesPage, name='paper_duplicates'),
     path('paper/<int:pk>/accept', paperAcceptedPage, name='paper_accept'),
     path("paper/stats", paperStatsPage, name='paper_stats'),
     path('papers/accepted', paperAcceptedListPage, name='papers_accepted'),
+    path('paper/timeseries', paperTimeSeriesPage, name='paper_timeseries'),
+    path('papers/acceptance', paperAcceptancePage, name='paper_acceptance'),
     # reviews
     path('review/<int:pk>/new', reviewCreatePage, name='review_create'),
     path('review/<int:pk>/update', reviewUpdatePage, name='review_update'),
@@ -54,6 +66,9 @@ urlpatterns = [
     # reviewer
     path('reviewer/stats', reviewerStats, name='reviewer_stats'),
     path('reviewer/<int:pk>', reviewerDetail, name='reviewer_detail'),
+    # organizer exports / imports
+    path('export/<str:dataset>', exportPage, name='export'),
+    path('import/', importPage, name='import'),
     # dashboard
     path('dashboard/', dashboardPage, name='dashboard'),
 ]
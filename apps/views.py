@@ -1,37 +1,44 @@
-import collections
-import operator
-from plotly.offline import plot
-import plotly.graph_objs as go
+import functools
+import itertools
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.forms.models import model_to_dict
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.template.defaulttags import register
 
+from . import (
+    acceptance, charts, dashboard, duplicates, exports, imports,
+    paper_detail, paper_search, reference_data, related_papers,
+    review_assignment, stats, timeseries)
+from .event_phase import get_current_event_seq
+from .pagination import cached_count, paginate, paginate_list
+from .author_index import search_authors
 from .forms import (
     RegisterForm, 
     ProfileForm,
     SpeakerForm,
     PaperForm, 
     PaperAcceptedForm,
-    ReviewForm
+    ReviewForm,
+    ImportForm,
 )
 from .models import (
     Organization,
     TimeZone,
     Attendee, 
     PaperType,
-    PaperTheme,
     Paper, 
     ReviewScore,
     Review,
-    Event,
+    ReviewerProgress,
 )
+from .review_tasks import group_review_tasks
+from .reviewer_reports import get_reviewer_report
 
 
 def _is_speaker(attendee):
@@ -49,72 +56,6 @@ def _get_logged_in_user(request):
     return logged_in_user
 
 
-def _get_star_rating(paper, user):
-    review = Review.objects.filter(reviewer__exact=user,
-                                   paper__exact=paper.id).first()
-    star_rating = 0
-    if review is not None:
-        star_rating = review.decision.review_score
-    return star_rating
-
-
-def _convert_to_freq_table(values, keys=[], utc_sort=False):
-    freqs = {}
-    if len(keys) > 0:
-        freqs = {k:0 for k in keys}
-    for val in values:
-        if val in freqs.keys():
-            freqs[val] += 1
-        else:
-            freqs[val] = 1
-    if utc_sort:
-        value_counts = sorted(freqs.items(), key=lambda k: int(k[0].replace("UTC", "")))
-    else:
-        value_counts = sorted(freqs.items(), key=operator.itemgetter(0))
-    return value_counts
-
-
-def _sum_value_counts(value_counts):
-    return sum([c for v, c in value_counts])
-
-
-def _generate_pie_chart(value_counts, chart_title):
-    values = [vc[0] for vc in value_counts]
-    counts = [vc[1] for vc in value_counts]
-    fig = go.Figure()
-    pie = go.Pie(values=counts, labels=values,
-        hole=0.5, showlegend=True, name=chart_title)
-    fig.update_layout(autosize=False,
-        width=300, height=300,
-        margin=dict(l=50, r=50, b=50, t=50, pad=4))
-    fig.add_trace(pie)
-    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
-    return plt_div
-
-
-def _generate_bar_chart(value_counts, chart_title):
-    values = [vc[0] for vc in value_counts]
-    counts = [vc[1] for vc in value_counts]
-    fig = go.Figure()
-    bar = go.Bar(x=counts, y=values,
-        showlegend=False, name=chart_title,
-        orientation='h')
-    fig.update_layout(autosize=False,
-        width=300, height=600,
-        margin=dict(l=50, r=50, b=50, t=50, pad=4),
-        template='plotly_white')
-    fig.add_trace(bar)
-    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
-    return plt_div
-
-
-def _get_current_event():
-    return (Event.objects.filter(is_current=True)
-        .order_by('-event_seq')
-        .first()
-        .event_seq)
-
-
 # Create your views here.
 
 def indexPage(request):
@@ -192,16 +133,11 @@ def signOutPage(request):
 
 
 def attendeeListPage(request):
-    attendee_list = Attendee.objects.exclude(name__exact='').order_by('user__id')
-    num_attendees = attendee_list.count()
-    page = request.GET.get('page', 1)
-    paginator = Paginator(attendee_list, 10)
-    try:
-        attendees = paginator.page(page)
-    except PageNotAnInteger:
-        attendees = paginator.page(1)
-    except EmptyPage:
-        attendees = paginator.page(paginator.num_pages)
+    attendee_list = (Attendee.objects
+        .with_display_relations()
+        .exclude(name__exact=''))
+    num_attendees = cached_count(attendee_list, 'count:attendees')
+    attendees = paginate(request, attendee_list, 'user_id')
     context = { 
         "attendees" : attendees,
         "num_attendees": num_attendees,
@@ -270,17 +206,26 @@ def attendeeSpeakerViewPage(request, pk):
     return render(request, "apps/attendee_speakerbio_view.html", context)
 
 
+def attendeeSearchPage(request):
+    # autocomplete for the author pickers on the paper forms
+    if not request.user.is_authenticated:
+        return JsonResponse({"results": []}, status=403)
+    query = request.GET.get('q', '')
+    results = [{"id": pk, "text": label}
+               for pk, label in search_authors(query)]
+    return JsonResponse({"results": results})
+
+
 def attendeeStatsPage(request):
-    attendees_by_org = [a.org.org_name for a in Attendee.objects.exclude(name__exact='')]
-    attendees_by_org = _convert_to_freq_table(attendees_by_org)
-    attendees_by_org_total = _sum_value_counts(attendees_by_org)
-    attendees_by_org_pie = _generate_pie_chart(attendees_by_org, 'Attendees by Organization')
+    attendees_by_org = stats.attendees_by_org()
+    attendees_by_org_total = stats.sum_value_counts(attendees_by_org)
+
+    attendees_by_tz = stats.attendees_by_timezone()
+    attendees_by_tz_total = stats.sum_value_counts(attendees_by_tz)
 
-    attendees_by_tz = [a.timezone.utc_offset for a in Attendee.objects.exclude(name__exact='')]
-    all_tzs = [tz.utc_offset for tz in TimeZone.objects.all()]
-    attendees_by_tz = _convert_to_freq_table(attendees_by_tz, keys=all_tzs, utc_sort=True)
-    attendees_by_tz_total = _sum_value_counts(attendees_by_tz)
-    attendees_by_tz_bar = _generate_bar_chart(attendees_by_tz, 'Attendees by Timezone')
+    attendees_by_org_pie, attendees_by_tz_bar = charts.render_charts(
+        charts.pie_chart(attendees_by_org, 'Attendees by Organization'),
+        charts.bar_chart(attendees_by_tz, 'Attendees by Timezone'))
 
     context = {
         'attendees_by_org': attendees_by_org,
@@ -300,45 +245,96 @@ def paperCreatePage(request):
     if request.POST:
         form = PaperForm(request.POST)
         if form.is_valid():
-            form.save()
-        return redirect('dashboard')
+            paper = form.save()
+            _warn_about_duplicates(request, paper)
+            return redirect('dashboard')
     else:
         form = PaperForm(initial={
             'primary_author': request.user.attendee.id,
         })
-        form.fields['co_authors'].queryset = (Attendee.objects
-            .exclude(name__exact='')
-            .exclude(id=request.user.attendee.id))
-        context = {
-            'paper_form': form,
-            'logged_in_user': _get_logged_in_user(request)
-        }
-        return render(request, "apps/paper_create.html", context)
+    context = {
+        'paper_form': form,
+        'logged_in_user': _get_logged_in_user(request)
+    }
+    return render(request, "apps/paper_create.html", context)
 
 
-def paperRetrievePage(request, pk):
-    paper = get_object_or_404(Paper, pk=pk)
-    # if user is author or co-author, they should be able to access
-    # if user is organizer then they should be able to access
+def _can_view_paper(request, paper):
     # once paper is accepted, everyone should be able to access
-    if ((request.user.is_authenticated and (
-            request.user.attendee == paper.primary_author or 
-            request.user.attendee in paper.co_authors.all() or 
-            request.user.attendee.is_organizer)) or 
-            paper.is_accepted):
-        paper_coauthors = ", ".join([ca.name for ca in paper.co_authors.all()])
-        themes = PaperTheme.objects.filter(paper=paper)
-        paper.themes.set(themes)
-        context = {
-            "paper": paper,
-            'paper_themes': themes,
-            "paper_author": paper.primary_author.name,
-            "paper_coauthors": paper_coauthors,
-            "logged_in_user": _get_logged_in_user(request)
-        }
-        return render(request, 'apps/paper.html', context)
+    if paper.is_accepted:
+        return True
+    # if user is author, co-author or organizer, they should be able to access
+    if not request.user.is_authenticated:
+        return False
+    attendee = request.user.attendee
+    return (attendee.is_organizer or
+            attendee.id == paper.primary_author_id or
+            attendee in paper.co_authors.all())
+
+
+def _visible_paper_ids(request, paper_ids):
+    # the papers _can_view_paper() lets the signed-in user see
+    attendee = request.user.attendee
+    if attendee.is_organizer:
+        return set(paper_ids)
+    return set(Paper.objects
+        .filter(Q(is_accepted=True) |
+                Q(primary_author=attendee) |
+                Q(co_authors=attendee))
+        .filter(id__in=paper_ids)
+        .values_list('id', flat=True))
+
+
+def _visible_related_papers(request, paper_id):
+    # accepted papers are visible to anyone, the rest are checked
+    related = related_papers.get_related_papers(paper_id)
+    hidden = [pk for pk, _, is_accepted in related if not is_accepted]
+    if hidden and request.user.is_authenticated:
+        visible = _visible_paper_ids(request, hidden)
     else:
-        return redirect('dashboard')
+        visible = set()
+    return [(pk, title) for pk, title, is_accepted in related
+            if is_accepted or pk in visible
+            ][:related_papers.RELATED_PAPERS_SHOWN]
+
+
+def _warn_about_duplicates(request, paper):
+    # only papers the submitter can already see are mentioned, the others
+    # must not even be hinted at
+    similar = duplicates.similar_papers(paper)
+    if not similar:
+        return
+    titles = dict(Paper.objects
+        .filter(id__in=_visible_paper_ids(request, [pk for pk, _ in similar]))
+        .values_list('id', 'title'))
+    matches = ['"{:s}" ({:.0%} similar)'.format(titles[pk], similarity)
+               for pk, similarity in similar if pk in titles]
+    if not matches:
+        return
+    messages.warning(request, (
+        'Your submission looks very similar to {:s}. If it is the same '
+        'presentation submitted twice (for example as both Long Form and '
+        'Short Form), please delete one of them.').format(
+            ', '.join(matches)))
+
+
+def paperRetrievePage(request, pk):
+    # bodies are only cached for accepted papers, which anyone can see
+    version, paper_body = paper_detail.get_cached_body(pk)
+    if paper_body is None:
+        paper = get_object_or_404(
+            Paper.objects.with_display_relations(), pk=pk)
+        if not _can_view_paper(request, paper):
+            return redirect('dashboard')
+        paper_body = paper_detail.render_body(paper)
+        if paper.is_accepted:
+            paper_detail.cache_body(pk, version, paper_body)
+    context = {
+        "paper_body": paper_body,
+        "related_papers": _visible_related_papers(request, pk),
+        "logged_in_user": _get_logged_in_user(request)
+    }
+    return render(request, 'apps/paper.html', context)
 
 
 def paperUpdatePage(request, pk):
@@ -349,15 +345,15 @@ def paperUpdatePage(request, pk):
         form = PaperForm(request.POST, instance=paper)
         if form.is_valid():
             form.save()
-        return redirect('dashboard')
+            return redirect('dashboard')
     else:
         form = PaperForm(data=model_to_dict(paper))
-        context = {
-            "paper_id": paper.id,
-            "paper_form": form,
-            "logged_in_user": _get_logged_in_user(request)
-        }
-        return render(request, 'apps/paper_update.html', context)
+    context = {
+        "paper_id": paper.id,
+        "paper_form": form,
+        "logged_in_user": _get_logged_in_user(request)
+    }
+    return render(request, 'apps/paper_update.html', context)
 
 
 def paperDeletePage(request, pk):
@@ -376,24 +372,63 @@ def paperListPage(request):
         return redirect('sign_in')
     if not request.user.attendee.is_organizer:
         return redirect('dashboard')
-    paper_list = Paper.objects.all().order_by('id')
-    num_papers = paper_list.count()
-    page = request.GET.get('page', 1)
-    paginator = Paginator(paper_list, 10)
-    try:
-        papers = paginator.page(page)
-    except PageNotAnInteger:
-        papers = paginator.page(1)
-    except EmptyPage:
-        papers = paginator.page(paginator.num_pages)
+    paper_list = (Paper.objects
+        .with_display_relations()
+        .select_related('score_summary'))
+    num_papers = cached_count(paper_list, 'count:papers')
+    papers = paginate(request, paper_list, 'id')
     context = { 
         "papers" : papers,
         "num_papers": num_papers,
+        "reviews_per_paper": review_assignment.REVIEWS_PER_PAPER,
         "logged_in_user": _get_logged_in_user(request)
     }
     return render(request, 'apps/papers.html', context)
 
 
+def paperSearchPage(request):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    query = request.GET.get('q', '').strip()
+    attendee = request.user.attendee
+    # filtered in the search query, so the result limit counts visible papers
+    paper_ids = paper_search.search(
+        query, visible_to=None if attendee.is_organizer else attendee.id)
+    papers = paginate_list(request, paper_ids)
+    papers_by_id = (Paper.objects
+        .with_display_relations()
+        .in_bulk(papers.object_list))
+    papers.object_list = [papers_by_id[pk] for pk in papers.object_list]
+    context = {
+        "query": query,
+        "papers": papers,
+        "num_papers": len(paper_ids),
+        "more_papers": len(paper_ids) == paper_search.PAPER_SEARCH_MAX_RESULTS,
+        "logged_in_user": _get_logged_in_user(request)
+    }
+    return render(request, 'apps/paper_search.html', context)
+
+
+def paperDuplicatesPage(request):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    if not request.user.attendee.is_organizer:
+        return redirect('dashboard')
+    pairs = duplicates.find_duplicates(duplicates.SignatureStore.from_papers())
+    papers = (Paper.objects
+        .select_related('paper_type', 'primary_author')
+        .in_bulk({pk for pair in pairs for pk in (pair.first, pair.second)}))
+    context = {
+        "duplicates": [
+            (papers[pair.first], papers[pair.second],
+             round(100 * pair.similarity))
+            for pair in pairs],
+        "threshold": round(100 * duplicates.DUPLICATE_THRESHOLD),
+        "logged_in_user": _get_logged_in_user(request)
+    }
+    return render(request, 'apps/paper_duplicates.html', context)
+
+
 def paperAcceptedPage(request, pk):
     if not request.user.is_authenticated:
         return redirect('sign_in')
@@ -414,31 +449,24 @@ def paperAcceptedPage(request, pk):
 
 
 def paperStatsPage(request):
-    papers_by_type = [p.paper_type.paper_type_name 
-        for p in Paper.objects.all()]
-    papers_by_type = _convert_to_freq_table(papers_by_type)
-    papers_by_type_totals = _sum_value_counts(papers_by_type)
-    papers_by_type_pie = _generate_pie_chart(papers_by_type, 'Papers by Paper Type')
-
-    paper_author_orgs = [p.primary_author.org.org_name 
-        for p in Paper.objects.all()]
-    papers_by_org = _convert_to_freq_table(paper_author_orgs)
-    papers_by_org_totals = _sum_value_counts(papers_by_org)
-    papers_by_org_pie = _generate_pie_chart(papers_by_org, 'Papers by Organization')
-
-    papers_by_theme = []
-    for p in Paper.objects.all():
-        papers_by_theme.extend([theme.paper_theme for theme in p.themes.all()])
-    papers_by_theme = _convert_to_freq_table(papers_by_theme)
-    papers_by_theme_totals = _sum_value_counts(papers_by_theme)
-    papers_by_theme_pie = _generate_pie_chart(papers_by_theme, 'Papers by Theme')
-
-    paper_author_tzs = [p.primary_author.timezone.utc_offset 
-        for p in Paper.objects.all()]
-    all_tzs = [tz.utc_offset for tz in TimeZone.objects.all()]
-    papers_by_tz = _convert_to_freq_table(paper_author_tzs, keys=all_tzs, utc_sort=True)
-    papers_by_tz_totals = _sum_value_counts(papers_by_tz)
-    papers_by_tz_bar = _generate_bar_chart(papers_by_tz, 'Papers by Timezone')
+    papers_by_type = stats.papers_by_type()
+    papers_by_type_totals = stats.sum_value_counts(papers_by_type)
+
+    papers_by_org = stats.papers_by_org()
+    papers_by_org_totals = stats.sum_value_counts(papers_by_org)
+
+    papers_by_theme = stats.papers_by_theme()
+    papers_by_theme_totals = stats.sum_value_counts(papers_by_theme)
+
+    papers_by_tz = stats.papers_by_timezone()
+    papers_by_tz_totals = stats.sum_value_counts(papers_by_tz)
+
+    (papers_by_type_pie, papers_by_org_pie,
+     papers_by_theme_pie, papers_by_tz_bar) = charts.render_charts(
+        charts.pie_chart(papers_by_type, 'Papers by Paper Type'),
+        charts.pie_chart(papers_by_org, 'Papers by Organization'),
+        charts.pie_chart(papers_by_theme, 'Papers by Theme'),
+        charts.bar_chart(papers_by_tz, 'Papers by Timezone'))
 
     context = {
         'papers_by_type': papers_by_type,
@@ -454,29 +482,88 @@ def paperStatsPage(request):
         'papers_by_tz_totals': papers_by_tz_totals,
         'papers_by_tz_bar': papers_by_tz_bar,
         'logged_in_user': _get_logged_in_user(request),
-        'current_event': _get_current_event()
     }
     return render(request, 'apps/paper_stats.html', context)
 
 
+def _parse_cutoffs(post, candidate_cutoffs):
+    # cutoff_<paper type id> -> one of the candidate cutoffs, '' = no change
+    cutoffs_by_type = {}
+    for paper_type in reference_data.all_objects(PaperType):
+        try:
+            cutoff = float(post.get('cutoff_{:d}'.format(paper_type.id), ''))
+        except ValueError:
+            continue
+        if cutoff in candidate_cutoffs:
+            cutoffs_by_type[paper_type.id] = cutoff
+    return cutoffs_by_type
+
+
+def paperAcceptancePage(request):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    if not request.user.attendee.is_organizer:
+        return redirect('dashboard')
+    context = {'logged_in_user': _get_logged_in_user(request)}
+    cutoffs = acceptance.candidate_cutoffs()
+    if request.POST:
+        cutoffs_by_type = _parse_cutoffs(request.POST, cutoffs.tolist())
+        num_changed = len(acceptance.apply_cutoffs(cutoffs_by_type))
+        # redirect, so reloading the page does not apply the cutoffs again
+        messages.success(request, '{:d} paper(s) changed.'.format(num_changed))
+        return redirect('paper_acceptance')
+    papers = acceptance.ranked_papers()
+    counts = acceptance.preview(papers, cutoffs)
+    papers_by_type = {
+        type_id: list(group) for type_id, group in
+        itertools.groupby(papers, key=lambda p: p.paper_type_id)}
+    context['paper_types'] = [
+        {
+            'paper_type': paper_type,
+            'cutoff_counts': counts[paper_type.id],
+            'papers': papers_by_type.get(paper_type.id, []),
+            'num_accepted': sum(p.is_accepted for p in
+                                papers_by_type.get(paper_type.id, [])),
+        }
+        for paper_type in reference_data.all_objects(PaperType)
+    ]
+    return render(request, 'apps/paper_acceptance.html', context)
+
+
+def paperTimeSeriesPage(request):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    if not request.user.attendee.is_organizer:
+        return redirect('dashboard')
+    bucket = request.GET.get('bucket', 'day')
+    if bucket not in timeseries.BUCKETS:
+        raise Http404
+    data = {
+        'bucket': bucket,
+        'cfp': timeseries.cfp_dates(),
+    }
+    for name in ('submissions', 'signups'):
+        starts, counts, totals = timeseries.get_series(name, bucket)
+        data[name] = [{'start': start, 'count': count, 'total': total}
+                      for start, count, total in zip(starts, counts, totals)]
+    return JsonResponse(data)
+
+
 def paperAcceptedListPage(request):
     if not request.user.is_authenticated:
         return redirect('sign_in')
     if not request.user.attendee.is_organizer:
         return redirect('dashboard')
-    paper_list = Paper.objects.filter(is_accepted=True).order_by('id')
-    num_papers = paper_list.count()
-    page = request.GET.get('page', 1)
-    paginator = Paginator(paper_list, 10)
-    try:
-        papers = paginator.page(page)
-    except PageNotAnInteger:
-        papers = paginator.page(1)
-    except EmptyPage:
-        papers = paginator.page(paginator.num_pages)
+    paper_list = (Paper.objects
+        .with_display_relations()
+        .select_related('score_summary')
+        .filter(is_accepted=True))
+    num_papers = cached_count(paper_list, 'count:papers_accepted')
+    papers = paginate(request, paper_list, 'id')
     context = { 
         "papers" : papers,
         "num_papers": num_papers,
+        "reviews_per_paper": review_assignment.REVIEWS_PER_PAPER,
         "logged_in_user": _get_logged_in_user(request)
     }
     return render(request, 'apps/papers_accepted.html', context)
@@ -567,14 +654,18 @@ def reviewerStats(request):
         return redirect('sign_in')
     if not request.user.attendee.is_organizer:
         return redirect('dashboard')
-    reviewers = Attendee.objects.filter(is_reviewer=True).order_by('name')
-    num_papers = Paper.objects.all().count()
+    reviewers = (Attendee.objects
+        .filter(is_reviewer=True)
+        .select_related('user', 'org', 'review_progress')
+        .order_by('name'))
+    num_papers = Paper.objects.count()
     review_stats = []
     for reviewer in reviewers:
-        num_reviewed = Review.objects.filter(reviewer=reviewer).count()
-        print('reviewer counts:', reviewer, num_reviewed)
-        pct_reviewed = 100 * num_reviewed / num_papers
-        review_stats.append((reviewer, num_reviewed, pct_reviewed))
+        progress = getattr(reviewer, 'review_progress', None)
+        if progress is None:
+            progress = ReviewerProgress(reviewer=reviewer)
+        pct_reviewed = 100 * progress.num_reviewed / max(num_papers, 1)
+        review_stats.append((reviewer, progress, pct_reviewed))
     context = {
         "review_stats": review_stats,
         "logged_in_user": request.user.attendee
@@ -582,120 +673,98 @@ def reviewerStats(request):
     return render(request, 'apps/reviewer_stats.html', context)
 
 
-def _generate_histogram(raw_scores, all_scores,
-                        chart_title, paper_count, nbins=4):
-    value_counts = {}
-    for v in range(1, nbins+1):
-        value_counts[v] = len([s for s in raw_scores if s == v])
-    score_values = [v for v, _ in value_counts.items()]
-    score_counts = [(100 * c / paper_count) for _, c in value_counts.items()]
-    fig = go.Figure()
-    bar = go.Bar(x=score_values, y=score_counts,
-                 name=chart_title,
-                 orientation='v')
-    all_values = [v for v, _ in all_scores]
-    all_counts = [c for _, c in all_scores]
-    line = go.Scatter(x=all_values, y=all_counts,
-                      name="Overall Reviews")
-    fig.update_layout(autosize=False,
-                      width=600, height=300,
-                      margin=dict(l=50, r=50, b=50, t=50, pad=4),
-                      template='plotly_white')
-    fig.update_xaxes(type='category', title_text='rating')
-    fig.update_yaxes(title_text='percent count')
-    fig.add_trace(bar)
-    fig.add_trace(line)
-    plt_div = plot(fig, output_type='div', include_plotlyjs=False)
-    return plt_div
-
-
 def reviewerDetail(request, pk):
     if not request.user.is_authenticated:
         return redirect('sign_in')
     if not request.user.attendee.is_organizer:
         return redirect('dashboard')
-    # compute stats and list for reviewer
+    # compute stats and list for reviewer, against the (cached)
+    # distribution across the full set of reviews
     reviewer = get_object_or_404(Attendee, pk=pk)
-    all_papers = Paper.objects.all()
-    reviewed_papers = set([rp.paper.id for rp in
-                           Review.objects.filter(reviewer=reviewer)])
-    papers_reviewed_disp, scores = [], []
-    for paper in all_papers:
-        if paper.id in reviewed_papers:
-            star_rating = _get_star_rating(paper, reviewer)
-            papers_reviewed_disp.append((paper, True, range(star_rating)))
-            scores.append(star_rating)
-        else:
-            papers_reviewed_disp.append((paper, False, None))
-    papers_reviewed_disp = sorted(papers_reviewed_disp,
-                                  key=lambda x: x[0].title)
-    # compute stats across full set of reviews
-    num_reviews = Review.objects.count()
-    all_review_counts = (
-        Review.objects.all().exclude(decision__review_score=0)
-        .values("decision__review_score")
-        .annotate(Count("paper")))
-    norm_counts = []
-    for qs in all_review_counts:
-        norm_counts.append((
-            qs["decision__review_score"],
-            100 * qs["paper__count"] / num_reviews)
-        )
-    norm_counts = sorted(norm_counts, key=operator.itemgetter(0))
-    reviewer_hist = _generate_histogram(scores, norm_counts,
-                                        reviewer.name, len(reviewed_papers))
+    report = get_reviewer_report(reviewer)
+    reviewer_hist, = charts.render_charts(
+        charts.histogram(report.score_counts, report.global_distribution,
+                         reviewer.name, report.num_reviewed))
     context = {
         "reviewer_hist": reviewer_hist,
         "reviewer": reviewer,
-        "papers_reviewed": papers_reviewed_disp,
+        "papers_reviewed": report.papers_reviewed,
         "logged_in_user": request.user.attendee
     }
     return render(request, 'apps/reviewer.html', context)
 
 
+def exportPage(request, dataset):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    if not request.user.attendee.is_organizer:
+        return redirect('dashboard')
+    fmt = request.GET.get('format', 'csv')
+    if dataset not in exports.EXPORTS or fmt not in exports.FORMATS:
+        raise Http404
+    try:
+        phase = int(request.GET['phase'])
+    except (KeyError, ValueError):
+        phase = get_current_event_seq()
+    accepted = {'1': True, '0': False}.get(request.GET.get('accepted'))
+    content_type, content = exports.export(dataset, fmt, phase, accepted)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="{:s}.{:s}"'.format(
+        dataset, fmt)
+    return response
+
+
+def importPage(request):
+    if not request.user.is_authenticated:
+        return redirect('sign_in')
+    if not request.user.attendee.is_organizer:
+        return redirect('dashboard')
+    context = {'logged_in_user': _get_logged_in_user(request)}
+    if request.POST:
+        form = ImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            kind = form.cleaned_data['kind']
+            data_file = form.cleaned_data['data_file']
+            # read as bytes, so a line that is not UTF-8 is only one error
+            result = imports.IMPORTS[kind](
+                imports.read_rows(data_file, imports.format_of(data_file.name)))
+            context['kind'] = kind
+            context['import_result'] = result
+            form = ImportForm()
+    else:
+        form = ImportForm()
+    context['import_form'] = form
+    return render(request, 'apps/import.html', context)
+
+
 def dashboardPage(request):
     if not request.user.is_authenticated:
         return redirect('sign_in')
-    context = {}
-    logged_in_user = request.user.attendee
-    context['logged_in_user'] = _get_logged_in_user(request)
-    context["current_event"] = _get_current_event()
-    # my papers
+    # org is needed for the heading, which is not cached
+    logged_in_user = (Attendee.objects
+        .select_related('org')
+        .get(user=request.user))
+    # querysets are left lazy, so that they are only evaluated when the
+    # cached dashboard fragments need to be re-rendered
     my_papers = (
         Paper.objects.
+        with_display_relations().
         filter(primary_author__exact=logged_in_user.id).
         order_by('title')
     )
-    if len(my_papers) > 0:
-        context['has_submitted_papers'] = True
-        context['my_submitted_papers'] = my_papers
-        # check if user has accepted papers
-        has_accepted_papers = len([paper for paper in my_papers
-                                   if paper.is_accepted]) > 0
-        context["has_accepted_papers"] = has_accepted_papers
+
+    def has_accepted_papers():
+        return any(paper.is_accepted for paper in my_papers)
+
+    context = {
+        'logged_in_user': logged_in_user,
+        'my_submitted_papers': my_papers,
+        'has_accepted_papers': has_accepted_papers,
+        'dashboard_version': dashboard.get_version(logged_in_user.id),
+        'dashboard_cache_timeout': dashboard.DASHBOARD_CACHE_TIMEOUT,
+    }
     # my review tasks
     if logged_in_user.is_reviewer:
-        my_review_task_dict = collections.defaultdict(list)
-        all_papers = Paper.objects.all()
-        my_reviews = Review.objects.filter(reviewer__exact=logged_in_user.id)
-        reviewed_papers = set([r.paper.id for r in my_reviews])
-        for paper in all_papers:
-            paper_type = paper.paper_type.paper_type_name
-            if paper.id in reviewed_papers:
-                star_rating = _get_star_rating(paper, logged_in_user)
-                my_review_task_dict[paper_type].append(
-                    (paper, True, range(star_rating)))
-            else:
-                my_review_task_dict[paper_type].append((paper, False, None))
-        my_review_paper_types = sorted(list(my_review_task_dict.keys()))
-        my_review_tasks = []
-        for paper_type in my_review_paper_types:
-            my_review_tasks.append((
-                paper_type, 
-                sorted(my_review_task_dict[paper_type],
-                       key=lambda x: x[0].title)))
-        context['my_review_tasks'] = my_review_tasks
-
-    # full list of papers
+        context['my_review_tasks'] = functools.partial(
+            group_review_tasks, logged_in_user)
     return render(request, 'apps/dashboard.html', context)
-
@@ -0,0 +1,57 @@
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from . import reference_data
+
+logger = logging.getLogger(__name__)
+
+
+def _template_names():
+    for template_dir in settings.TEMPLATES[0].get('DIRS', []):
+        for root, _, filenames in os.walk(template_dir):
+            for filename in filenames:
+                if filename.endswith(('.html', '.txt')):
+                    yield os.path.relpath(
+                        os.path.join(root, filename), template_dir)
+
+
+def _preload_templates():
+    num_templates = 0
+    for template_name in _template_names():
+        get_template(template_name)
+        num_templates += 1
+    return num_templates
+
+
+def _preload_url_resolvers():
+    resolver = get_resolver()
+    # building the reverse lookup tables populates the whole tree
+    return len(resolver.reverse_dict)
+
+
+def warm_up():
+    """ Preload data that every worker needs, before gunicorn forks.
+
+        Runs in the gunicorn master when the app is loaded with --preload
+        and SHERPA_WARM_UP is set (see sherpa/wsgi.py). Forked workers then
+        share these pages with the master through copy-on-write instead of
+        each building its own copy on its first requests.
+
+        Template loading only persists when the cached template loader is
+        in use, which is the default whenever DEBUG is off.
+    """
+    start = time.time()
+    num_templates = _preload_templates()
+    num_url_names = _preload_url_resolvers()
+    reference_tables = reference_data.load()
+    # never hand a database connection opened here over to the workers
+    connections.close_all()
+    logger.info("warm-up: %d templates, %d url names, %d reference tables "
+                "in %.3fs", num_templates, num_url_names,
+                len(reference_tables), time.time() - start)
@@ -37,7 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'apps'
+    'apps.apps.AppsConfig'
 ]
 
 MIDDLEWARE = [
@@ -64,6 +64,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.event_phase.current_event',
             ],
         },
     },
@@ -83,6 +84,16 @@ DATABASES = {
     }
 }
 
+# Cache shared by all gunicorn workers, so that invalidating a cached
+# report in one worker is seen by the others
+# https://docs.djangoproject.com/en/3.1/topics/cache/#filesystem-caching
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/home/ubuntu/sherpa/cache',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,73 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_acceptance.py").read())
+#
+# Times ranking, cutoff preview and applying cutoffs (apps/acceptance.py)
+# over NUM_PAPERS papers with NUM_REVIEWS reviews. Everything runs against
+# a throwaway test database, the configured database is not touched.
+
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_ATTENDEES = 2000
+NUM_PAPERS = 5000
+NUM_REVIEWS = 30000
+
+
+def _populate():
+    from apps.models import (
+        Attendee, Organization, Paper, PaperType, Review, ReviewScore,
+        TimeZone)
+    org = Organization.objects.first()
+    tz = TimeZone.objects.first()
+    paper_types = list(PaperType.objects.all())
+    scores = list(ReviewScore.objects.all())
+    User.objects.bulk_create([
+        User(username="user{:d}@example.com".format(i))
+        for i in range(NUM_ATTENDEES)], batch_size=1000)
+    Attendee.objects.bulk_create([
+        Attendee(user_id=user_id, name="Attendee {:d}".format(user_id),
+                 email="user{:d}@example.com".format(user_id),
+                 org=org, timezone=tz)
+        for user_id in User.objects.values_list('id', flat=True)],
+        batch_size=1000)
+    attendee_ids = list(Attendee.objects.values_list('id', flat=True))
+    Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types),
+              title="Paper {:d}".format(i), abstract="abstract",
+              keywords="keywords",
+              primary_author_id=random.choice(attendee_ids))
+        for i in range(NUM_PAPERS)], batch_size=1000)
+    paper_ids = list(Paper.objects.values_list('id', flat=True))
+    Review.objects.bulk_create([
+        Review(reviewer_id=random.choice(attendee_ids),
+               paper_id=random.choice(paper_ids),
+               decision=random.choice(scores))
+        for _ in range(NUM_REVIEWS)], batch_size=1000)
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:20s} {:8.3f} s".format(label, time.time() - start))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import acceptance, reference_data
+    from apps.models import PaperType
+    call_command('load_reference_data', verbosity=0)
+    _populate()
+    print("{:d} papers, {:d} reviews".format(NUM_PAPERS, NUM_REVIEWS))
+    papers = _timed("rank papers", acceptance.ranked_papers)
+    cutoffs = acceptance.candidate_cutoffs()
+    _timed("preview cutoffs", lambda: acceptance.preview(papers, cutoffs))
+    changed = _timed("apply cutoffs", lambda: acceptance.apply_cutoffs(
+        {pt.id: 3.0 for pt in reference_data.all_objects(PaperType)}))
+    print("{:d} papers changed".format(len(changed)))
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
@@ -0,0 +1,82 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_assignment.py").read())
+#
+# Times the reviewer assignment solver (apps/review_assignment.py) for
+# NUM_PAPERS papers and NUM_REVIEWERS reviewers. Everything runs against
+# a throwaway test database, the configured database is not touched.
+
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_ATTENDEES = 3000
+NUM_REVIEWERS = 500
+NUM_PAPERS = 5000
+REVIEWS_PER_PAPER = 3
+
+
+def _populate():
+    from apps.models import (
+        Attendee, Organization, Paper, PaperTheme, PaperType, TimeZone)
+    orgs = list(Organization.objects.all())
+    tz = TimeZone.objects.first()
+    paper_types = list(PaperType.objects.all())
+    theme_ids = list(PaperTheme.objects.values_list('id', flat=True))
+    User.objects.bulk_create([
+        User(username="user{:d}@example.com".format(i))
+        for i in range(NUM_ATTENDEES)], batch_size=1000)
+    Attendee.objects.bulk_create([
+        Attendee(user_id=user_id, name="Attendee {:d}".format(user_id),
+                 email="user{:d}@example.com".format(user_id),
+                 org=random.choice(orgs), timezone=tz,
+                 is_reviewer=i < NUM_REVIEWERS)
+        for i, user_id in enumerate(
+            User.objects.values_list('id', flat=True))],
+        batch_size=1000)
+    attendee_ids = list(Attendee.objects.values_list('id', flat=True))
+    Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types),
+              title="Paper {:d}".format(i), abstract="abstract",
+              keywords="keywords",
+              primary_author_id=random.choice(attendee_ids))
+        for i in range(NUM_PAPERS)], batch_size=1000)
+    paper_ids = list(Paper.objects.values_list('id', flat=True))
+    Paper.themes.through.objects.bulk_create([
+        Paper.themes.through(paper_id=paper_id, papertheme_id=theme_id)
+        for paper_id in paper_ids
+        for theme_id in random.sample(theme_ids, 2)], batch_size=1000)
+    Paper.co_authors.through.objects.bulk_create([
+        Paper.co_authors.through(paper_id=paper_id, attendee_id=author_id)
+        for paper_id in paper_ids
+        for author_id in random.sample(attendee_ids, random.randint(0, 3))],
+        batch_size=1000)
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:20s} {:8.3f} s".format(label, time.time() - start))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import review_assignment
+    call_command('load_reference_data', verbosity=0)
+    _populate()
+    print("{:d} papers, {:d} reviewers, {:d} reviews per paper".format(
+        NUM_PAPERS, NUM_REVIEWERS, REVIEWS_PER_PAPER))
+    _timed("build problem", review_assignment._problem)
+    result = _timed("solve", lambda: review_assignment.solve(
+        REVIEWS_PER_PAPER))
+    _timed("solve and save", lambda: review_assignment.assign_reviewers(
+        REVIEWS_PER_PAPER))
+    loads = sorted(result.loads.values())
+    print("{:d} assignments, {:d} papers short, load {:d}-{:d} "
+          "(capacity {:d})".format(len(result.pairs), len(result.shortfall),
+                                   loads[0], loads[-1], result.capacity))
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
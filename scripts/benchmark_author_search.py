@@ -0,0 +1,59 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_author_search.py").read())
+#
+# Builds the author autocomplete index over synthetic attendees (no
+# database access) and checks search latency against LATENCY_TARGET_MS.
+
+import random
+import string
+import time
+
+from apps.author_index import AuthorIndex
+
+NUM_ATTENDEES = 50000
+NUM_QUERIES = 2000
+LATENCY_TARGET_MS = 10.0     # 95th percentile per search
+
+
+def _random_word(min_len=3, max_len=10):
+    length = random.randint(min_len, max_len)
+    return random.choice(string.ascii_uppercase) + "".join(
+        random.choice(string.ascii_lowercase) for _ in range(length - 1))
+
+
+def _random_query(rows):
+    _, name, _ = random.choice(rows)
+    start = random.randint(0, max(len(name) - 2, 0))
+    return name[start:start + random.randint(1, 8)]
+
+
+random.seed(42)
+rows = []
+for i in range(NUM_ATTENDEES):
+    name = "{:s} {:s}".format(_random_word(), _random_word())
+    rows.append((i + 1, name, "{:s} (Elsevier)".format(name)))
+
+index = AuthorIndex()
+start = time.time()
+index.load(rows)
+print("indexed {:d} attendees in {:.3f}s".format(len(index), time.time() - start))
+
+latencies = []
+for _ in range(NUM_QUERIES):
+    query = _random_query(rows)
+    start = time.perf_counter()
+    index.search(query)
+    latencies.append(1000 * (time.perf_counter() - start))
+latencies.sort()
+p50 = latencies[len(latencies) // 2]
+p95 = latencies[int(len(latencies) * 0.95)]
+print("search over {:d} queries: p50 {:.2f} ms, p95 {:.2f} ms, max {:.2f} ms".format(
+    NUM_QUERIES, p50, p95, latencies[-1]))
+print("target p95 < {:.1f} ms: {:s}".format(
+    LATENCY_TARGET_MS, "OK" if p95 < LATENCY_TARGET_MS else "MISSED"))
+
+start = time.perf_counter()
+for pk, name, label in rows[:1000]:
+    index.update(pk, name + " Jr", label)
+print("incremental update: {:.3f} ms per attendee".format(
+    (time.perf_counter() - start)))
@@ -0,0 +1,58 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_duplicates.py").read())
+#
+# Times MinHash signing and LSH duplicate search (apps/duplicates.py) for
+# NUM_SUBMISSIONS generated submissions against an archive of
+# NUM_ARCHIVED papers from previous summits, with NUM_DUPLICATES edited
+# copies planted among the submissions. Nothing is read from or written to
+# the database.
+
+import random
+import time
+
+from apps import duplicates
+
+NUM_SUBMISSIONS = 5000
+NUM_ARCHIVED = 50000
+NUM_DUPLICATES = 200
+WORDS_PER_ABSTRACT = 150
+VOCABULARY_SIZE = 20000
+
+random.seed(42)
+VOCABULARY = ["w{:d}".format(i) for i in range(VOCABULARY_SIZE)]
+
+
+def _paper(i):
+    return {"title": "Paper {:d}".format(i),
+            "abstract": " ".join(random.choices(VOCABULARY,
+                                                k=WORDS_PER_ABSTRACT))}
+
+
+def _edited(paper):
+    # resubmission with a few words changed
+    words = paper["abstract"].split()
+    for k in random.sample(range(len(words)), 5):
+        words[k] = random.choice(VOCABULARY)
+    return {"title": paper["title"] + " (short)", "abstract": " ".join(words)}
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:28s} {:8.3f} s".format(label, time.time() - start))
+    return result
+
+
+archived = [_paper(i) for i in range(NUM_ARCHIVED)]
+submissions = [_paper(NUM_ARCHIVED + i)
+               for i in range(NUM_SUBMISSIONS - NUM_DUPLICATES)]
+submissions += [_edited(paper) for paper in random.sample(
+    submissions + archived, NUM_DUPLICATES)]
+store = _timed("sign submissions", lambda: duplicates.SignatureStore.from_rows(
+    submissions))
+archive = _timed("sign archive", lambda: duplicates.SignatureStore.from_rows(
+    archived))
+pairs = _timed("find duplicates", lambda: duplicates.find_duplicates(
+    store, archive))
+print("{:d} submissions x {:d} archived: {:d} pairs found, {:d} planted".format(
+    NUM_SUBMISSIONS, NUM_ARCHIVED, len(pairs), NUM_DUPLICATES))
@@ -0,0 +1,106 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_exports.py").read())
+#
+# Streams the paper and attendee exports (apps/exports.py) at growing row
+# counts and reports time to first chunk, total time and peak Python heap
+# (tracemalloc) and resident set size growth while consuming them. Both
+# should stay flat as rows grow. RSS growth is the VmHWM peak (reset before
+# each export) over the RSS at its start, so it is only reported on Linux.
+# Everything runs against a throwaway test database, the configured
+# database is not touched.
+
+import random
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+ROW_COUNTS = [10000, 50000, 100000]
+
+
+def _populate(num_attendees, num_papers):
+    from apps.models import (
+        Attendee, Organization, Paper, PaperTheme, PaperType, TimeZone)
+    orgs = list(Organization.objects.all())
+    tzs = list(TimeZone.objects.all())
+    paper_types = list(PaperType.objects.all())
+    themes = list(PaperTheme.objects.all())
+    num_users = User.objects.count()
+    User.objects.bulk_create([
+        User(username="user{:d}@example.com".format(i))
+        for i in range(num_users, num_attendees)], batch_size=1000)
+    Attendee.objects.bulk_create([
+        Attendee(user_id=user_id,
+                 name="First{:d} Last{:d}".format(user_id, user_id),
+                 email="user{:d}@example.com".format(user_id),
+                 org=random.choice(orgs), timezone=random.choice(tzs))
+        for user_id in (User.objects
+            .filter(attendee__isnull=True)
+            .values_list('id', flat=True))],
+        batch_size=1000)
+    attendee_ids = list(Attendee.objects.values_list('id', flat=True))
+    num_existing = Paper.objects.count()
+    Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types),
+              title="Paper {:d}".format(i), abstract="abstract " * 100,
+              keywords="keywords",
+              primary_author_id=random.choice(attendee_ids))
+        for i in range(num_existing, num_papers)], batch_size=1000)
+    new_paper_ids = (Paper.objects
+        .filter(themes__isnull=True)
+        .values_list('id', flat=True))
+    Paper.themes.through.objects.bulk_create([
+        Paper.themes.through(paper_id=paper_id, papertheme_id=theme.id)
+        for paper_id in new_paper_ids
+        for theme in random.sample(themes, 2)], batch_size=1000)
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _rss(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+
+def _run(dataset, num_rows):
+    from apps import exports
+    has_rss = _reset_peak_rss()
+    start_rss = _rss("VmRSS") if has_rss else None
+    tracemalloc.start()
+    start = time.time()
+    _, content = exports.export(dataset, 'csv', phase=30)
+    num_bytes = len(next(content))
+    first_chunk = time.time() - start
+    for chunk in content:
+        num_bytes += len(chunk)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = ("{:6.1f} MB".format(_rss("VmHWM") - start_rss)
+                  if has_rss else "n/a")
+    print("{:10s} {:8d} rows {:8.1f} MB {:8.3f} s first chunk {:8.3f} s "
+          "total {:8.2f} MB peak heap {:s} RSS growth".format(
+              dataset, num_rows, num_bytes / 2 ** 20, first_chunk, elapsed,
+              peak / 2 ** 20, rss_growth))
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    call_command('load_reference_data', verbosity=0)
+    for num_rows in ROW_COUNTS:
+        _populate(num_rows, num_rows)
+        _run('attendees', num_rows)
+        _run('papers', num_rows)
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
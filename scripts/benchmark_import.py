@@ -0,0 +1,84 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_import.py").read())
+#
+# Times the bulk import (apps/imports.py) of NUM_ATTENDEES attendees and
+# NUM_PAPERS papers from generated CSV / JSONL files. The target is 50k
+# attendees in under a minute. Everything runs against a throwaway test
+# database, the configured database is not touched.
+
+import csv
+import io
+import json
+import random
+import time
+
+from django.core.management import call_command
+from django.db import connection
+
+NUM_ATTENDEES = 50000
+NUM_PAPERS = 10000
+TARGET_SECONDS = 60
+
+
+def _attendees_csv():
+    from apps import reference_data
+    from apps.models import Organization
+    orgs = [org.org_name for org in reference_data.all_objects(Organization)]
+    tzs = [tz.utc_offset for tz in reference_data.timezones()]
+    fout = io.StringIO()
+    writer = csv.writer(fout)
+    writer.writerow(["email", "name", "org", "timezone",
+                     "interested_in_speaking"])
+    for i in range(NUM_ATTENDEES):
+        writer.writerow(["user{:d}@example.com".format(i),
+                         "First{:d} Last{:d}".format(i, i),
+                         random.choice(orgs), random.choice(tzs),
+                         random.choice(["yes", "no"])])
+    return io.StringIO(fout.getvalue())
+
+
+def _papers_jsonl():
+    from apps import reference_data
+    from apps.models import PaperTheme, PaperType
+    paper_types = [pt.paper_type_name
+                   for pt in reference_data.all_objects(PaperType)]
+    themes = [t.paper_theme for t in reference_data.all_objects(PaperTheme)]
+    lines = []
+    for i in range(NUM_PAPERS):
+        authors = random.sample(range(NUM_ATTENDEES), 3)
+        lines.append(json.dumps({
+            "paper_type": random.choice(paper_types),
+            "title": "Paper {:d}".format(i),
+            "abstract": "abstract",
+            "keywords": "keywords",
+            "themes": random.sample(themes, 2),
+            "primary_author": "user{:d}@example.com".format(authors[0]),
+            "co_authors": ["user{:d}@example.com".format(a)
+                           for a in authors[1:]],
+        }))
+    return io.StringIO("\n".join(lines))
+
+
+def _run(label, import_fn, fin, fmt):
+    from apps import imports
+    start = time.time()
+    result = import_fn(imports.read_rows(fin, fmt))
+    elapsed = time.time() - start
+    print("{:10s} {:8d} created {:6d} rejected {:8.2f} s ({:.0f} rows/s)".format(
+        label, result.num_created, len(result.errors), elapsed,
+        result.num_created / elapsed))
+    return elapsed
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import imports
+    call_command('load_reference_data', verbosity=0)
+    elapsed = _run('attendees', imports.import_attendees,
+                   _attendees_csv(), 'csv')
+    print("target {:d} attendees < {:d} s: {:s}".format(
+        NUM_ATTENDEES, TARGET_SECONDS,
+        "OK" if elapsed < TARGET_SECONDS else "MISSED"))
+    _run('papers', imports.import_papers, _papers_jsonl(), 'jsonl')
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
@@ -0,0 +1,106 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_related.py").read())
+#
+# Times related paper updates (apps/related_papers.py) over NUM_PAPERS
+# papers with generated abstracts: a full update, an update with nothing
+# changed, and an update after NUM_EDITS papers were edited. Then times
+# reading the related papers of a paper, as the paper page does.
+# Everything runs against a throwaway test database, the configured
+# database is not touched.
+
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_PAPERS = 5000
+NUM_TOPICS = 50
+WORDS_PER_ABSTRACT = 150
+VOCABULARY_SIZE = 20000
+NUM_EDITS = 20
+NUM_REPEATS = 200
+
+
+def _texts(num_words, topics, rng):
+    # Zipf-like word frequencies, each topic favouring its own slice of
+    # the vocabulary
+    import numpy as np
+
+    vocabulary = np.array(["w{:d}".format(i) for i in range(VOCABULARY_SIZE)],
+                          dtype=object)
+    p = 1.0 / np.arange(1, VOCABULARY_SIZE + 1)
+    words = rng.choice(VOCABULARY_SIZE, size=(len(topics), num_words),
+                       p=p / p.sum())
+    topical = rng.random(words.shape) < 0.3
+    shift = (topics * (VOCABULARY_SIZE // NUM_TOPICS))[:, None]
+    words = np.where(topical, (words + shift) % VOCABULARY_SIZE, words)
+    return [" ".join(row) for row in vocabulary[words]]
+
+
+def _populate():
+    import numpy as np
+    from apps.models import Attendee, Paper, PaperTheme, PaperType
+    rng = np.random.default_rng(42)
+    paper_types = list(PaperType.objects.all())
+    themes = list(PaperTheme.objects.all())
+    user = User.objects.create_user("author@example.com")
+    author = Attendee.objects.get(user=user)
+    topics = rng.integers(0, NUM_TOPICS, size=NUM_PAPERS)
+    papers = Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types), title="Paper {:d}".format(i),
+              abstract=abstract, keywords=keywords, primary_author=author,
+              is_accepted=True)
+        for i, (abstract, keywords) in enumerate(zip(
+            _texts(WORDS_PER_ABSTRACT, topics, rng), _texts(4, topics, rng)))],
+        batch_size=1000)
+    Paper.themes.through.objects.bulk_create([
+        Paper.themes.through(paper_id=paper.id,
+                             papertheme_id=themes[topic % len(themes)].id)
+        for paper, topic in zip(papers, topics)], batch_size=1000)
+
+
+def _edit():
+    import numpy as np
+    from apps.models import Paper
+    rng = np.random.default_rng(7)
+    papers = random.sample(list(Paper.objects.all()), NUM_EDITS)
+    abstracts = _texts(WORDS_PER_ABSTRACT,
+                       rng.integers(0, NUM_TOPICS, size=NUM_EDITS), rng)
+    for paper, abstract in zip(papers, abstracts):
+        paper.abstract = abstract
+        paper.save()
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:24s} {:8.3f} s {}".format(label, time.time() - start,
+                                       result if result is not None else ""))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import related_papers
+    from apps.models import Paper
+    call_command('load_reference_data', verbosity=0)
+    _timed("populate", _populate)
+    _timed("full update", lambda: related_papers.update_related_papers(True))
+    _timed("unchanged update", related_papers.update_related_papers)
+    _edit()
+    _timed("update after edits", related_papers.update_related_papers)
+    paper_ids = list(Paper.objects.values_list("id", flat=True))
+    timings = []
+    for _ in range(NUM_REPEATS):
+        paper_id = random.choice(paper_ids)
+        start = time.time()
+        related_papers.get_related_papers(paper_id)
+        timings.append(time.time() - start)
+    print("{:24s} median {:6.2f} ms, max {:6.2f} ms".format(
+        "read related papers", 1000 * statistics.median(timings),
+        1000 * max(timings)))
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
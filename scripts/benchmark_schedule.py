@@ -0,0 +1,118 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_schedule.py").read())
+#
+# Times the schedule solver (apps/schedule.py) on a fixture of NUM_TALKS
+# accepted, confirmed papers (EXTRA_LONG_SHARE of them extra long) by
+# NUM_SPEAKERS speakers spread over all time zones, with co-authors and
+# themes, in NUM_TRACKS tracks over 3 days. Reports a full solve against
+# greedy insertion alone, then re-solves after single changes: a new
+# confirmed speaker, a withdrawn speaker and a co-author added to a talk
+# running at the same time as one of their own. Everything runs against a
+# throwaway test database, the configured database is not touched.
+
+import datetime
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_TALKS = 300
+NUM_SPEAKERS = 220
+EXTRA_LONG_SHARE = 0.2
+CO_AUTHOR_SHARE = 0.4
+NUM_TRACKS = 6
+SLOTS_PER_DAY = 24
+DAYS = [datetime.date(2021, 10, 12) + datetime.timedelta(days=i)
+        for i in range(3)]
+
+
+def _populate():
+    from apps.models import (
+        Attendee, Organization, Paper, PaperTheme, PaperType, TimeZone)
+    rng = random.Random(42)
+    org = Organization.objects.first()
+    timezones = list(TimeZone.objects.all())
+    paper_types = list(PaperType.objects.all())
+    themes = list(PaperTheme.objects.all())
+    User.objects.bulk_create([
+        User(username="speaker{:d}@example.com".format(i))
+        for i in range(NUM_SPEAKERS)])
+    # bulk_create sends no post_save, so no attendee rows yet
+    users = User.objects.filter(username__startswith="speaker")
+    Attendee.objects.bulk_create([
+        Attendee(user=user, name="Speaker {:d}".format(user.id), org=org,
+                 timezone=rng.choice(timezones), is_speaker=True)
+        for user in users])
+    speakers = list(Attendee.objects.filter(is_speaker=True))
+    papers = Paper.objects.bulk_create([
+        Paper(paper_type=rng.choice(paper_types),
+              title="Talk {:d}".format(i), abstract="Talk {:d}".format(i),
+              keywords="talk", primary_author=speakers[i % NUM_SPEAKERS],
+              is_accepted=True, accept_speaker_invite=True,
+              extra_long_paper=rng.random() < EXTRA_LONG_SHARE)
+        for i in range(NUM_TALKS)])
+    Paper.themes.through.objects.bulk_create([
+        Paper.themes.through(paper_id=paper.id, papertheme_id=theme.id)
+        for paper in papers
+        for theme in rng.sample(themes, rng.randint(1, 2))])
+    Paper.co_authors.through.objects.bulk_create([
+        Paper.co_authors.through(paper_id=paper.id,
+                                 attendee_id=rng.choice(speakers).id)
+        for paper in papers if rng.random() < CO_AUTHOR_SHARE],
+        ignore_conflicts=True)
+    return papers
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:32s} {:6.2f} s  {:3d} scheduled, {:2d} unscheduled, "
+          "{:3d} moved, cost {:7.2f}".format(
+              label, time.time() - start, len(result.placements),
+              len(result.unscheduled), len(result.moved), result.cost))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import schedule
+    from apps.models import Paper
+    call_command('load_reference_data', verbosity=0)
+    papers = _populate()
+    grid = schedule.SlotGrid(DAYS, datetime.time(12, 0), SLOTS_PER_DAY, 30,
+                             NUM_TRACKS)
+    print("{:d} talks, {:d} slots needed, {:d} available".format(
+        NUM_TALKS, sum(schedule.SCHEDULE_EXTRA_LONG_SLOTS
+                       if paper.extra_long_paper else 1 for paper in papers),
+        grid.num_slots * grid.tracks))
+    _timed("greedy insertion only",
+           lambda: schedule.solve(grid, full=True, moves_per_talk=0))
+    _timed("full solve (saved)",
+           lambda: schedule.schedule_papers(grid, full=True))
+    _timed("re-solve, nothing changed", lambda: schedule.solve(grid))
+
+    extra = Paper.objects.create(
+        paper_type=papers[0].paper_type, title="Late talk", abstract="Late",
+        keywords="talk", primary_author=papers[1].primary_author,
+        is_accepted=True, accept_speaker_invite=True)
+    extra.themes.set(papers[1].themes.all())
+    _timed("re-solve, speaker confirmed",
+           lambda: schedule.schedule_papers(grid))
+
+    Paper.objects.filter(id=papers[2].id).update(accept_speaker_invite=False)
+    _timed("re-solve, speaker withdrew",
+           lambda: schedule.schedule_papers(grid))
+
+    # a co-author of a talk running at the same time as one of theirs
+    by_time = {}
+    for paper in Paper.objects.filter(track__isnull=False).order_by('id'):
+        by_time.setdefault(paper.scheduled_at, []).append(paper)
+    first, second = next(talks for talks in by_time.values()
+                         if len(talks) > 1)[:2]
+    second.co_authors.add(first.primary_author)
+    _timed("re-solve, co-author clash",
+           lambda: schedule.schedule_papers(grid))
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
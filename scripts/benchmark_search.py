@@ -0,0 +1,80 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_search.py").read())
+#
+# Times paper searches (apps/paper_search.py) over NUM_PAPERS papers with
+# generated abstracts, on whatever database backend is configured (SQLite
+# FTS5 or PostgreSQL). Everything runs against a throwaway test database,
+# the configured database is not touched.
+
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_PAPERS = 50000
+WORDS_PER_ABSTRACT = 150
+VOCABULARY_SIZE = 20000
+NUM_REPEATS = 20
+
+QUERIES = ["data", "learning graph", "legal search data", "w150",
+           "w9000", "w150 w300", "nosuchword"]
+
+
+def _texts(num_words, rng):
+    # Zipf-like word frequencies, as in real text, with a few topic words
+    # that show up in nearly every abstract
+    import numpy as np
+
+    vocabulary = np.array(["w{:d}".format(i) for i in range(VOCABULARY_SIZE)],
+                          dtype=object)
+    vocabulary[:5] = ["data", "learning", "graph", "search", "legal"]
+    p = 1.0 / np.arange(1, VOCABULARY_SIZE + 1)
+    words = rng.choice(VOCABULARY_SIZE, size=(NUM_PAPERS, num_words),
+                       p=p / p.sum())
+    return [" ".join(row) for row in vocabulary[words]]
+
+
+def _populate():
+    import numpy as np
+    from apps.models import Attendee, Paper, PaperType
+    rng = np.random.default_rng(42)
+    paper_types = list(PaperType.objects.all())
+    user = User.objects.create_user("author@example.com")
+    author = Attendee.objects.get(user=user)
+    Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types), title=title,
+              abstract=abstract, keywords=keywords, primary_author=author)
+        for title, abstract, keywords in zip(
+            _texts(8, rng), _texts(WORDS_PER_ABSTRACT, rng), _texts(4, rng))],
+        batch_size=1000)
+
+
+def _timed(label, fn):
+    start = time.time()
+    result = fn()
+    print("{:24s} {:8.3f} s".format(label, time.time() - start))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    from apps import paper_search
+    call_command('load_reference_data', verbosity=0)
+    _timed("populate", _populate)
+    _timed("rebuild index", paper_search.rebuild)
+    print("{:d} papers, {:s}".format(
+        NUM_PAPERS, paper_search.get_backend().__class__.__name__))
+    for query in QUERIES:
+        timings, num_results = [], 0
+        for _ in range(NUM_REPEATS):
+            start = time.time()
+            num_results = len(paper_search.search(query))
+            timings.append(time.time() - start)
+        print("{:24s} {:6d} results, median {:6.1f} ms, max {:6.1f} ms".format(
+            repr(query), num_results, 1000 * statistics.median(timings),
+            1000 * max(timings)))
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
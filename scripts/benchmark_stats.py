@@ -0,0 +1,126 @@
+# Run from Django shell (python manage.py shell) using following call.
+# >>> exec(open("scripts/benchmark_stats.py").read())
+#
+# Compares query counts and latency of the per-row (legacy) paper and
+# attendee statistics against the GROUP BY versions in apps/stats.py.
+# Everything runs against a throwaway test database, the configured
+# database is not touched.
+
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+NUM_ATTENDEES = 50000
+NUM_PAPERS = 10000
+
+
+def _legacy_freq_table(values, keys=[], utc_sort=False):
+    freqs = {k: 0 for k in keys}
+    for val in values:
+        freqs[val] = freqs.get(val, 0) + 1
+    if utc_sort:
+        return sorted(freqs.items(), key=lambda k: int(k[0].replace("UTC", "")))
+    return sorted(freqs.items())
+
+
+def legacy_paper_stats():
+    from apps.models import Paper, TimeZone
+    all_tzs = [tz.utc_offset for tz in TimeZone.objects.all()]
+    return [
+        _legacy_freq_table([p.paper_type.paper_type_name
+                            for p in Paper.objects.all()]),
+        _legacy_freq_table([p.primary_author.org.org_name
+                            for p in Paper.objects.all()]),
+        _legacy_freq_table([t.paper_theme for p in Paper.objects.all()
+                            for t in p.themes.all()]),
+        _legacy_freq_table([p.primary_author.timezone.utc_offset
+                            for p in Paper.objects.all()],
+                           keys=all_tzs, utc_sort=True),
+    ]
+
+
+def legacy_attendee_stats():
+    from apps.models import Attendee, TimeZone
+    all_tzs = [tz.utc_offset for tz in TimeZone.objects.all()]
+    return [
+        _legacy_freq_table([a.org.org_name
+                            for a in Attendee.objects.exclude(name__exact='')]),
+        _legacy_freq_table([a.timezone.utc_offset
+                            for a in Attendee.objects.exclude(name__exact='')],
+                           keys=all_tzs, utc_sort=True),
+    ]
+
+
+def paper_stats():
+    from apps import stats
+    return [stats.papers_by_type(), stats.papers_by_org(),
+            stats.papers_by_theme(), stats.papers_by_timezone()]
+
+
+def attendee_stats():
+    from apps import stats
+    return [stats.attendees_by_org(), stats.attendees_by_timezone()]
+
+
+def _populate():
+    call_command('load_reference_data', verbosity=0)
+    from apps.models import (
+        Attendee, Organization, Paper, PaperTheme, PaperType, TimeZone)
+    orgs = list(Organization.objects.all())
+    tzs = list(TimeZone.objects.all())
+    paper_types = list(PaperType.objects.all())
+    themes = list(PaperTheme.objects.all())
+    User.objects.bulk_create([
+        User(username="user{:d}@example.com".format(i))
+        for i in range(NUM_ATTENDEES)], batch_size=1000)
+    Attendee.objects.bulk_create([
+        Attendee(user_id=user_id,
+                 name="First{:d} Last{:d}".format(user_id, user_id),
+                 email="user{:d}@example.com".format(user_id),
+                 org=random.choice(orgs), timezone=random.choice(tzs))
+        for user_id in User.objects.values_list('id', flat=True)],
+        batch_size=1000)
+    attendee_ids = list(Attendee.objects.values_list('id', flat=True))
+    Paper.objects.bulk_create([
+        Paper(paper_type=random.choice(paper_types),
+              title="Paper {:d}".format(i), abstract="abstract",
+              keywords="keywords",
+              primary_author_id=random.choice(attendee_ids))
+        for i in range(NUM_PAPERS)], batch_size=1000)
+    Paper.themes.through.objects.bulk_create([
+        Paper.themes.through(paper_id=paper_id, papertheme_id=theme.id)
+        for paper_id in Paper.objects.values_list('id', flat=True)
+        for theme in random.sample(themes, 2)], batch_size=1000)
+
+
+def _run(label, fn):
+    num_queries = [0]
+
+    def count_queries(execute, sql, params, many, context):
+        num_queries[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        start = time.time()
+        result = fn()
+        elapsed = time.time() - start
+    print("{:24s} {:8d} queries {:10.3f} s".format(
+        label, num_queries[0], elapsed))
+    return result
+
+
+old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+try:
+    _populate()
+    print("{:d} attendees, {:d} papers".format(NUM_ATTENDEES, NUM_PAPERS))
+    legacy = _run("legacy paper stats", legacy_paper_stats)
+    current = _run("paper stats", paper_stats)
+    assert legacy == current
+    legacy = _run("legacy attendee stats", legacy_attendee_stats)
+    current = _run("attendee stats", attendee_stats)
+    assert legacy == current
+finally:
+    connection.creation.destroy_test_db(old_db_name, verbosity=0)
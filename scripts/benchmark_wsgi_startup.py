@@ -0,0 +1,53 @@
+# Run from the project root (not from the Django shell), using
+# $ python scripts/benchmark_wsgi_startup.py
+#
+# Measures the time and peak RSS for a fresh process to load sherpa.wsgi and
+# the URLconf (which imports the views), i.e. to be ready for its first
+# request.
+# "eager plotly" reproduces the old behaviour, where apps/views.py imported
+# plotly at module load, "lazy plotly" is the current behaviour, and
+# "warm-up" additionally runs the opt-in gunicorn master warm-up.
+
+import os
+import statistics
+import subprocess
+import sys
+
+NUM_RUNS = 5
+
+PROBE = """
+import resource, sys, time
+start = time.time()
+import sherpa.wsgi
+import sherpa.urls
+if {eager}:
+    from plotly.offline import plot
+    import plotly.graph_objs as go
+elapsed = time.time() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+VARIANTS = [
+    ("eager plotly", True, False),
+    ("lazy plotly", False, False),
+    ("warm-up", False, True),
+]
+
+
+def _probe(eager, warm_up):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='sherpa.settings')
+    env.pop('SHERPA_WARM_UP', None)
+    if warm_up:
+        env['SHERPA_WARM_UP'] = '1'
+    output = subprocess.check_output(
+        [sys.executable, '-W', 'ignore', '-c', PROBE.format(eager=eager)],
+        env=env, stderr=subprocess.DEVNULL)
+    elapsed, max_rss = output.decode('utf-8').split()[-2:]
+    return float(elapsed), int(max_rss)
+
+
+for label, eager, warm_up in VARIANTS:
+    runs = [_probe(eager, warm_up) for _ in range(NUM_RUNS)]
+    print("{:16s} import {:7.3f}s (median of {:d})  peak RSS {:7.1f} MB".format(
+        label, statistics.median(r[0] for r in runs), NUM_RUNS,
+        statistics.median(r[1] for r in runs) / 1024))
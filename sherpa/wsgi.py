@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sherpa.settings')
 
 application = get_wsgi_application()
+
+# Opt-in: preload templates, URL resolvers and reference data in the
+# gunicorn master (run gunicorn with --preload), so forked workers share them.
+if os.environ.get('SHERPA_WARM_UP'):
+    from apps.warmup import warm_up
+    warm_up()
@@ -0,0 +1,90 @@
+// Author picker for the paper forms. Adds a search box in front of every
+// <select data-autocomplete-url=...>, queries the attendee search endpoint
+// as the user types and adds the chosen attendee as a selected <option>.
+(function () {
+    "use strict";
+
+    function attach(select) {
+        var url = select.getAttribute("data-autocomplete-url");
+        var input = document.createElement("input");
+        var results = document.createElement("ul");
+        var timer = null;
+        input.type = "text";
+        input.className = "form-control";
+        input.placeholder = "Search by name";
+        input.autocomplete = "off";
+        results.className = "list-unstyled";
+        select.parentNode.insertBefore(input, select);
+        select.parentNode.insertBefore(results, select);
+
+        function choose(id, text) {
+            var i;
+            if (!select.multiple) {
+                select.options.length = 0;
+            }
+            for (i = 0; i < select.options.length; i++) {
+                if (select.options[i].value === String(id)) {
+                    select.options[i].selected = true;
+                    return;
+                }
+            }
+            select.add(new Option(text, id, true, true));
+        }
+
+        function show(items) {
+            results.innerHTML = "";
+            items.forEach(function (item) {
+                var li = document.createElement("li");
+                var a = document.createElement("a");
+                a.href = "#";
+                a.textContent = item.text;
+                a.addEventListener("click", function (event) {
+                    event.preventDefault();
+                    choose(item.id, item.text);
+                    results.innerHTML = "";
+                    input.value = "";
+                });
+                li.appendChild(a);
+                results.appendChild(li);
+            });
+        }
+
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                var query = input.value.trim();
+                if (query === "") {
+                    show([]);
+                    return;
+                }
+                fetch(url + "?q=" + encodeURIComponent(query), {
+                    credentials: "same-origin"
+                }).then(function (response) {
+                    return response.json();
+                }).then(function (data) {
+                    show(data.results);
+                });
+            }, 200);
+        });
+
+        if (select.multiple) {
+            select.addEventListener("dblclick", function (event) {
+                if (event.target.tagName === "OPTION") {
+                    select.removeChild(event.target);
+                }
+            });
+            // only options still present are submitted, keep them selected
+            select.form.addEventListener("submit", function () {
+                var i;
+                for (i = 0; i < select.options.length; i++) {
+                    select.options[i].selected = true;
+                }
+            });
+        }
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var selects = document.querySelectorAll("select[data-autocomplete-url]");
+        Array.prototype.forEach.call(selects, attach);
+    });
+})();